@@ -1,5 +1,4 @@
 from django.db import models
-from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.conf import settings
 
 from wagtail.core.models import Page, Orderable
@@ -14,6 +13,8 @@ from taggit.models import TaggedItemBase
 from wagtail.images.edit_handlers import ImageChooserPanel
 from wagtail.search import index
 
+from core.utils.pagination import KeysetPaginator
+
 
 class BlogIndexPage(Page):
     intro = RichTextField(blank=True)
@@ -30,21 +31,12 @@ class BlogIndexPage(Page):
             for tag in post.specific.tags.all():
                 all_tags.add(tag)
 
-        # Paginate all posts by 2 per page
-        paginator = Paginator(all_posts, settings.PAGINATION_PER_PAGE)
-        # import pdb; pdb.set_trace()
-        # Try to get the ?page=x value
-        page = request.GET.get("page")
-        try:
-            # If the page exists and the ?page=x is an int
-            posts = paginator.page(page)
-        except PageNotAnInteger:
-            # If the ?page=x is not an int; show the first page
-            posts = paginator.page(1)
-        except EmptyPage:
-            # If the ?page=x is out of range (too high most likely)
-            # Then return the last page
-            posts = paginator.page(paginator.num_pages)
+        # Paginate the posts by keyset on their date, so an old page costs
+        # as much as the first one and the posts are not counted
+        paginator = KeysetPaginator(all_posts, settings.PAGINATION_PER_PAGE)
+        # The ?after=x value is the cursor of the last post of the previous
+        # page; without it, or when it is not valid, show the first page
+        posts = paginator.page(request.GET.get("after"))
 
         context['posts'] = posts
         context['tags'] = all_tags
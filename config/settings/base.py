@@ -105,6 +105,7 @@ THIRD_PARTY_APPS = [
     "rest_framework",
     "blog",
     "scholarly_articles",
+    "indicators",
     "infrastructure_directory",
     "education_directory",
     "policy_directory",
@@ -313,8 +314,23 @@ CELERY_TASK_TIME_LIMIT = 5 * 60
 # http://docs.celeryproject.org/en/latest/userguide/configuration.html#task-soft-time-limit
 # TODO: set to whatever value is adequate in your circumstances
 CELERY_TASK_SOFT_TIME_LIMIT = 60
+# Time limit, in seconds, of the validation of directory uploads, which reads
+# the whole file and can take much longer than the other tasks.
+DIRECTORY_VALIDATION_TIME_LIMIT = env.int("DIRECTORY_VALIDATION_TIME_LIMIT", default=60 * 60)
 # http://docs.celeryproject.org/en/latest/userguide/configuration.html#beat-scheduler
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+# Interval, in seconds, of the flush of the search hits counted in Redis to
+# the database, and time the hits of a day are kept in Redis when they are
+# not flushed.
+SEARCH_HITS_FLUSH_INTERVAL = env.int("SEARCH_HITS_FLUSH_INTERVAL", default=60)
+SEARCH_HITS_TTL = env.int("SEARCH_HITS_TTL", default=7 * 24 * 60 * 60)
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#beat-schedule
+CELERY_BEAT_SCHEDULE = {
+    "flush-search-hits": {
+        "task": "core.search.tasks.flush_search_hits",
+        "schedule": SEARCH_HITS_FLUSH_INTERVAL,
+    },
+}
 # django-allauth
 # ------------------------------------------------------------------------------
 ACCOUNT_ALLOW_REGISTRATION = env.bool("DJANGO_ACCOUNT_ALLOW_REGISTRATION", True)
@@ -351,6 +367,33 @@ LANGUAGES = [
 
 WAGTAIL_I18N_ENABLED = True
 
+# Full text search in PostgreSQL, with a text search configuration per
+# language of WAGTAIL_CONTENT_LANGUAGES. The index is updated by Celery
+# tasks, see core/search/signals.py, instead of in the requests.
+WAGTAILSEARCH_BACKENDS = {
+    "default": {
+        "BACKEND": "core.search.backends",
+        "SEARCH_CONFIG": "simple",
+        "LANGUAGE_CONFIGS": {
+            "en": "english",
+            "es": "spanish",
+            "pt-BR": "portuguese",
+            "it": "italian",
+        },
+        "AUTO_UPDATE": False,
+    },
+}
+# Time, in seconds, the results of a search are kept in the cache; they are
+# replaced anyway when pages are published or directories imported.
+SEARCH_RESULTS_CACHE_TIMEOUT = env.int("SEARCH_RESULTS_CACHE_TIMEOUT", default=24 * 60 * 60)
+# Text search configuration of the search of the directories and the
+# scholarly articles, whose entries are in several languages, and its number
+# of results per page.
+SEARCH_DOCUMENTS_CONFIG = env("SEARCH_DOCUMENTS_CONFIG", default="simple")
+SEARCH_DOCUMENTS_PER_PAGE = env.int("SEARCH_DOCUMENTS_PER_PAGE", default=20)
+# Number of objects indexed by each task of a rebuild of the search index.
+SEARCH_REINDEX_BATCH_SIZE = env.int("SEARCH_REINDEX_BATCH_SIZE", default=500)
+
 WAGTAIL_CONTENT_LANGUAGES =  [
     ('en', "English"),
     ('es', "Spanish"),
@@ -362,3 +405,39 @@ NOCAPTCHA = True
 
 RECAPTCHA_PUBLIC_KEY = env.str("RECAPTCHA_PUBLIC_KEY", default='')
 RECAPTCHA_PRIVATE_KEY = env.str("RECAPTCHA_PRIVATE_KEY", default='')
+
+# Number of rows inserted and committed together by the import of directory
+# uploads.
+DIRECTORY_IMPORT_BATCH_SIZE = env.int("DIRECTORY_IMPORT_BATCH_SIZE", default=1000)
+
+# Load the directory uploads with PostgreSQL COPY instead of batched inserts.
+# The whole file is then imported in a single transaction.
+DIRECTORY_IMPORT_USE_COPY = env.bool("DIRECTORY_IMPORT_USE_COPY", default=False)
+
+# Seconds the result of the validation of a file, by content hash, is kept in
+# the cache.
+DIRECTORY_VALIDATION_CACHE_TIMEOUT = env.int(
+    "DIRECTORY_VALIDATION_CACHE_TIMEOUT", default=7 * 24 * 60 * 60
+)
+
+# Number of errors of each column kept in the validation errors of a directory
+# upload. All the errors are in its error report.
+DIRECTORY_VALIDATION_MAX_ERRORS_PER_COLUMN = env.int(
+    "DIRECTORY_VALIDATION_MAX_ERRORS_PER_COLUMN", default=100
+)
+
+# Number of records of a scholarly articles snapshot inserted and committed
+# together, and the time limit, in seconds, of the task that loads a snapshot.
+SCHOLARLY_INGEST_BATCH_SIZE = env.int("SCHOLARLY_INGEST_BATCH_SIZE", default=5000)
+SCHOLARLY_INGEST_TIME_LIMIT = env.int("SCHOLARLY_INGEST_TIME_LIMIT", default=6 * 60 * 60)
+
+# Number of values with the largest counts shown by the facet filters of the
+# admin, and returned by their search.
+FACET_TOP_VALUES = env.int("FACET_TOP_VALUES", default=20)
+
+# Time, in seconds, the responses of the indicators API are kept in the cache;
+# they are replaced anyway when an ingest of scholarly articles finishes.
+INDICATORS_CACHE_TIMEOUT = env.int("INDICATORS_CACHE_TIMEOUT", default=7 * 24 * 60 * 60)
+# max-age, in seconds, of the responses of the indicators API, after which
+# the browsers and the CDN revalidate them with their ETag.
+INDICATORS_API_MAX_AGE = env.int("INDICATORS_API_MAX_AGE", default=60)
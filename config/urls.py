@@ -9,7 +9,7 @@ from wagtail.admin import urls as wagtailadmin_urls
 from wagtail.core import urls as wagtail_urls
 from wagtail.documents import urls as wagtaildocs_urls
 
-from core.api import api_router
+from core.api import api_router, indicators_api_urls
 from core.search import views as search_views  # noqa isort:skip
 
 urlpatterns = [
@@ -23,6 +23,7 @@ urlpatterns = [
     path(settings.WAGTAIL_ADMIN_URL, include(wagtailadmin_urls)),
     re_path(r"^documents/", include(wagtaildocs_urls)),
     # Your stuff: custom urls includes go here
+    path("api/indicators/", include(indicators_api_urls)),
     # For anything not caught by a more specific rule above, hand over to
     # Wagtail’s page serving mechanism. This should be the last pattern in
     # the list:
@@ -36,6 +37,7 @@ urlpatterns = [
 # These will be available under a language code prefix. For example /en/search/
 urlpatterns += i18n_patterns(
     re_path(r"^search/$", search_views.search, name="search"),
+    re_path(r"^search/directories/$", search_views.directory_search, name="directory_search"),
     # User management
     path("api/v2/", api_router.urls),
     path("users/", include("core.users.urls", namespace="users")),
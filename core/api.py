@@ -1,8 +1,11 @@
+from django.urls import path
 from wagtail.api.v2.views import PagesAPIViewSet
 from wagtail.api.v2.router import WagtailAPIRouter
 from wagtail.images.api.v2.views import ImagesAPIViewSet
 from wagtail.documents.api.v2.views import DocumentsAPIViewSet
 
+from indicators.api import oa_share_view
+
 # Create the router. "wagtailapi" is the URL namespace
 api_router = WagtailAPIRouter('wagtailapi')
 
@@ -13,3 +16,10 @@ api_router = WagtailAPIRouter('wagtailapi')
 api_router.register_endpoint('pages', PagesAPIViewSet)
 api_router.register_endpoint('images', ImagesAPIViewSet)
 api_router.register_endpoint('documents', DocumentsAPIViewSet)
+
+# The open access indicators, cached and served with ETags, see
+# indicators/api.py. They are not translated, so they are routed outside of
+# the language prefixes.
+indicators_api_urls = ([
+    path('oa-share/', oa_share_view, name='oa_share'),
+], 'indicators_api')
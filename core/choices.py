@@ -0,0 +1,15 @@
+from django.utils.translation import gettext as _
+
+VALIDATION_PENDING = "pending"
+VALIDATION_RUNNING = "running"
+VALIDATION_VALID = "valid"
+VALIDATION_INVALID = "invalid"
+VALIDATION_FAILED = "failed"
+
+VALIDATION_STATUS = [
+    (VALIDATION_PENDING, _("Pending")),
+    (VALIDATION_RUNNING, _("Running")),
+    (VALIDATION_VALID, _("Valid")),
+    (VALIDATION_INVALID, _("Invalid")),
+    (VALIDATION_FAILED, _("Failed")),
+]
@@ -0,0 +1,122 @@
+"""
+Benchmark of the chkcsv column checks.
+
+Compares the compiled column checks with the original ``dispatch`` path on a
+synthetic CSV file and, with ``--processes``, the compiled checks run in
+parallel chunks.  Run it from the project root:
+
+    python -m core.libs.bench_chkcsv --rows 1000000 --processes 4
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from core.libs import chkcsv
+
+FORMAT_SPEC = """
+[Title]
+data_required=True
+type=String
+
+[Link]
+data_required=False
+type=string
+pattern=^https?://
+
+[Description]
+data_required=False
+type=string
+maxlen=255
+
+[Year]
+type=integer
+
+[Score]
+type=float
+
+[Active]
+type=bool
+
+[Date]
+type=date
+"""
+
+
+def write_sample(path, rows, seed=0):
+    """
+    Write a CSV file with ``rows`` data rows matching ``FORMAT_SPEC``.
+
+    About one row in a thousand has an invalid value, so the error path is
+    exercised as well.
+    """
+    rnd = random.Random(seed)
+    with open(path, "w") as fp:
+        fp.write("Title,Link,Description,Year,Score,Active,Date\n")
+        for i in range(rows):
+            year = rnd.randint(1990, 2022)
+            if i % 1000 == 999:
+                year = "n/a"
+            fp.write(
+                "Title %d,http://example.org/%d,Description of item %d,%s,%0.2f,%s,%d-%02d-%02d\n" % (
+                    i, i, i, year, rnd.random() * 10, rnd.choice(("yes", "no")),
+                    rnd.randint(1990, 2022), rnd.randint(1, 12), rnd.randint(1, 28),
+                )
+            )
+
+
+def run(csv_path, fmt_path, compiled, repeat, processes=None):
+    """
+    Return the best elapsed time and the error list of ``repeat`` runs.
+    """
+    best = None
+    for _ in range(repeat):
+        cols = chkcsv.read_format_specs(fmt_path, True, False, compiled=compiled)
+        start = time.perf_counter()
+        errorlist = chkcsv.check_csv_file(
+            csv_path, cols, False, True, True, False, processes=processes
+        )
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, errorlist
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        csv_path = os.path.join(tmpdir, "sample.csv")
+        fmt_path = os.path.join(tmpdir, "sample.fmt")
+        with open(fmt_path, "w") as fp:
+            fp.write(FORMAT_SPEC)
+        write_sample(csv_path, args.rows)
+
+        dispatch_time, dispatch_errors = run(csv_path, fmt_path, False, args.repeat)
+        compiled_time, compiled_errors = run(csv_path, fmt_path, True, args.repeat)
+        if args.processes:
+            parallel_time, parallel_errors = run(
+                csv_path, fmt_path, True, args.repeat, args.processes
+            )
+
+    if dispatch_errors != compiled_errors:
+        raise SystemExit("compiled and dispatch checks reported different errors")
+    if args.processes and parallel_errors != compiled_errors:
+        raise SystemExit("parallel and serial checks reported different errors")
+
+    print("rows:     %d (%d errors)" % (args.rows, len(compiled_errors)))
+    print("dispatch: %.2fs (%.0f rows/s)" % (dispatch_time, args.rows / dispatch_time))
+    print("compiled: %.2fs (%.0f rows/s)" % (compiled_time, args.rows / compiled_time))
+    print("speedup:  %.2fx" % (dispatch_time / compiled_time))
+    if args.processes:
+        print("parallel: %.2fs (%.0f rows/s) with %d processes" % (
+            parallel_time, args.rows / parallel_time, args.processes))
+        print("speedup:  %.2fx over compiled" % (compiled_time / parallel_time))
+
+
+if __name__ == "__main__":
+    main()
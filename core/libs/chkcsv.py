@@ -16,6 +16,7 @@
 #		maxlen=<integer>
 #		type=integer|float|string|date|datetime|bool
 #		pattern=<regular expression identifying valid values>
+#		lock_format_after=<integer>
 #	3. Global options in the format specification file are not yet implemented,
 #		though a section name for them is reserved.
 #
@@ -41,10 +42,17 @@
 #	2019-01-02	Corrected handling of next() for csv library.  Version 1.0.1.  RDN.
 #	2018-01-04	Added check for data rows with more columns than column headers.
 #				Version 1.1.0. RDN.
+#	2022-07-20	Added compiled column checks, one specialized callable per
+#				column that does not allocate for clean cells.  Version 1.2.0.
+#	2022-07-21	Date and date/time checks remember the last format that matched
+#				and classify values with regular expressions before trying
+#				strptime.  Added lock_format_after.  Version 1.3.0.
+#	2022-07-22	Added iter_csv_errors(), which yields the errors as they are
+#				found.  Version 1.4.0.
 # ============================================================================
 
-_version = "1.1.0"
-_vdate = "2019-01-04"
+_version = "1.4.0"
+_vdate = "2022-07-22"
 
 import sys
 from optparse import OptionParser
@@ -55,6 +63,9 @@ except:
 	# Py3
 	from configparser import ConfigParser
 import codecs
+import io
+import mmap
+import multiprocessing
 import os.path
 import csv
 import re
@@ -69,8 +80,14 @@ FORMATSPECS = """Format specification options:
     minlen=<integer>
     maxlen=<integer>
     pattern=<regular expression identifying valid values>
+    lock_format_after=<integer number of values after which a date or date/time
+        column only accepts the format that matched them>
 """
 
+# Returned by compiled checks for clean cells, so that no list or tuple is
+# allocated when a data value is acceptable.
+_NO_ERRORS = ()
+
 class ChkCsvError(Exception):
 	"""Base class for chkcsv errors."""
 	def __init__(self, errmsg, infile=None, line=None, column=None):
@@ -86,9 +103,11 @@ class CsvChecker():
 	:param colname: The name of the data column.
 	:param column_required_default: A Boolean indicating whether the column is required by default.
 	:param data_required_default: A Boolean indicating whether data values are required (non-null) by default.
+	:param compiled: Whether to build one specialized check callable for the column (the default)
+		instead of dispatching every data value to the list of check methods.
 
-	After initialization, the 'check()'
-	method will return a boolean indicating whether a data value is acceptable.
+	After initialization, the 'check()' method will return a sequence of
+	error messages, empty when the data value is acceptable.
 	"""
 	get_fn = {
 			'column_required' : ConfigParser.getboolean,
@@ -96,7 +115,8 @@ class CsvChecker():
 			'type' : ConfigParser.get,
 			'minlen' : ConfigParser.getint,
 			'maxlen' : ConfigParser.getint,
-			'pattern' : ConfigParser.get
+			'pattern' : ConfigParser.get,
+			'lock_format_after' : ConfigParser.getint
 			}
 	datetime_fmts = ("%x",
 				"%c",
@@ -191,6 +211,22 @@ class CsvChecker():
 				"%B, %Y",
 				"%B-%Y",
 				)
+	# Regular expressions that classify a data value before strptime is called,
+	# with the formats that are tried first for the values that they match.
+	# Only the formats also listed in date_fmts or datetime_fmts are used.
+	fmt_classes = (
+				(re.compile(r"\d{4}-\d{1,2}-\d{1,2}\Z"), ("%Y-%m-%d",)),
+				(re.compile(r"\d{4}/\d{1,2}/\d{1,2}\Z"), ("%Y/%m/%d",)),
+				(re.compile(r"\d{1,2}/\d{1,2}/\d{4}\Z"), ("%m/%d/%Y",)),
+				(re.compile(r"\d{1,2}/\d{1,2}/\d{2}\Z"), ("%m/%d/%y", "%x")),
+				(re.compile(r"\d{4}-\d{1,2}-\d{1,2} \d{4}\Z"), ("%Y-%m-%d %H%M",)),
+				(re.compile(r"\d{4}/\d{1,2}/\d{1,2} \d{1,2}:\d{2}:\d{2}\Z"), ("%Y/%m/%d %X",)),
+				(re.compile(r"\d{4}\Z"), ("%Y",)),
+				)
+	iso_date_rx = re.compile(r"\d{4}-\d{2}-\d{2}\Z")
+	bool_values = (u'True', u'true', u'TRUE', u'T', u't', u'Yes', u'yes', u'YES', u'Y', u'y',
+				u'False', u'false', u'FALSE', u'F', u'f',
+				u'No', u'no', u'NO', u'N', u'n', True, False)
 	# Basic format checking functions.  These return None if the data are acceptable,
 	# a textual description of the problem otherwise.
 	def chk_req(self, data):
@@ -221,9 +257,7 @@ class CsvChecker():
 	def chk_bool(self, data):
 		if len(data) == 0:
 			return None
-		return None if data in (u'True', u'true', u'TRUE', u'T', u't', u'Yes', u'yes', u'YES', u'Y', u'y',
-				u'False', u'false', u'FALSE', u'F', u'f',
-				u'No', u'no', u'NO', u'N', u'n', True, False) else u"Padrão incompatível, tente ['yes', 'no', 'true', 'false', 'y', 'n']"
+		return None if data in self.bool_values else u"Padrão incompatível, tente ['yes', 'no', 'true', 'false', 'y', 'n']"
 	def chk_datetime(self, data):
 		if len(data) == 0:
 			return None
@@ -238,13 +272,7 @@ class CsvChecker():
 				data = str(data)
 			except ValueError:
 				return "can't convert data to string for date/time test"
-		for f in self.datetime_fmts:
-			try:
-				dt = datetime.datetime.strptime(data, f)
-			except:
-				continue
-			break
-		else:
+		if self.match_date_fmt(data, self.datetime_fmts, self.datetime_fmt_classes) is None:
 			return "invalid date/time"
 		return None
 	def chk_date(self, data):
@@ -259,20 +287,124 @@ class CsvChecker():
 				data = str(data)
 			except ValueError:
 				return "can't convert data to string for date test"
-		for f in self.date_fmts:
-			try:
-				dt = datetime.datetime.strptime(data, f)
-			except:
-				continue
-			break
-		else:
+		if self.match_date_fmt(data, self.date_fmts, self.date_fmt_classes) is None:
 			return "invalid date"
 		return None
+	def restrict_fmt_classes(self, fmts):
+		"""Return the classes of 'fmt_classes' restricted to the formats in 'fmts'."""
+		restricted = []
+		for rx, candidates in self.fmt_classes:
+			candidates = tuple(f for f in candidates if f in fmts)
+			if candidates:
+				restricted.append((rx, candidates))
+		return tuple(restricted)
+	def parses_as(self, data, fmt):
+		"""Return True if 'data' can be parsed with the strptime format 'fmt'."""
+		if fmt == "%Y-%m-%d" and self.iso_date_rx.match(data):
+			try:
+				datetime.date.fromisoformat(data)
+				return True
+			except ValueError:
+				pass
+		try:
+			datetime.datetime.strptime(data, fmt)
+		except ValueError:
+			return False
+		return True
+	def match_date_fmt(self, data, fmts, fmt_classes):
+		"""Return the format that parses 'data', or None if there is none.
+
+		The format that matched the previous value of the column is tried
+		first, then the formats suggested by the regular expressions of
+		'fmt_classes', then every format of 'fmts' in order.  When the column
+		specification has 'lock_format_after', once that many values in a row
+		have matched the same format, only that format is accepted.
+		"""
+		fmt = self.date_fmt
+		if fmt is not None:
+			if self.parses_as(data, fmt):
+				self.date_fmt_hits += 1
+				return fmt
+			if self.date_fmt_locked:
+				return None
+		for rx, candidates in fmt_classes:
+			if rx.match(data):
+				for f in candidates:
+					if f != fmt and self.parses_as(data, f):
+						return self.learn_date_fmt(f)
+				break
+		for f in fmts:
+			if f != fmt and self.parses_as(data, f):
+				return self.learn_date_fmt(f)
+		return None
+	def learn_date_fmt(self, fmt):
+		"""Remember 'fmt' as the format to try first for the next values."""
+		self.date_fmt = fmt
+		self.date_fmt_hits = 1
+		return fmt
+	@property
+	def date_fmt_locked(self):
+		lock_after = getattr(self, 'lock_format_after', None)
+		return lock_after is not None and self.date_fmt_hits >= lock_after
 	def dispatch(self, check_funcs, data):
 		errlist = [ f(data) for f in check_funcs ]
 		return [ e for e in errlist if e ]
-	def __init__(self, fmt_spec, colname, column_required_default, data_required_default):
+	def compile_check(self, check_funcs):
+		"""Return a single callable that applies 'check_funcs' to a data value.
+
+		The returned callable has the same results as 'dispatch()', but it
+		returns a tuple instead of a list and the shared empty tuple for clean
+		values.  Whenever possible the basic checks are replaced by closures over
+		the column specification, which avoids the attribute lookups on 'self'.
+		"""
+		funcs = [ self.compiled_fn(f) for f in check_funcs ]
+		if len(funcs) == 0:
+			return lambda data: _NO_ERRORS
+		if len(funcs) == 1:
+			if check_funcs[0] == self.chk_req:
+				req_errors = (self.chk_req(""),)
+				return lambda data: _NO_ERRORS if data else req_errors
+			f = funcs[0]
+			def check(data):
+				e = f(data)
+				return (e,) if e else _NO_ERRORS
+			return check
+		funcs = tuple(funcs)
+		def check(data):
+			errs = _NO_ERRORS
+			for f in funcs:
+				e = f(data)
+				if e:
+					errs = errs + (e,)
+			return errs
+		return check
+	def compiled_fn(self, check_fn):
+		"""Return a specialized equivalent of one of the basic check methods."""
+		if check_fn == self.chk_req:
+			msg = self.chk_req("")
+			return lambda data: None if data else msg
+		if check_fn == self.chk_min:
+			minlen, skip_empty = self.minlen, not self.data_required
+			return lambda data: None if (skip_empty and not data) or \
+				len(data) >= minlen else "data too short"
+		if check_fn == self.chk_max:
+			maxlen = self.maxlen
+			return lambda data: None if len(data) <= maxlen else "data too long"
+		if check_fn == self.chk_pat:
+			match = self.rx.match
+			return lambda data: None if not data or match(data) else "Padrão incompatível"
+		if check_fn == self.chk_bool:
+			bool_values = frozenset(self.bool_values)
+			msg = self.chk_bool("?")
+			return lambda data: None if not data or data in bool_values else msg
+		return check_fn
+	def __init__(self, fmt_spec, colname, column_required_default, data_required_default,
+			compiled=True):
 		self.name = colname
+		# Last date or date/time format that matched a value of the column
+		# and the number of values in a row that it has matched.
+		self.date_fmt = None
+		self.date_fmt_hits = 0
 		self.data_required = data_required_default
 		# By default, all columns are required unless there is a specification indicating that it is not.
 		self.column_required = column_required_default
@@ -290,6 +422,8 @@ class CsvChecker():
 				self.rx = re.compile(self.pattern)
 			except:
 				raise ChkCsvError("Invalid regular expression pattern: %s" % self.pattern, column=colname)
+		self.date_fmt_classes = self.restrict_fmt_classes(self.date_fmts)
+		self.datetime_fmt_classes = self.restrict_fmt_classes(self.datetime_fmts)
 		# Create the check method
 		errfuncs = []
 		if self.data_required:
@@ -321,7 +455,10 @@ class CsvChecker():
 				errfuncs.append(self.chk_max)
 			if hasattr(self, 'pattern'):
 				errfuncs.append(self.chk_pat)
-		self.check = lambda data: self.dispatch(errfuncs, data)
+		if compiled:
+			self.check = self.compile_check(errfuncs)
+		else:
+			self.check = lambda data: self.dispatch(errfuncs, data)
 
 
 def clparser():
@@ -413,13 +550,15 @@ def show_errors(errlist):
 			zip(("Error:", "in file", "on line", "in column"), err) if e[1]]]))
 
 
-def read_format_specs(fmt_file, column_required, data_required, chkopts="chkcsvoptions"):
+def read_format_specs(fmt_file, column_required, data_required, chkopts="chkcsvoptions",
+		compiled=True):
 	"""Read format specifications from a file.
 
 	:param fmt_file: The name of the file containing format specifications.
 	:param column_required: Whether or not the column must be in the CSV file to be checked.
 	:param data_required: Whether or not a data value is required on every row of the CSV file.
 	:param chkopts: The name of a section in the format specification file containing additional options.
+	:param compiled: Whether the CsvChecker objects use compiled column checks.
 	"""
 	fmtspecs = ConfigParser()
 	try:
@@ -432,12 +571,12 @@ def read_format_specs(fmt_file, column_required, data_required, chkopts="chkcsvo
 	speccols = [ sect for sect in fmtspecs.sections() if sect != chkopts ]
 	cols = {}
 	for col in speccols:
-		cols[col] = CsvChecker(fmtspecs, col, column_required, data_required)
+		cols[col] = CsvChecker(fmtspecs, col, column_required, data_required, compiled)
 	return cols
 
 
 def check_csv_file(csv_fname, cols, halt_on_err, columnexit, \
-		linelength, caseinsensitive, encoding=None):
+		linelength, caseinsensitive, encoding=None, processes=None, progress=None):
 	"""Check that all of the required columns and data are present in the CSV file, and that
 	the data conform to the appropriate type and other specifications.
 
@@ -448,15 +587,130 @@ def check_csv_file(csv_fname, cols, halt_on_err, columnexit, \
 	:param linelength: Whether to report an error if any data row has a different number of items than indicated by the column headers.
 	:param casesensitive: Whether column names in the specifications and CSV file should be compared case-insensitively.
 	:param encoding: The character encoding of the CSV file.
+	:param processes: The number of processes used to check a large file in chunks.  See 'scan_csv_file()'.
+	:param progress: A function called as the file is read.  See 'scan_csv_file()'.
 	"""
-	errorlist = []
-	dialect = csv.Sniffer().sniff(open(csv_fname, "rt").readline())
+	errorlist, summary = scan_csv_file(csv_fname, cols, halt_on_err, columnexit,
+		linelength, caseinsensitive, encoding, processes, progress)
+	return errorlist
+
+
+def scan_csv_file(csv_fname, cols, halt_on_err, columnexit, \
+		linelength, caseinsensitive, encoding=None, processes=None, progress=None):
+	"""Check a CSV file like 'check_csv_file()' and summarize it in the same pass.
+
+	Returns a tuple of the error list and a dictionary with the keys:
+		rows: The number of data rows read (the header is not included).
+		line_count: The number of lines read, including the header.
+		columns: The number of column headers.
+		error_count: The number of errors found.
+	When 'halt_on_err' is set, the counts stop at the first error.
+
+	See 'iter_csv_errors()', which yields the errors instead of listing them.
+	"""
+	summary = {}
+	errorlist = list(iter_csv_errors(csv_fname, cols, halt_on_err, columnexit,
+		linelength, caseinsensitive, encoding, processes, progress, summary))
+	return errorlist, summary
+
+
+def iter_csv_errors(csv_fname, cols, halt_on_err, columnexit, linelength, \
+		caseinsensitive, encoding=None, processes=None, progress=None, summary=None):
+	"""Check a CSV file like 'check_csv_file()', yielding the errors as they are found.
+
+	Only the errors not yet consumed are held in memory, so a caller can
+	count, cap or write out the errors of a large file as it is read.
+
+	The file is opened once and read as a stream: the dialect is sniffed from
+	the first line, then the rows are checked and counted.
+
+	When 'processes' is greater than 1 and the file is larger than
+	PARALLEL_CHUNK_SIZE, the data rows are split into byte ranges that end on
+	record boundaries and the ranges are checked by a pool of processes.  The
+	errors, row numbers and counts are the same as those of the serial check.
+	The serial check is used instead when the file can't be split safely (see
+	'_can_check_in_chunks()').
+
+	When 'progress' is given, it is called every PROGRESS_ROWS rows (after
+	each chunk, in the parallel check) with the number of data rows read, the
+	approximate number of bytes read and the size of the file in bytes.
+
+	When 'summary' is given, it is a dictionary filled with the counts listed
+	in 'scan_csv_file()' as the file is read.  They are complete once the
+	errors are exhausted.
+	"""
+	if summary is None:
+		summary = {}
+	summary.update(rows=0, line_count=0, columns=0, error_count=0)
 	encoding = "utf-8" if not encoding else encoding
 	if sys.version_info < (3,):
-		inf = UnicodeReader(open(csv_fname, "rt"), dialect, encoding)
+		csvfile = open(csv_fname, "rt")
+	else:
+		csvfile = open(csv_fname, mode="rt", encoding=encoding)
+	with csvfile:
+		dialect = csv.Sniffer().sniff(csvfile.readline())
+		csvfile.seek(0)
+		if processes and processes > 1 and \
+				_can_check_in_chunks(csv_fname, cols, dialect, encoding):
+			errors = _iter_chunk_errors(csv_fname, cols, halt_on_err, columnexit,
+				linelength, caseinsensitive, encoding, dialect, processes, summary,
+				progress)
+		else:
+			errors = _iter_file_errors(csvfile, dialect, csv_fname, cols, halt_on_err,
+				columnexit, linelength, caseinsensitive, encoding, summary, progress)
+		for error in errors:
+			summary["error_count"] += 1
+			yield error
+
+
+def _bytes_read(csvfile):
+	"""Return the position of the buffer under a text file, or 0 if it isn't known."""
+	try:
+		return csvfile.buffer.tell()
+	except (AttributeError, IOError):
+		return 0
+
+
+def _iter_file_errors(csvfile, dialect, csv_fname, cols, halt_on_err, columnexit, \
+		linelength, caseinsensitive, encoding, summary, progress=None):
+	"""Yield the errors of an open CSV file, and count its rows in 'summary'."""
+	if sys.version_info < (3,):
+		inf = UnicodeReader(csvfile, dialect, encoding)
+		reader = inf.reader
 	else:
-		inf = csv.reader(open(csv_fname, mode="rt", encoding=encoding), dialect=dialect)
-	colnames = next(inf)
+		inf = reader = csv.reader(csvfile, dialect=dialect)
+	colnames = next(inf, None)
+	if colnames is None:
+		raise ChkCsvError("The CSV file is empty.", csv_fname)
+	summary["columns"] = len(colnames)
+	summary["line_count"] = reader.line_num
+	errorlist, colchecks, maxindex = _check_csv_header(colnames, csv_fname, cols,
+		columnexit, caseinsensitive)
+	if errorlist:
+		for error in errorlist:
+			yield error
+		return
+	row_progress = None
+	if progress is not None:
+		size = os.fstat(csvfile.fileno()).st_size
+		row_progress = lambda row_no: progress(row_no - 1, _bytes_read(csvfile), size)
+	state = {"row_no": 1}
+	try:
+		for error in _iter_data_errors(inf, csv_fname, len(colnames), maxindex,
+				colchecks, halt_on_err, linelength, state, row_progress):
+			yield error
+	finally:
+		summary["rows"] = state["row_no"] - 1
+		summary["line_count"] = reader.line_num
+
+
+def _check_csv_header(colnames, csv_fname, cols, columnexit, caseinsensitive):
+	"""Match the column headers of a CSV file with the format specifications.
+
+	Returns a tuple of the error list, the position, check method and name of
+	each column to check, and the maximum position of a column to check.
+	"""
+	errorlist = []
 	req_cols = [ c for c in cols if cols[c].column_required ]
 	# Exit if all required columns are not present
 	if caseinsensitive:
@@ -466,7 +720,7 @@ def check_csv_file(csv_fname, cols, halt_on_err, columnexit, \
 		req_missing = [ col for col in req_cols if not (col in colnames) ]
 	if len(req_missing) > 0:
 		errorlist.append(("The following columns are required, but are not present in the CSV file: %s." % ", ".join(req_missing), csv_fname, 1))
-		return errorlist
+		return errorlist, None, None
 	# Exit if there are extra columns and the option to exit is set.
 	if columnexit:
 		if caseinsensitive:
@@ -476,7 +730,7 @@ def check_csv_file(csv_fname, cols, halt_on_err, columnexit, \
 			extra = [ col for col in colnames if not (col in cols) ]
 		if len(extra) > 0:
 			errorlist.append(("The following columns have no format specifications but are in the CSV file: %s." % u", ".join(extra), csv_fname, 1))
-			return errorlist
+			return errorlist, None, None
 	# Column names common to specifications and data file.  These will be used
 	# to index the cols dictionary to get the appropriate check method
 	# and to index the CSV column name list (colnames) to get the column position.
@@ -493,31 +747,307 @@ def check_csv_file(csv_fname, cols, halt_on_err, columnexit, \
 	dataindex = [ colnames.index(chkcols[col]) for col in chkcols ]
 	maxindex = max(dataindex) if len(dataindex) > 0 else 0		# 0 if format file is empty
 	colloc = dict(zip([ chkcols[c] for c in chkcols ], dataindex))
+	# Position, check method and name of each column, resolved once instead of per data value.
+	colchecks = [ (colloc[chkcols[col]], cols[col].check, cols[col].name) for col in chkcols ]
+	return errorlist, colchecks, maxindex
+
+
+# Number of rows between two calls of the progress function of 'scan_csv_file()'.
+PROGRESS_ROWS = 10000
+
+
+def _check_data_rows(inf, csv_fname, ncolnames, maxindex, colchecks, \
+		halt_on_err, linelength, row_no=1):
+	"""Check the data rows of an open CSV reader, positioned after the header.
+
+	:param row_no: The number of the row read before the first row of 'inf'.
+
+	Returns a tuple of the error list and the number of the last row read.
+	"""
+	state = {"row_no": row_no}
+	errorlist = list(_iter_data_errors(inf, csv_fname, ncolnames, maxindex,
+		colchecks, halt_on_err, linelength, state))
+	return errorlist, state["row_no"]
+
+
+def _iter_data_errors(inf, csv_fname, ncolnames, maxindex, colchecks, \
+		halt_on_err, linelength, state, progress=None):
+	"""Yield the errors of the data rows of an open CSV reader, positioned after the header.
+
+	:param state: A dictionary with the number of the row read before the first
+		row of 'inf' in "row_no".  It is set to the number of the last row read
+		when an error is yielded and when the rows are exhausted.
+	:param progress: A function called with the row number every PROGRESS_ROWS rows.
+	"""
+	row_no = state["row_no"]
 	# Read and check the CSV file until done (or until an error).
-	row_no = 1	# Header is row 1.
 	for datarow in inf:
 		row_no += 1
-		if (len(datarow) > 0) and (len(datarow) < len(colnames)) and linelength:
-			errorlist.append(("fewer data values than column headers", csv_fname, row_no))
+		if progress is not None and row_no % PROGRESS_ROWS == 0:
+			progress(row_no)
+		if (len(datarow) > 0) and (len(datarow) < ncolnames) and linelength:
+			state["row_no"] = row_no
+			yield ("fewer data values than column headers", csv_fname, row_no)
 			if halt_on_err:
-				return errorlist
-		if (len(datarow) > len(colnames)):
-			errorlist.append(("more data values than column headers", csv_fname, row_no))
+				return
+		if (len(datarow) > ncolnames):
+			state["row_no"] = row_no
+			yield ("more data values than column headers", csv_fname, row_no)
 			if halt_on_err:
-				return errorlist
+				return
 		if len(datarow) < maxindex + 1:
 			if len(datarow) > 0:
-				errorlist.append(("fewer data values than columns in the format specification", csv_fname, row_no))
+				state["row_no"] = row_no
+				yield ("fewer data values than columns in the format specification", csv_fname, row_no)
 				if halt_on_err:
-					return errorlist
+					return
 		else:
-			for col in chkcols:
-				col_errs = cols[col].check(datarow[colloc[chkcols[col]]])
-				if len(col_errs) > 0:
-					errorlist.extend([ (e, csv_fname, row_no, cols[col].name) for e in col_errs ])
+			for idx, check, name in colchecks:
+				col_errs = check(datarow[idx])
+				if col_errs:
+					state["row_no"] = row_no
+					for e in col_errs:
+						yield (e, csv_fname, row_no, name)
 					if halt_on_err:
-						return errorlist
-	return errorlist
+						return
+	state["row_no"] = row_no
+
+
+# Approximate size, in bytes, of the ranges of a CSV file checked by each
+# process in the parallel check, and of the blocks read to find them.
+PARALLEL_CHUNK_SIZE = 32 * 1024 * 1024
+_READ_BLOCK_SIZE = 1024 * 1024
+
+# State shared with the processes of the parallel check.  It is set before the
+# process pool is created and inherited by the forked processes, because the
+# compiled check methods can't be pickled.
+_chunk_state = None
+
+
+def _can_check_in_chunks(csv_fname, cols, dialect, encoding):
+	"""Return True if a CSV file can be checked in chunks by several processes.
+
+	The file must be larger than PARALLEL_CHUNK_SIZE, and records can only be
+	found in the raw bytes when the delimiter, quote character and line ends are
+	single bytes of the encoding and there is no escape character.  Columns
+	with 'lock_format_after' are checked serially because the locked format
+	depends on all of the previous values.  Processes can only be forked where
+	the platform allows it and the current process is not a daemon (for
+	instance, a Celery worker process).
+	"""
+	if os.path.getsize(csv_fname) <= PARALLEL_CHUNK_SIZE:
+		return False
+	if dialect.escapechar:
+		return False
+	try:
+		for c, b in ((u"\n", b"\n"), (u"\r", b"\r"), (u'"', b'"')):
+			if c.encode(encoding) != b:
+				return False
+		for c in (dialect.delimiter, dialect.quotechar or u'"'):
+			if len(c.encode(encoding)) != 1:
+				return False
+	except (LookupError, UnicodeError):
+		return False
+	if any(hasattr(cols[c], 'lock_format_after') for c in cols):
+		return False
+	if "fork" not in multiprocessing.get_all_start_methods():
+		return False
+	return not multiprocessing.current_process().daemon
+
+
+def _quote_byte(dialect, encoding):
+	if dialect.quoting == csv.QUOTE_NONE or not dialect.quotechar:
+		return None
+	return dialect.quotechar.encode(encoding)
+
+
+def _record_rx(dialect, encoding):
+	"""Return a regular expression that matches one record of a CSV file in bytes.
+
+	It follows the rules of the csv module readers: a field is quoted only
+	when the quote character is its first character (after spaces, with
+	'skipinitialspace'), a quote character closes the quoted part unless it is
+	doubled and 'doublequote' is set, and the rest of the field up to the next
+	delimiter is read as is.  Records end with CR, LF or CR LF, as read from a
+	file opened with universal newlines.
+	"""
+	delim = re.escape(dialect.delimiter.encode(encoding))
+	unquoted = b"[^" + delim + b"\\r\\n]*"
+	quote = _quote_byte(dialect, encoding)
+	if quote is None:
+		field = unquoted
+	else:
+		quote = re.escape(quote)
+		if dialect.doublequote:
+			quoted = quote + b"(?:[^" + quote + b"]|" + quote + quote + b")*" + quote + b"(?!" + quote + b")"
+		else:
+			quoted = quote + b"[^" + quote + b"]*" + quote
+		field = b"(?:" + quoted + unquoted + b"|(?:[^" + quote + delim + b"\\r\\n]" + unquoted + b")?)"
+		if dialect.skipinitialspace:
+			field = b" *" + field
+	return re.compile(field + b"(?:" + delim + field + b")*(?:\\r\\n|\\n|\\r)")
+
+
+def _record_ends(fp, start, chunk_size, quote):
+	"""Yield the offsets, in a binary file, of likely record ends about 'chunk_size' bytes apart.
+
+	A newline is taken as the end of a record when an even number of quote
+	characters has been read since 'start', which must be the start of a
+	record.  This is exact when every quote character opens or closes a
+	quoted value, as in RFC 4180, and is checked by '_check_chunk()' otherwise.
+	"""
+	offset = start		# File offset of the first byte of the block.
+	target = start + chunk_size
+	quotes = 0
+	fp.seek(start)
+	while True:
+		block = fp.read(_READ_BLOCK_SIZE)
+		if not block:
+			return
+		i = 0
+		while offset + len(block) > target:
+			j = max(i, target - offset)
+			if quote:
+				quotes += block.count(quote, i, j)
+			i = j
+			nl = block.find(b"\n", i)
+			if nl == -1:
+				break
+			if quote:
+				quotes += block.count(quote, i, nl)
+			i = nl + 1
+			if quotes % 2 == 0:
+				yield offset + i
+				target = offset + i + chunk_size
+		if quote:
+			quotes += block.count(quote, i)
+		offset += len(block)
+
+
+class _ByteRange(io.RawIOBase):
+	"""Read-only view of the bytes from 'start' to 'end' of a binary file."""
+	def __init__(self, fp, start, end):
+		self.fp = fp
+		self.remaining = end - start
+		fp.seek(start)
+	def readable(self):
+		return True
+	def readinto(self, b):
+		n = min(len(b), self.remaining)
+		if n <= 0:
+			return 0
+		data = self.fp.read(n)
+		b[:len(data)] = data
+		self.remaining -= len(data)
+		return len(data)
+
+
+def _open_range(fp, start, end, encoding):
+	return io.TextIOWrapper(_ByteRange(fp, start, end), encoding=encoding)
+
+
+def _check_chunk(byte_range):
+	"""Check the data rows in a byte range of the file in '_chunk_state'.
+
+	The range must start at a record.  When a data value of the range has a
+	quote character, the end of the range may not be a record end for the csv
+	reader, so it is matched with '_record_rx()'.
+
+	Returns a tuple of the error list, with row numbers relative to the start
+	of the range, the number of rows read, the number of lines read, and
+	whether the end of the range is known to be the end of a record.
+	"""
+	csv_fname, size, encoding, dialect, ncolnames, maxindex, colchecks, \
+		halt_on_err, linelength = _chunk_state
+	start, end = byte_range
+	quote = _quote_byte(dialect, encoding)
+	quote_found = []
+	def quoted_values(reader, quote_char):
+		for row in reader:
+			if not quote_found and quote_char in u"".join(row):
+				quote_found.append(row)
+			yield row
+	with open(csv_fname, "rb") as fp, \
+			mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+		reader = inf = csv.reader(_open_range(fp, start, end, encoding), dialect=dialect)
+		if quote is not None and end < size and mm.find(quote, start, end) != -1:
+			inf = quoted_values(reader, dialect.quotechar)
+		errorlist, row_no = _check_data_rows(inf, csv_fname, ncolnames, maxindex,
+			colchecks, halt_on_err, linelength, 0)
+		exact = True
+		if quote_found:
+			records_rx = re.compile(b"(?:" + _record_rx(dialect, encoding).pattern + b")*")
+			exact = records_rx.match(mm, start, end).end() == end
+		return errorlist, row_no, reader.line_num, exact
+
+
+def _iter_chunk_errors(csv_fname, cols, halt_on_err, columnexit, linelength, \
+		caseinsensitive, encoding, dialect, processes, summary, progress=None):
+	"""Yield the errors of a CSV file checked in chunks by a pool of processes.
+
+	The errors are yielded in row order, and 'summary' is filled like the
+	serial check.  If the end of a chunk turns out not to be the end of a
+	record, the rest of the file, from the start of that chunk, is checked
+	serially instead.
+	"""
+	global _chunk_state
+	with open(csv_fname, "rb") as fp:
+		size = os.fstat(fp.fileno()).st_size
+		with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+			m = _record_rx(dialect, encoding).match(mm, 0)
+			header_end = m.end() if m else size
+		header = csv.reader(_open_range(fp, 0, header_end, encoding), dialect=dialect)
+		colnames = next(header)
+		summary["columns"] = len(colnames)
+		summary["line_count"] = header.line_num
+		errorlist, colchecks, maxindex = _check_csv_header(colnames, csv_fname, cols,
+			columnexit, caseinsensitive)
+		if errorlist:
+			for error in errorlist:
+				yield error
+			return
+		ends = list(_record_ends(fp, header_end, PARALLEL_CHUNK_SIZE,
+			_quote_byte(dialect, encoding)))
+	starts = [header_end] + ends
+	ranges = [ r for r in zip(starts, ends + [size]) if r[0] < r[1] ]
+	_chunk_state = (csv_fname, size, encoding, dialect, len(colnames), maxindex, colchecks,
+		halt_on_err, linelength)
+	inexact_start = None
+	try:
+		with multiprocessing.get_context("fork").Pool(processes) as pool:
+			results = pool.imap(_check_chunk, ranges)
+			for (start, end), (chunk_errors, rows, lines, exact) in zip(ranges, results):
+				if not exact:
+					inexact_start = start
+					break
+				row_offset = summary["rows"] + 1
+				summary["rows"] += rows
+				summary["line_count"] += lines
+				for e in chunk_errors:
+					yield (e[0], e[1], e[2] + row_offset) + e[3:]
+				if progress is not None:
+					progress(summary["rows"], end, size)
+				if chunk_errors and halt_on_err:
+					return
+	finally:
+		_chunk_state = None
+	if inexact_start is None:
+		return
+	# The previous chunks ended on records, so the serial check can start here.
+	with open(csv_fname, "rb") as fp:
+		reader = csv.reader(_open_range(fp, inexact_start, size, encoding), dialect=dialect)
+		row_progress = None
+		if progress is not None:
+			row_progress = lambda row_no: progress(row_no - 1, fp.tell(), size)
+		state = {"row_no": summary["rows"] + 1}
+		line_count = summary["line_count"]
+		try:
+			for error in _iter_data_errors(reader, csv_fname, len(colnames), maxindex,
+					colchecks, halt_on_err, linelength, state, row_progress):
+				yield error
+		finally:
+			summary["rows"] = state["row_no"] - 1
+			summary["line_count"] = line_count + reader.line_num
 
 
 def main():
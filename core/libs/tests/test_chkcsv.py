@@ -0,0 +1,140 @@
+import configparser
+
+import pytest
+
+from core.libs import chkcsv
+
+FORMAT_SPEC = """
+[Title]
+data_required=True
+type=String
+
+[Link]
+type=string
+pattern=^https?://
+minlen=10
+maxlen=30
+
+[Year]
+type=integer
+
+[Score]
+type=float
+
+[Active]
+type=bool
+
+[Date]
+type=date
+"""
+
+CSV_DATA = """Title,Link,Year,Score,Active,Date
+Open Science,http://example.org,2020,1.5,yes,2020-01-31
+,ftp://example.org,year,1.5.2,maybe,31/31/2020
+Open Access,http://a.b,1999,,n,
+"""
+
+
+@pytest.fixture
+def csv_files(tmp_path):
+    fmt_path = tmp_path / "sample.fmt"
+    fmt_path.write_text(FORMAT_SPEC)
+    csv_path = tmp_path / "sample.csv"
+    csv_path.write_text(CSV_DATA)
+    return str(csv_path), str(fmt_path)
+
+
+@pytest.mark.parametrize("halt_on_err", [True, False])
+def test_compiled_checks_match_dispatch(csv_files, halt_on_err):
+    csv_path, fmt_path = csv_files
+    results = []
+    for compiled in (False, True):
+        cols = chkcsv.read_format_specs(fmt_path, True, False, compiled=compiled)
+        results.append(
+            chkcsv.check_csv_file(csv_path, cols, halt_on_err, True, True, False)
+        )
+    assert results[0] == results[1]
+    assert results[1]
+
+
+def test_compiled_check_returns_empty_tuple_for_clean_values(csv_files):
+    _, fmt_path = csv_files
+    cols = chkcsv.read_format_specs(fmt_path, True, False)
+    assert cols["Title"].check("Open Science") is chkcsv._NO_ERRORS
+    assert cols["Link"].check("http://example.org") is chkcsv._NO_ERRORS
+    assert cols["Title"].check("") == ("Dado faltando",)
+    assert cols["Link"].check("ftp://x") == ("data too short", "Padrão incompatível")
+
+
+def make_checker(spec):
+    fmt_spec = configparser.ConfigParser()
+    fmt_spec.read_string(spec)
+    return chkcsv.CsvChecker(fmt_spec, fmt_spec.sections()[0], True, False)
+
+
+def test_date_check_remembers_last_format():
+    checker = make_checker("[Date]\ntype=date\n")
+    assert checker.check("2020-01-31") == ()
+    assert checker.date_fmt == "%Y-%m-%d"
+    assert checker.check("Jan 31, 2020") == ()
+    assert checker.date_fmt == "%b %d, %Y"
+    assert checker.check("2020-02-30") == ("invalid date",)
+
+
+def test_date_format_locked_after_n_values():
+    checker = make_checker("[Date]\ntype=date\nlock_format_after=2\n")
+    assert checker.check("2020-01-31") == ()
+    assert checker.check("2020-02-01") == ()
+    assert checker.check("01/31/2020") == ("invalid date",)
+    assert checker.check("2020-02-02") == ()
+
+
+def test_scan_csv_file_counts_rows_and_lines(csv_files):
+    csv_path, fmt_path = csv_files
+    cols = chkcsv.read_format_specs(fmt_path, True, False)
+    errorlist, summary = chkcsv.scan_csv_file(csv_path, cols, False, True, True, False)
+    assert summary == {
+        "rows": 3,
+        "line_count": 4,
+        "columns": 6,
+        "error_count": len(errorlist),
+    }
+
+
+def test_iter_csv_errors_yields_errors_as_found(csv_files):
+    csv_path, fmt_path = csv_files
+    cols = chkcsv.read_format_specs(fmt_path, True, False)
+    errorlist, summary = chkcsv.scan_csv_file(csv_path, cols, False, True, True, False)
+    iter_summary = {}
+    errors = chkcsv.iter_csv_errors(
+        csv_path, cols, False, True, True, False, summary=iter_summary
+    )
+    assert next(errors) == errorlist[0]
+    assert iter_summary["error_count"] == 1
+    assert list(errors) == errorlist[1:]
+    assert iter_summary == summary
+
+
+@pytest.mark.parametrize("halt_on_err", [True, False])
+def test_parallel_check_matches_serial(tmp_path, monkeypatch, halt_on_err):
+    fmt_path = tmp_path / "sample.fmt"
+    fmt_path.write_text(FORMAT_SPEC)
+    rows = CSV_DATA.splitlines()
+    body = []
+    for i in range(300):
+        body.append('Title %d,"http://example.org/\n%d",%d,1.5,yes,2020-01-31' % (i, i, i))
+        body.append(rows[1 + i % 3])
+        if i % 50 == 0:
+            body.append('Quote %d,"say ""hi""",x,1,n,' % i)
+    csv_path = tmp_path / "sample.csv"
+    csv_path.write_text("\n".join([rows[0]] + body) + "\n")
+
+    cols = chkcsv.read_format_specs(str(fmt_path), True, False)
+    serial = chkcsv.scan_csv_file(str(csv_path), cols, halt_on_err, True, True, False)
+
+    monkeypatch.setattr(chkcsv, "PARALLEL_CHUNK_SIZE", 1024)
+    cols = chkcsv.read_format_specs(str(fmt_path), True, False)
+    parallel = chkcsv.scan_csv_file(
+        str(csv_path), cols, halt_on_err, True, True, False, processes=3
+    )
+    assert parallel == serial
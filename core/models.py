@@ -2,8 +2,11 @@ import os
 
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils.html import format_html
 from django.utils.translation import gettext as _
 
+from core import choices
+
 User = get_user_model()
 
 
@@ -50,3 +53,61 @@ class CommonControlField(models.Model):
 
     class Meta:
         abstract = True
+
+
+class CommonValidationField(models.Model):
+    """
+    Class with the state of the background validation of an uploaded file.
+
+    Fields:
+        validation_status: Status of the last validation, see core.choices
+        validation_progress: Percentage of the file read by the validation
+        validation_throughput: Rows validated per second
+        error_count: Number of errors found by the last validation
+        validation_errors: The errors found by the last validation
+        attachment_sha256: SHA-256 of the validated file
+        format_sha256: SHA-256 of the format specification it was validated with
+        error_report: CSV file with all the errors, when there were too many
+            to keep in validation_errors
+    """
+
+    validation_status = models.CharField(
+        _("Validation status"),
+        max_length=16,
+        choices=choices.VALIDATION_STATUS,
+        blank=True,
+        default="",
+    )
+    validation_progress = models.PositiveSmallIntegerField(
+        _("Validation progress (%)"), default=0, blank=True
+    )
+    validation_throughput = models.FloatField(
+        _("Rows per second"), null=True, blank=True
+    )
+    error_count = models.IntegerField(
+        _("Number of errors"), default=0, blank=True
+    )
+    validation_errors = models.TextField(
+        _("Validation errors"), blank=True, default=""
+    )
+    attachment_sha256 = models.CharField(
+        _("File SHA-256"), max_length=64, blank=True, default="", db_index=True
+    )
+    format_sha256 = models.CharField(
+        _("Format SHA-256"), max_length=64, blank=True, default=""
+    )
+    error_report = models.FileField(
+        _("Error report"), upload_to="validation_reports/", blank=True
+    )
+
+    def error_report_link(self):
+        if not self.error_report:
+            return ""
+        return format_html(
+            '<a href="{}">{}</a>', self.error_report.url, _("Download")
+        )
+
+    error_report_link.short_description = _("Error report")
+
+    class Meta:
+        abstract = True
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    name = 'core.search'
+
+    def ready(self):
+        from .signals import register_signal_handlers
+
+        register_signal_handlers()
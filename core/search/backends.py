@@ -0,0 +1,71 @@
+from django.utils import translation
+from wagtail.core.models import TranslatableMixin
+from wagtail.search.backends.database.postgres import postgres
+
+
+class LanguageObjectIndexer(postgres.ObjectIndexer):
+    """
+    Index an object with the text search configuration of the language of
+    its locale, as pages, so its words are stemmed in its language.
+    """
+
+    def __init__(self, obj, backend):
+        super().__init__(obj, backend)
+        locale = getattr(obj, "locale", None)
+        if locale is not None:
+            self.config = backend.language_config(locale.language_code)
+
+
+class LanguageIndex(postgres.Index):
+
+    def add_items(self, model, objs):
+        if not model.get_search_fields():
+            return
+        indexers = [LanguageObjectIndexer(obj, self.backend) for obj in objs]
+        if indexers:
+            content_type_pk = postgres.get_content_type_pk(model)
+            update_method = (
+                self.add_items_upsert if self._enable_upsert
+                else self.add_items_update_then_create)
+            update_method(content_type_pk, indexers)
+
+
+class LanguageSearchQueryCompiler(postgres.PostgresSearchQueryCompiler):
+
+    def get_config(self, backend):
+        # Only the objects with a locale are indexed in its language, as
+        # pages; the others, as images and documents, are searched with the
+        # configuration they are indexed with.
+        if issubclass(self.queryset.model, TranslatableMixin):
+            return backend.language_config(translation.get_language())
+        return backend.config
+
+
+class LanguageSearchBackend(postgres.PostgresSearchBackend):
+    """
+    The PostgreSQL search backend of Wagtail, which stores a tsvector of
+    each object in an index with a GIN index, with one text search
+    configuration per language.
+
+    LANGUAGE_CONFIGS maps the language codes to the configurations used to
+    index the objects of a locale and to search them in the active
+    language; SEARCH_CONFIG is used for the other languages, and for the
+    models without a locale.
+    """
+    query_compiler_class = LanguageSearchQueryCompiler
+
+    def __init__(self, params):
+        super().__init__(params)
+        self.language_configs = {
+            code.lower(): config
+            for code, config in params.get("LANGUAGE_CONFIGS", {}).items()
+        }
+
+    def language_config(self, language_code):
+        return self.language_configs.get((language_code or "").lower(), self.config)
+
+    def get_index_for_model(self, model, db_alias=None):
+        return LanguageIndex(self, db_alias)
+
+
+SearchBackend = LanguageSearchBackend
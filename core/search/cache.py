@@ -0,0 +1,58 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# Cache key of the version of the content of the site, the time of its last
+# change, which is part of the keys of the cached search results.
+CONTENT_VERSION_KEY = "search:content-version"
+
+
+def content_version():
+    """
+    Return the version of the content, set to now when it is not cached, as
+    when it was evicted, so no stale results can be served.
+    """
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        version = int(time.time())
+        if not cache.add(CONTENT_VERSION_KEY, version, timeout=None):
+            version = cache.get(CONTENT_VERSION_KEY, version)
+    return version
+
+
+def bump_content_version():
+    """
+    Start a new version of the content once the current transaction is
+    committed, so the cached search results are not used anymore; they
+    expire on their own.
+    """
+    transaction.on_commit(
+        lambda: cache.set(
+            CONTENT_VERSION_KEY,
+            max(int(time.time()), content_version() + 1),
+            timeout=None,
+        )
+    )
+
+
+def results_key(query_string, page, language):
+    query = "%s\n%s\n%s" % (language, page, query_string)
+    return "search:results:%s:%s" % (
+        content_version(), hashlib.sha1(query.encode()).hexdigest()
+    )
+
+
+def cached_results(query_string, page, language, search):
+    """
+    Return the cached results of a page of a search, for the current version
+    of the content, calling search() to compute them on a miss.
+    """
+    key = results_key(query_string, page, language)
+    results = cache.get(key)
+    if results is None:
+        results = search()
+        cache.set(key, results, timeout=settings.SEARCH_RESULTS_CACHE_TIMEOUT)
+    return results
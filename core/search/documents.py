@@ -0,0 +1,139 @@
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import Count, F, Q
+
+from .models import SearchDocument
+
+# Models in the site search, which define search_weights, search_title and
+# search_link.
+SOURCE_MODELS = (
+    "education_directory.EducationDirectory",
+    "policy_directory.PolicyDirectory",
+    "disclosure_directory.DisclosureDirectory",
+    "infrastructure_directory.InfrastructureDirectory",
+    "scholarly_articles.ScholarlyArticles",
+)
+
+
+def source_models():
+    return [apps.get_model(label) for label in SOURCE_MODELS]
+
+
+def sync_documents(model, pks=None):
+    """
+    Write the search documents of the objects of model, or of those with the
+    primary keys in pks, with one INSERT ... SELECT in the database.
+
+    The tsvector is computed by PostgreSQL from the fields in
+    model.search_weights, with the SEARCH_DOCUMENTS_CONFIG configuration, and
+    only the documents that changed are updated.  Without pks, the documents
+    of the objects that were deleted are removed too.
+    """
+    if pks is not None and not pks:
+        return
+    qn = connection.ops.quote_name
+    opts = model._meta
+    table = qn(SearchDocument._meta.db_table)
+
+    def column(name):
+        return "source.%s" % qn(opts.get_field(name).column)
+
+    vector = " || ".join(
+        "setweight(to_tsvector(%%(config)s::regconfig, COALESCE(%s::text, '')), '%s')"
+        % (column(name), weight)
+        for name, weight in model.search_weights.items()
+    )
+    params = {
+        "content_type": ContentType.objects.get_for_model(model).pk,
+        "kind": opts.label_lower,
+        "config": settings.SEARCH_DOCUMENTS_CONFIG,
+        "pks": list(pks or ()),
+    }
+    where = "WHERE source.%s = ANY(%%(pks)s)" % qn(opts.pk.column) if pks is not None else ""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO %(table)s (content_type_id, object_id, kind, title, link, search_vector) "
+            "SELECT %%(content_type)s, source.%(pk)s, %%(kind)s, "
+            "LEFT(COALESCE(%(title)s, ''), 255), COALESCE(%(link)s, ''), %(vector)s "
+            "FROM %(source)s source %(where)s "
+            "ON CONFLICT (content_type_id, object_id) DO UPDATE SET "
+            "title = EXCLUDED.title, link = EXCLUDED.link, search_vector = EXCLUDED.search_vector "
+            "WHERE (%(table)s.title, %(table)s.link, %(table)s.search_vector) "
+            "IS DISTINCT FROM (EXCLUDED.title, EXCLUDED.link, EXCLUDED.search_vector)" % {
+                "table": table,
+                "pk": qn(opts.pk.column),
+                "title": column(model.search_title),
+                "link": column(model.search_link),
+                "vector": vector,
+                "source": qn(opts.db_table),
+                "where": where,
+            },
+            params,
+        )
+        if pks is None:
+            cursor.execute(
+                "DELETE FROM %(table)s WHERE content_type_id = %%(content_type)s "
+                "AND NOT EXISTS (SELECT 1 FROM %(source)s source "
+                "WHERE source.%(pk)s = %(table)s.object_id)" % {
+                    "table": table,
+                    "pk": qn(opts.pk.column),
+                    "source": qn(opts.db_table),
+                },
+                params,
+            )
+
+
+def delete_document(instance):
+    SearchDocument.objects.filter(
+        content_type=ContentType.objects.get_for_model(instance), object_id=instance.pk
+    ).delete()
+
+
+def encode_cursor(document):
+    return "%r:%d" % (document.rank, document.pk)
+
+
+def decode_cursor(cursor):
+    """
+    Return the rank and the id of a cursor of encode_cursor, or None when it
+    is not one.
+    """
+    try:
+        rank, pk = cursor.split(":")
+        return float(rank), int(pk)
+    except (AttributeError, ValueError):
+        return None
+
+
+def search_documents(query, kinds=None, after=None, limit=None):
+    """
+    Search the documents for query, in the syntax of web search engines.
+
+    Returns the documents of the kinds in kinds, or of all kinds, the best
+    ranked first, after the cursor after; the cursor of the next page, or
+    None on the last page; and the number of documents found of each kind,
+    on the first page only, or None on the next ones.
+
+    The pages are read by keyset on (rank, id), so a deep page costs as
+    much as the first one, and counting all the documents found is left to
+    the first page.
+    """
+    limit = limit or settings.SEARCH_DOCUMENTS_PER_PAGE
+    search_query = SearchQuery(query, config=settings.SEARCH_DOCUMENTS_CONFIG, search_type="websearch")
+    found = SearchDocument.objects.filter(search_vector=search_query)
+    position = decode_cursor(after) if after else None
+    facets = None
+    if position is None:
+        facets = dict(found.values_list("kind").annotate(count=Count("pk")).order_by())
+    documents = found.annotate(rank=SearchRank(F("search_vector"), search_query))
+    if kinds:
+        documents = documents.filter(kind__in=kinds)
+    if position is not None:
+        rank, pk = position
+        documents = documents.filter(Q(rank__lt=rank) | Q(rank=rank, pk__lt=pk))
+    documents = list(documents.order_by("-rank", "-pk")[:limit + 1])
+    next_cursor = encode_cursor(documents[limit - 1]) if len(documents) > limit else None
+    return documents[:limit], next_cursor, facets
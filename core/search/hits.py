@@ -0,0 +1,116 @@
+import datetime
+import logging
+import uuid
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from redis.exceptions import RedisError
+from wagtail.search.models import Query, QueryDailyHits
+from wagtail.search.utils import normalise_query_string
+
+from core.utils.bulk_import import batches
+
+logger = logging.getLogger(__name__)
+
+# Redis hashes of the hits of a day, by query string, and the hashes being
+# flushed to the database, renamed so the new hits go to a new hash.
+HITS_KEY_PREFIX = "search:hits:"
+FLUSHING_KEY_PREFIX = "search:hits-flushing:"
+
+# Number of query strings written by one INSERT of the flush.
+FLUSH_BATCH_SIZE = 1000
+
+
+def redis_connection():
+    """
+    Return the Redis connection of the default cache, or None when the cache
+    is not Redis, as in development.
+    """
+    if settings.CACHES["default"]["BACKEND"] != "django_redis.cache.RedisCache":
+        return None
+    from django_redis import get_redis_connection
+
+    return get_redis_connection("default")
+
+
+def record_hit(query_string):
+    """
+    Count a hit of a search query for today.
+
+    The hit is counted in Redis, and is written to the Query and
+    QueryDailyHits of Wagtail by flush_hits, so a search does not write to
+    the database.  Without Redis, or when it fails, the hit is written
+    directly as Query.add_hit does.
+    """
+    query_string = normalise_query_string(query_string)
+    redis = redis_connection()
+    if redis is not None:
+        key = HITS_KEY_PREFIX + timezone.now().date().isoformat()
+        try:
+            pipe = redis.pipeline()
+            pipe.hincrby(key, query_string, 1)
+            pipe.expire(key, settings.SEARCH_HITS_TTL)
+            pipe.execute()
+            return
+        except RedisError:
+            logger.warning("Search hit not counted in Redis", exc_info=True)
+    Query.get(query_string).add_hit()
+
+
+def flush_hits():
+    """
+    Add the hits counted in Redis to the QueryDailyHits of their day, and
+    return the number of hits written.
+
+    The hash of each day is renamed before it is read, so the hits counted
+    meanwhile go to a new hash, and is deleted once its hits are committed.
+    A hash left by a flush that failed is written by the next one.
+    """
+    redis = redis_connection()
+    if redis is None:
+        return 0
+    for key in redis.scan_iter(match=HITS_KEY_PREFIX + "*"):
+        day = key.decode()[len(HITS_KEY_PREFIX):]
+        try:
+            redis.rename(key, "%s%s:%s" % (FLUSHING_KEY_PREFIX, day, uuid.uuid4().hex))
+        except RedisError:
+            # The hash expired since it was listed.
+            continue
+    flushed = 0
+    for key in redis.scan_iter(match=FLUSHING_KEY_PREFIX + "*"):
+        day = key.decode()[len(FLUSHING_KEY_PREFIX):].split(":")[0]
+        hits = {
+            query_string.decode(): int(count)
+            for query_string, count in redis.hgetall(key).items()
+        }
+        with transaction.atomic():
+            for batch in batches(hits.items(), FLUSH_BATCH_SIZE):
+                save_hits(datetime.date.fromisoformat(day), dict(batch))
+        redis.delete(key)
+        flushed += sum(hits.values())
+    return flushed
+
+
+def save_hits(date, hits):
+    """
+    Add hits, a dictionary of query string to number of hits, to the
+    QueryDailyHits of date, creating the queries that are new.
+    """
+    Query.objects.bulk_create(
+        [Query(query_string=query_string) for query_string in hits], ignore_conflicts=True
+    )
+    query_ids = dict(
+        Query.objects.filter(query_string__in=hits).values_list("query_string", "id")
+    )
+    table = connection.ops.quote_name(QueryDailyHits._meta.db_table)
+    params = []
+    for query_string, count in hits.items():
+        params.extend([query_ids[query_string], date, count])
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO %s (query_id, date, hits) VALUES %s "
+            "ON CONFLICT (query_id, date) DO UPDATE SET hits = %s.hits + EXCLUDED.hits"
+            % (table, ", ".join(["(%s, %s, %s)"] * len(hits)), table),
+            params,
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from wagtail.search import index
+from wagtail.search.backends import get_search_backends
+
+from core.search.tasks import reindex_model
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the search index in the background: remove the entries of "
+        "deleted objects, and index the objects of each indexed model in "
+        "batches, one Celery task per batch."
+    )
+
+    def handle(self, *args, **options):
+        for backend in get_search_backends():
+            backend.get_index_for_model(None).delete_stale_entries()
+        for model in index.get_indexed_models():
+            reindex_model.delay(model._meta.label)
+            self.stdout.write("Reindexing %s." % model._meta.label)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from core.search.documents import source_models, sync_documents
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the search documents of all the directory entries and "
+        "scholarly articles, which the imports and the ingest otherwise keep "
+        "up to date."
+    )
+
+    def handle(self, *args, **options):
+        for model in source_models():
+            sync_documents(model)
+            self.stdout.write("Synchronized %s." % model._meta.label)
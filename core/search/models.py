@@ -0,0 +1,31 @@
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+from django.utils.translation import gettext as _
+
+
+class SearchDocument(models.Model):
+    """
+    An object of the directories or a scholarly article in the site search,
+    with the tsvector of its weighted fields.  See documents.py.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name='+')
+    object_id = models.BigIntegerField(_("Object id"))
+    # The type of the object, label_lower of its model, for the facets.
+    kind = models.CharField(_("Type"), max_length=100)
+    title = models.CharField(_("Title"), max_length=255, blank=True, default="")
+    link = models.TextField(_("Link"), blank=True, default="")
+    search_vector = SearchVectorField(_("Search vector"), null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=('content_type', 'object_id'), name='searchdocument_object'),
+        ]
+        indexes = [
+            GinIndex(fields=['search_vector'], name='searchdocument_vector'),
+            models.Index(fields=['kind'], name='searchdocument_kind'),
+        ]
+
+    def __str__(self):
+        return self.title
@@ -0,0 +1,90 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from wagtail.core.signals import page_published, page_unpublished
+from wagtail.search import index
+
+from core.utils.bulk_import import rows_imported
+from scholarly_articles.models import ScholarlyArticles
+from scholarly_articles.signals import articles_loaded, articles_written
+
+from .cache import bump_content_version
+from .documents import delete_document, source_models, sync_documents
+from .tasks import index_object, remove_object
+
+
+def index_saved_object(sender, instance, **kwargs):
+    """
+    Update the search index in the background once the object is saved.
+    """
+    label = instance._meta.label
+    transaction.on_commit(lambda: index_object.delay(label, instance.pk))
+
+
+def remove_deleted_object(sender, instance, **kwargs):
+    """
+    Remove the object from the search index in the background once it is
+    deleted.
+    """
+    label = instance._meta.label
+    pk = instance.pk
+    transaction.on_commit(lambda: remove_object.delay(label, pk))
+
+
+def sync_saved_document(sender, instance, **kwargs):
+    """
+    Update the search document of a directory entry or an article saved
+    with the ORM, as in the admin.
+    """
+    sync_documents(sender, [instance.pk])
+
+
+def delete_deleted_document(sender, instance, **kwargs):
+    delete_document(instance)
+
+
+@receiver(rows_imported)
+def sync_imported_documents(sender, pks, **kwargs):
+    """
+    Update the search documents of the rows of a directory written by the
+    import of a file.
+    """
+    if sender in source_models() and pks:
+        sync_documents(sender, pks)
+        bump_content_version()
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+def invalidate_search_results(sender, **kwargs):
+    bump_content_version()
+
+
+@receiver(articles_written)
+def sync_written_articles(sender, article_ids, **kwargs):
+    """
+    Update the search documents of the articles of an ingest batch, in its
+    transaction, or of an article saved with the ORM.
+    """
+    sync_documents(ScholarlyArticles, article_ids)
+
+
+@receiver(articles_loaded)
+def sync_loaded_articles(sender, article_ids, **kwargs):
+    sync_documents(ScholarlyArticles, article_ids)
+
+
+def register_signal_handlers():
+    # The search backends have AUTO_UPDATE off, so Wagtail does not index
+    # the objects in the request that saves them.
+    for model in index.get_indexed_models():
+        if not getattr(model, 'search_auto_update', True):
+            continue
+        post_save.connect(index_saved_object, sender=model)
+        post_delete.connect(remove_deleted_object, sender=model)
+    for model in source_models():
+        # The articles saved with the ORM are synchronized on
+        # articles_written, which is sent for them too.
+        if model is not ScholarlyArticles:
+            post_save.connect(sync_saved_document, sender=model)
+        post_delete.connect(delete_deleted_document, sender=model)
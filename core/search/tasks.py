@@ -0,0 +1,63 @@
+from django.apps import apps
+from django.conf import settings
+from wagtail.search import index
+from wagtail.search.backends import get_search_backends
+
+from config import celery_app
+
+from .hits import flush_hits
+
+
+@celery_app.task(acks_late=True)
+def flush_search_hits():
+    """
+    Write the search hits counted in Redis to the database, run by Celery
+    beat every SEARCH_HITS_FLUSH_INTERVAL seconds.
+    """
+    return flush_hits()
+
+
+@celery_app.task(acks_late=True)
+def index_object(model_label, pk):
+    """
+    Add or update an object in the search index, after it was saved.
+    """
+    model = apps.get_model(model_label)
+    instance = model._default_manager.filter(pk=pk).first()
+    if instance is None:
+        return
+    indexed_instance = index.get_indexed_instance(instance)
+    for backend in get_search_backends():
+        if indexed_instance is None:
+            backend.delete(instance)
+        else:
+            backend.add(indexed_instance)
+
+
+@celery_app.task(acks_late=True)
+def remove_object(model_label, pk):
+    """
+    Remove an object from the search index, after it was deleted.
+    """
+    instance = apps.get_model(model_label)(pk=pk)
+    for backend in get_search_backends():
+        backend.delete(instance)
+
+
+@celery_app.task(acks_late=True)
+def reindex_model(model_label, after=None):
+    """
+    Index the next SEARCH_REINDEX_BATCH_SIZE objects of a model after the
+    primary key after, and go on with the next batch in a new task, so a
+    rebuild of the index is made of short tasks and does not lock the index.
+    """
+    model = apps.get_model(model_label)
+    objects = model.get_indexed_objects().order_by("pk")
+    if after is not None:
+        objects = objects.filter(pk__gt=after)
+    batch = list(objects[:settings.SEARCH_REINDEX_BATCH_SIZE])
+    if not batch:
+        return
+    for backend in get_search_backends():
+        backend.add_bulk(model, batch)
+    reindex_model.delay(model_label, batch[-1].pk)
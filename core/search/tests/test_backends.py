@@ -0,0 +1,48 @@
+import pytest
+from django.core.files.base import ContentFile
+from django.utils import translation
+from wagtail.core.models import Locale, Page
+from wagtail.documents import get_document_model
+from wagtail.search.backends import get_search_backend
+
+pytestmark = pytest.mark.django_db
+
+
+def test_language_config():
+    backend = get_search_backend()
+
+    assert backend.language_config("pt-br") == "portuguese"
+    assert backend.language_config("en") == "english"
+    assert backend.language_config("fr") == "simple"
+    assert backend.language_config(None) == "simple"
+
+
+def test_pages_are_stemmed_in_the_language_of_their_locale():
+    locale, created = Locale.objects.get_or_create(language_code="en")
+    page = Page.get_first_root_node().add_child(
+        instance=Page(title="Running studies", slug="running-studies", locale=locale)
+    )
+    backend = get_search_backend()
+    backend.add(page)
+
+    with translation.override("en"):
+        found = list(backend.search("runs", Page.objects.filter(pk=page.pk)))
+    with translation.override("fr"):
+        not_found = list(backend.search("runs", Page.objects.filter(pk=page.pk)))
+
+    assert found == [page]
+    assert not_found == []
+
+
+def test_models_without_a_locale_are_searched_as_indexed():
+    Document = get_document_model()
+    document = Document.objects.create(
+        title="Annual reports", file=ContentFile(b"reports", name="reports.txt"),
+    )
+    backend = get_search_backend()
+    backend.add(document)
+
+    with translation.override("en"):
+        found = list(backend.search("reports", Document.objects.all()))
+
+    assert found == [document]
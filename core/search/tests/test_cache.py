@@ -0,0 +1,62 @@
+import pytest
+from django.core.cache import cache
+
+from core.search.cache import bump_content_version, cached_results, content_version
+from core.utils.bulk_import import rows_imported
+from education_directory.models import EducationDirectory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+class Search:
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {"results": [self.calls]}
+
+
+def test_cached_results_by_query_page_and_language():
+    search = Search()
+
+    assert cached_results("science", 1, "en", search) == {"results": [1]}
+    assert cached_results("science", 1, "en", search) == {"results": [1]}
+    cached_results("science", 2, "en", search)
+    cached_results("science", 1, "es", search)
+
+    assert search.calls == 3
+
+
+def test_bump_content_version_invalidates_once_committed(django_capture_on_commit_callbacks):
+    search = Search()
+    cached_results("science", 1, "en", search)
+    version = content_version()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bump_content_version()
+        assert content_version() == version
+
+    assert content_version() > version
+    assert cached_results("science", 1, "en", search) == {"results": [2]}
+
+
+def test_an_import_invalidates_the_results(django_capture_on_commit_callbacks, user):
+    directory = EducationDirectory.objects.create(
+        title="Course", link="http://example.org", institution="Somewhere", creator=user
+    )
+    version = content_version()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        rows_imported.send(sender=EducationDirectory, pks=[])
+    assert content_version() == version
+
+    with django_capture_on_commit_callbacks(execute=True):
+        rows_imported.send(sender=EducationDirectory, pks=[directory.pk])
+    assert content_version() > version
@@ -0,0 +1,87 @@
+import pytest
+
+from core.search.documents import search_documents, sync_documents
+from core.search.models import SearchDocument
+from core.utils.bulk_import import upsert_csv_file
+from education_directory.models import EducationDirectory
+from scholarly_articles.models import ScholarlyArticles
+
+pytestmark = pytest.mark.django_db
+
+
+def create_directory(user, title, **fields):
+    return EducationDirectory.objects.create(
+        title=title, link="http://example.org", institution="Somewhere", creator=user, **fields
+    )
+
+
+def create_article(doi, title):
+    return ScholarlyArticles.objects.create(
+        doi=doi, title=title, doi_url="https://doi.org/" + doi, genre="journal-article",
+        journal_issns="1234-5678", journal_issn_l="1234-5678",
+    )
+
+
+def test_saved_objects_have_a_search_document(user):
+    directory = create_directory(user, "Open science course")
+    article = create_article("10.1/a", "Open science in practice")
+
+    assert set(SearchDocument.objects.values_list("kind", "title", "link")) == {
+        ("education_directory.educationdirectory", "Open science course", "http://example.org"),
+        ("scholarly_articles.scholarlyarticles", "Open science in practice", "https://doi.org/10.1/a"),
+    }
+
+    directory.title = "Closed course"
+    directory.save()
+    article.delete()
+
+    assert list(SearchDocument.objects.values_list("title", flat=True)) == ["Closed course"]
+
+
+def test_sync_documents_removes_the_documents_of_deleted_objects(user):
+    directory = create_directory(user, "Open science course")
+    EducationDirectory.objects.filter(pk=directory.pk).delete()
+
+    sync_documents(EducationDirectory)
+
+    assert not SearchDocument.objects.exists()
+
+
+def test_an_import_syncs_the_documents_of_its_rows_only(tmp_path, user):
+    create_directory(user, "Open science course")
+    SearchDocument.objects.all().delete()
+    file_path = tmp_path / "import.csv"
+    file_path.write_text(
+        "%s\nData course,http://example.org/data,,Somewhere\n"
+        % ",".join(EducationDirectory.import_fields.values())
+    )
+
+    upsert_csv_file(str(file_path), EducationDirectory, creator=user)
+
+    assert list(SearchDocument.objects.values_list("title", flat=True)) == ["Data course"]
+
+
+def test_search_documents_ranks_filters_and_pages(user):
+    create_directory(user, "Open science", description="open science open science")
+    create_directory(user, "Course", description="open science")
+    create_article("10.1/a", "Open science")
+
+    documents, next_cursor, facets = search_documents("open science", limit=2)
+
+    assert facets == {
+        "education_directory.educationdirectory": 2,
+        "scholarly_articles.scholarlyarticles": 1,
+    }
+    assert documents[0].title == "Open science"
+    assert documents[0].rank >= documents[1].rank
+    rest, last_cursor, facets = search_documents("open science", after=next_cursor, limit=2)
+    assert len(rest) == 1 and last_cursor is None
+    assert facets is None
+    assert {document.pk for document in documents + rest} == set(
+        SearchDocument.objects.values_list("pk", flat=True)
+    )
+
+    documents, next_cursor, facets = search_documents(
+        "science -course", kinds=["scholarly_articles.scholarlyarticles"],
+    )
+    assert [document.title for document in documents] == ["Open science"]
@@ -0,0 +1,83 @@
+import datetime
+import fnmatch
+
+import pytest
+from wagtail.search.models import Query, QueryDailyHits
+
+from core.search import hits
+
+pytestmark = pytest.mark.django_db
+
+
+class FakeRedis:
+    """
+    The commands of Redis used by hits.py, on dictionaries.
+    """
+
+    def __init__(self):
+        self.hashes = {}
+
+    def pipeline(self):
+        return self
+
+    def hincrby(self, key, field, amount):
+        fields = self.hashes.setdefault(key.encode(), {})
+        fields[field.encode()] = fields.get(field.encode(), 0) + amount
+
+    def expire(self, key, seconds):
+        pass
+
+    def execute(self):
+        pass
+
+    def scan_iter(self, match):
+        return [key for key in list(self.hashes) if fnmatch.fnmatch(key.decode(), match)]
+
+    def rename(self, key, new_key):
+        self.hashes[new_key.encode()] = self.hashes.pop(key)
+
+    def hgetall(self, key):
+        return {field: str(count).encode() for field, count in self.hashes[key].items()}
+
+    def delete(self, key):
+        self.hashes.pop(key, None)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(hits, "redis_connection", lambda: redis)
+    return redis
+
+
+def daily_hits():
+    return dict(QueryDailyHits.objects.values_list("query__query_string", "hits"))
+
+
+def test_record_hit_writes_the_hit_without_redis():
+    hits.record_hit("Open Science")
+    hits.record_hit("open science")
+
+    assert daily_hits() == {"open science": 2}
+
+
+def test_flush_hits_adds_the_hits_counted_in_redis(redis):
+    Query.get("open science").add_hit()
+    for query_string in ("Open Science", "open science", "data"):
+        hits.record_hit(query_string)
+
+    assert daily_hits() == {"open science": 1}
+    assert hits.flush_hits() == 3
+
+    assert daily_hits() == {"open science": 3, "data": 1}
+    assert redis.hashes == {}
+    assert hits.flush_hits() == 0
+
+
+def test_save_hits_adds_to_the_hits_of_the_day():
+    day = datetime.date(2022, 1, 1)
+
+    hits.save_hits(day, {"data": 2})
+    hits.save_hits(day, {"data": 3, "science": 1})
+
+    assert daily_hits() == {"data": 5, "science": 1}
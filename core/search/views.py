@@ -1,7 +1,12 @@
-from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.shortcuts import render
-from wagtail.core.models import Page
-from wagtail.search.models import Query
+from django.utils import translation
+from wagtail.core.models import Locale, Page
+
+from core.utils.pagination import NextPagePaginator
+
+from .cache import cached_results
+from .documents import search_documents, source_models
+from .hits import record_hit
 
 
 def search(request):
@@ -10,25 +15,90 @@ def search(request):
 
     # Search
     if search_query:
-        search_results = Page.objects.live().search(search_query)
-        query = Query.get(search_query)
+        # The results of the query, by page and language, are cached until
+        # pages are published or directories imported.
+        search_results = cached_results(
+            search_query,
+            page,
+            translation.get_language(),
+            lambda: search_page(request, search_query, page),
+        )
 
-        # Record hit
-        query.add_hit()
+        # Record hit, written to the database later by flush_search_hits
+        record_hit(search_query)
     else:
-        search_results = Page.objects.none()
-
-    # Pagination
-    paginator = Paginator(search_results, 10)
-    try:
-        search_results = paginator.page(page)
-    except PageNotAnInteger:
-        search_results = paginator.page(1)
-    except EmptyPage:
-        search_results = paginator.page(paginator.num_pages)
+        search_results = None
 
     return render(
         request,
         "search/search.html",
         {"search_query": search_query, "search_results": search_results},
     )
+
+
+def search_page(request, search_query, page):
+    """
+    Return a page of the results of a search, with what the template shows
+    of each page found, so it can be cached.
+    """
+    # The pages of the active language, searched with its text search
+    # configuration.
+    search_results = (
+        Page.objects.live().filter(locale=Locale.get_active()).search(search_query)
+    )
+
+    # Pagination, without counting the results: a page past the last one is
+    # empty
+    search_results = NextPagePaginator(search_results, 10).page(page)
+
+    return {
+        "results": [
+            {
+                "title": result.title,
+                "url": result.get_url(request),
+                "search_description": result.search_description,
+            }
+            for result in search_results
+        ],
+        "previous_page_number": (
+            search_results.previous_page_number()
+            if search_results.has_previous() else None
+        ),
+        "next_page_number": (
+            search_results.next_page_number() if search_results.has_next() else None
+        ),
+    }
+
+
+def directory_search(request):
+    """
+    Search the directories and the scholarly articles, with the number of
+    results of each type on the first page and a link to the next page of
+    results.
+    """
+    search_query = request.GET.get("query", "").strip()
+    kinds = request.GET.getlist("type")
+    results, next_cursor, facets = [], None, {}
+    if search_query:
+        results, next_cursor, facets = search_documents(
+            search_query, kinds=kinds, after=request.GET.get("after")
+        )
+    types = [
+        {
+            "kind": model._meta.label_lower,
+            "name": model._meta.verbose_name_plural,
+            "count": facets.get(model._meta.label_lower, 0) if facets is not None else None,
+            "selected": model._meta.label_lower in kinds,
+        }
+        for model in source_models()
+    ]
+    return render(
+        request,
+        "search/directory_search.html",
+        {
+            "search_query": search_query,
+            "search_results": results,
+            "types": types,
+            "next_cursor": next_cursor,
+        },
+    )
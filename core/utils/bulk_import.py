@@ -0,0 +1,339 @@
+import csv
+from itertools import islice
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.dispatch import Signal
+
+# Sent with the model as sender after import_csv_file or upsert_csv_file
+# wrote rows, even when it failed after committing some batches, with pks,
+# the primary keys of the rows written and committed, so the receivers
+# update what they derive from those rows.
+rows_imported = Signal()
+
+
+class BulkImportError(Exception):
+    """
+    Error raised while importing a batch of rows.
+
+    The batches before the one that failed are already committed and their
+    number of rows is in ``imported``.
+    """
+
+    def __init__(self, error, imported):
+        super().__init__("%s (%d rows imported before the error)" % (error, imported))
+        self.error = error
+        self.imported = imported
+
+
+def batches(iterable, size):
+    """
+    Yield lists of at most size items from iterable.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def bulk_import(model, objects, batch_size=None, pks=None):
+    """
+    Insert objects with bulk_create, committing one batch at a time.
+
+    objects may be any iterable, for example a generator over the rows of a
+    file, and only one batch is held in memory.  A failure rolls back the
+    current batch only, and is raised as a BulkImportError.  pks, when given,
+    is a list extended with the primary keys of each batch committed.
+
+    Returns the number of objects inserted.
+    """
+    batch_size = batch_size or settings.DIRECTORY_IMPORT_BATCH_SIZE
+    imported = 0
+    try:
+        for batch in batches(objects, batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch, batch_size=batch_size)
+            imported += len(batch)
+            if pks is not None:
+                pks.extend(obj.pk for obj in batch)
+    except Exception as ex:
+        raise BulkImportError(ex, imported) from ex
+    return imported
+
+
+# Number of advisory locks the keys of a table are spread over, see
+# lock_keys_sql.
+KEY_LOCKS = 256
+
+
+def lock_keys_sql(model, keys_sql):
+    """
+    Return a query that takes the advisory locks of the keys of model
+    selected by keys_sql, a query with one text column named key, until the
+    end of the transaction.
+
+    The keys are spread over KEY_LOCKS locks of the table, taken in order,
+    so a load of any size takes a bounded number of locks and two loads do
+    not deadlock; keys that share a lock only wait for each other.  A key of
+    several fields is locked as their values joined by chr(31).
+    """
+    return (
+        "SELECT pg_advisory_xact_lock(hashtext('%s'), bucket) FROM ("
+        "SELECT DISTINCT hashtext(key) & %d AS bucket FROM (%s) keys ORDER BY bucket"
+        ") buckets" % (model._meta.db_table, KEY_LOCKS - 1, keys_sql)
+    )
+
+
+def lock_keys(model, keys, using="default"):
+    """
+    Take the advisory locks of keys, a list of the values of the keys of
+    model, until the end of the transaction, see lock_keys_sql.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            lock_keys_sql(model, "SELECT unnest(%s::text[]) AS key"), [list(keys)]
+        )
+
+
+def upsert_sql(model, key, fields=None, compare=None, returning=()):
+    """
+    Return the ON CONFLICT clause that updates the rows of model with the
+    same natural key.
+
+    fields are the names of the fields updated, by default the fields of
+    model.import_fields and model.import_computed not in key, and a row is
+    only updated if one of the fields in compare, by default fields,
+    changed.  The update also sets the
+    auto_now fields and updated_by, from the creator of the imported row.
+    The rows that are written are returned with the columns of key, as
+    upserted_key_0, upserted_key_1 and so on, followed by the fields in
+    returning; see written_sql to tell the new rows from the updated ones.
+    """
+    qn = connection.ops.quote_name
+    opts = model._meta
+    if fields is None:
+        names = list(model.import_fields) + list(getattr(model, "import_computed", {}))
+        fields = [name for name in dict.fromkeys(names) if name not in key]
+    if compare is None:
+        compare = fields
+    key_columns = [qn(opts.get_field(name).column) for name in key]
+    columns = [qn(opts.get_field(name).column) for name in fields]
+    compare_columns = [qn(opts.get_field(name).column) for name in compare]
+    returning_sql = ", ".join(
+        ["%s AS upserted_key_%d" % (column, i) for i, column in enumerate(key_columns)]
+        + [qn(opts.get_field(name).column) for name in returning]
+    )
+    if not columns:
+        return "ON CONFLICT (%s) DO NOTHING RETURNING %s" % (
+            ", ".join(key_columns), returning_sql,
+        )
+    assignments = ["%s = EXCLUDED.%s" % (column, column) for column in columns]
+    for field in opts.concrete_fields:
+        if getattr(field, "auto_now", False):
+            assignments.append("%s = now()" % qn(field.column))
+    field_names = {field.name for field in opts.concrete_fields}
+    if {"creator", "updated_by"} <= field_names:
+        assignments.append("%s = EXCLUDED.%s" % (
+            qn(opts.get_field("updated_by").column),
+            qn(opts.get_field("creator").column),
+        ))
+    return (
+        "ON CONFLICT (%s) DO UPDATE SET %s WHERE (%s) IS DISTINCT FROM (%s) "
+        "RETURNING %s" % (
+            ", ".join(key_columns),
+            ", ".join(assignments),
+            ", ".join("%s.%s" % (qn(opts.db_table), column) for column in compare_columns),
+            ", ".join("EXCLUDED.%s" % column for column in compare_columns),
+            returning_sql,
+        )
+    )
+
+
+def written_sql(model, key, insert_sql):
+    """
+    Return a WITH clause that runs insert_sql, an INSERT in the table of
+    model ending with the clause of upsert_sql for key, and defines written,
+    the rows it returned with an inserted column, true for the new rows and
+    false for the updated ones.
+
+    The rows are told apart by looking for their key in the table as it was
+    before the INSERT, which the queries of a WITH clause all see, rather
+    than with xmax, which cannot be read from a partitioned table.  A row
+    inserted by a concurrent transaction and then updated counts as
+    inserted.
+    """
+    qn = connection.ops.quote_name
+    opts = model._meta
+    return (
+        "WITH upserted AS (%s), written AS (SELECT NOT EXISTS (SELECT 1 FROM %s existing "
+        "WHERE %s) AS inserted, upserted.* FROM upserted)" % (
+            insert_sql,
+            qn(opts.db_table),
+            " AND ".join(
+                "existing.%s = upserted.upserted_key_%d" % (qn(opts.get_field(name).column), i)
+                for i, name in enumerate(key)
+            ),
+        )
+    )
+
+
+def count_upserted(cursor, model, key, insert_sql, params):
+    """
+    Run an INSERT ending with the clause of upsert_sql for key, returning
+    the primary key, and return the number of rows inserted and updated and
+    the list of the primary keys of the rows written.
+    """
+    cursor.execute(
+        "%s SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted), "
+        "COALESCE(array_agg(%s), '{}') FROM written" % (
+            written_sql(model, key, insert_sql),
+            connection.ops.quote_name(model._meta.pk.column),
+        ),
+        params,
+    )
+    return cursor.fetchone()
+
+
+def upsert_objects(model, objects, key, fields=None, compare=None, returning=()):
+    """
+    Insert or update objects with one INSERT ... ON CONFLICT statement, in
+    the current transaction.
+
+    The rows are matched on key, a tuple of field names with a unique
+    constraint, and fields, compare and returning are those of upsert_sql.
+    Of the objects with the same key, the last one wins.  Needs PostgreSQL.
+
+    Returns the rows written, as tuples of the inserted flag and the values
+    of returning.
+    """
+    qn = connection.ops.quote_name
+    opts = model._meta
+    insert_fields = [field for field in opts.concrete_fields if not field.primary_key]
+    key_fields = [opts.get_field(name) for name in key]
+    rows = {}
+    for obj in objects:
+        rows[tuple(getattr(obj, field.attname) for field in key_fields)] = [
+            field.get_db_prep_save(field.pre_save(obj, True), connection)
+            for field in insert_fields
+        ]
+    if not rows:
+        return []
+    row_sql = "(%s)" % ", ".join(["%s"] * len(insert_fields))
+    insert_sql = "INSERT INTO %s (%s) VALUES %s %s" % (
+        qn(opts.db_table),
+        ", ".join(qn(field.column) for field in insert_fields),
+        ", ".join([row_sql] * len(rows)),
+        upsert_sql(model, key, fields, compare, returning),
+    )
+    sql = "%s SELECT %s FROM written" % (
+        written_sql(model, key, insert_sql),
+        ", ".join(["inserted"] + [qn(opts.get_field(name).column) for name in returning]),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [value for row in rows.values() for value in row])
+        return cursor.fetchall()
+
+
+def upsert_import(model, objects, batch_size=None, pks=None):
+    """
+    Insert or update objects with INSERT ... ON CONFLICT, committing one
+    batch at a time.
+
+    The rows are matched on model.import_key, a tuple of field names with a
+    unique constraint, so importing the same rows again does not duplicate
+    them.  Within a batch, the last of the objects with the same key wins
+    and the others are counted as unchanged.  Needs PostgreSQL.
+
+    Returns a dictionary with the number of rows inserted, updated and
+    unchanged.  A failure rolls back the current batch only, and is raised
+    as a BulkImportError.  pks, when given, is a list extended with the
+    primary keys of the rows written by each batch committed.
+    """
+    batch_size = batch_size or settings.DIRECTORY_IMPORT_BATCH_SIZE
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    try:
+        for batch in batches(objects, batch_size):
+            with transaction.atomic():
+                written = upsert_objects(
+                    model, batch, model.import_key, returning=(model._meta.pk.name,)
+                )
+            if pks is not None:
+                pks.extend(pk for inserted, pk in written)
+            inserted = sum(1 for row in written if row[0])
+            counts["inserted"] += inserted
+            counts["updated"] += len(written) - inserted
+            counts["unchanged"] += len(batch) - len(written)
+    except Exception as ex:
+        raise BulkImportError(ex, counts["inserted"] + counts["updated"]) from ex
+    return counts
+
+
+def read_csv_objects(file_path, model, **values):
+    """
+    Yield one unsaved instance of model for each row of a CSV file.
+
+    The fields are filled from the columns in model.import_fields, a
+    dictionary of field name to column name, and from values, which is
+    used for the fields with the same value on every row, as creator.
+    """
+    with open(file_path, "r") as csvfile:
+        for row in csv.DictReader(csvfile):
+            fields = {
+                name: row[column] for name, column in model.import_fields.items()
+            }
+            fields.update(values)
+            yield model(**fields)
+
+
+def import_csv_file(file_path, model, batch_size=None, **values):
+    """
+    Import the rows of a CSV file as instances of model, in batches.
+
+    See read_csv_objects and bulk_import.  When DIRECTORY_IMPORT_USE_COPY is
+    set and the database is PostgreSQL, the file is loaded with COPY instead,
+    in a single transaction (see copy_import.copy_csv_file).  rows_imported
+    is sent at the end, with the primary keys of the rows inserted.
+    """
+    pks = []
+    try:
+        if settings.DIRECTORY_IMPORT_USE_COPY and connection.vendor == "postgresql":
+            from core.utils import copy_import
+
+            try:
+                return copy_import.copy_csv_file(file_path, model, pks, **values)
+            except Exception as ex:
+                raise BulkImportError(ex, 0) from ex
+        return bulk_import(
+            model, read_csv_objects(file_path, model, **values), batch_size, pks
+        )
+    finally:
+        rows_imported.send(sender=model, pks=pks)
+
+
+def upsert_csv_file(file_path, model, batch_size=None, **values):
+    """
+    Insert or update the rows of a CSV file as instances of model, matched on
+    model.import_key.
+
+    See read_csv_objects and upsert_import.  When DIRECTORY_IMPORT_USE_COPY
+    is set and the database is PostgreSQL, the file is loaded with COPY
+    instead, in a single transaction (see copy_import.copy_upsert_csv_file).
+    rows_imported is sent at the end, with the primary keys of the rows
+    inserted or updated.
+    """
+    pks = []
+    try:
+        if settings.DIRECTORY_IMPORT_USE_COPY and connection.vendor == "postgresql":
+            from core.utils import copy_import
+
+            try:
+                return copy_import.copy_upsert_csv_file(file_path, model, pks, **values)
+            except Exception as ex:
+                raise BulkImportError(ex, 0) from ex
+        return upsert_import(
+            model, read_csv_objects(file_path, model, **values), batch_size, pks
+        )
+    finally:
+        rows_imported.send(sender=model, pks=pks)
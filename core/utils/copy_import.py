@@ -0,0 +1,260 @@
+import csv
+
+from django.db import connection, models, transaction
+from psycopg2 import sql
+
+STAGING_TABLE = "copy_import_staging"
+
+
+def field_expression(field, column):
+    """
+    Return the SQL expression that converts a text column of the staging
+    table to the type of field.
+
+    Empty values are stored as '' in the text fields, nullable or not, as
+    the rows of a CSV file read with the ORM (see
+    bulk_import.read_csv_objects), so both loaders store the same values,
+    and as NULL in the other fields.
+    """
+    value = sql.Identifier(column)
+    if isinstance(field, (models.CharField, models.TextField)):
+        return sql.SQL("COALESCE({}, '')").format(value)
+    return sql.SQL("CAST(NULLIF({}, '') AS {})").format(
+        value, sql.SQL(field.db_type(connection))
+    )
+
+
+def import_expression(model, name):
+    """
+    Return the SQL expression of a field of model from the staging table,
+    from its column in model.import_fields, or from the SQL of
+    model.import_computed, in which {field} is the expression of the column
+    of a field of import_fields.  A field in both is computed, as the DOI is
+    normalized from its column.
+    """
+    opts = model._meta
+    computed = getattr(model, "import_computed", {})
+    if name in computed:
+        return sql.SQL(computed[name]).format(**{
+            field: field_expression(opts.get_field(field), column)
+            for field, column in model.import_fields.items()
+        })
+    return field_expression(opts.get_field(name), model.import_fields[name])
+
+
+def read_columns(csvfile):
+    """
+    Return the dialect and the column names of an open CSV file, and rewind it.
+    """
+    header = csvfile.readline()
+    dialect = csv.Sniffer().sniff(header)
+    columns = next(csv.reader([header], dialect=dialect))
+    csvfile.seek(0)
+    return dialect, columns
+
+
+def insert_sql(model, **values):
+    """
+    Return the columns and the expressions that insert the staging table
+    into the table of model, and the parameters of the expressions.
+
+    The fields in model.import_fields are converted from the staging
+    columns in SQL, the fields in model.import_computed are computed from
+    them (see import_expression), the fields in values (as creator) are passed as
+    parameters, and the auto_now and auto_now_add fields (created and
+    updated) are set to now().
+    """
+    opts = model._meta
+    targets = []
+    expressions = []
+    params = []
+    names = dict.fromkeys(list(model.import_fields) + list(getattr(model, "import_computed", {})))
+    for name in names:
+        targets.append(sql.Identifier(opts.get_field(name).column))
+        expressions.append(import_expression(model, name))
+    for name, value in values.items():
+        field = opts.get_field(name)
+        if field.is_relation and isinstance(value, models.Model):
+            value = value.pk
+        targets.append(sql.Identifier(field.column))
+        expressions.append(sql.Placeholder())
+        params.append(field.get_db_prep_save(value, connection))
+    for field in opts.concrete_fields:
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+            targets.append(sql.Identifier(field.column))
+            expressions.append(sql.SQL("now()"))
+    return sql.SQL(", ").join(targets), sql.SQL(", ").join(expressions), params
+
+
+def copy_to_staging(cursor, csvfile):
+    """
+    Create the temporary staging table, with one text column per column of
+    csvfile, and stream csvfile into it with COPY FROM STDIN.
+
+    The table is dropped at the end of the transaction.
+    """
+    dialect, columns = read_columns(csvfile)
+    staging = sql.Identifier(STAGING_TABLE)
+    cursor.execute(
+        sql.SQL("CREATE TEMPORARY TABLE {} ({}) ON COMMIT DROP").format(
+            staging,
+            sql.SQL(", ").join(
+                sql.SQL("{} text").format(sql.Identifier(c)) for c in columns
+            ),
+        ).as_string(cursor.cursor)
+    )
+    # A dialect may have no quote character, which COPY does not accept.
+    quotechar = dialect.quotechar or '"'
+    cursor.copy_expert(
+        sql.SQL(
+            "COPY {} FROM STDIN WITH (FORMAT csv, HEADER true, DELIMITER {}, QUOTE {})"
+        ).format(
+            staging, sql.Literal(dialect.delimiter), sql.Literal(quotechar)
+        ).as_string(cursor.cursor),
+        csvfile,
+    )
+
+
+def copy_csv_file(file_path, model, pks=None, **values):
+    """
+    Load a CSV file into the table of model with PostgreSQL COPY.
+
+    The file is streamed into a temporary staging table with one text column
+    per CSV column, and is then inserted into the table of model by one
+    INSERT ... SELECT (see insert_sql).
+
+    Everything runs in one transaction.  Returns the number of rows
+    inserted; pks, when given, is a list extended with their primary keys.
+    """
+    targets, expressions, params = insert_sql(model, **values)
+    with open(file_path, "r") as csvfile, transaction.atomic(), \
+            connection.cursor() as cursor:
+        copy_to_staging(cursor, csvfile)
+        cursor.execute(
+            sql.SQL("INSERT INTO {} ({}) SELECT {} FROM {} RETURNING {}").format(
+                sql.Identifier(model._meta.db_table),
+                targets,
+                expressions,
+                sql.Identifier(STAGING_TABLE),
+                sql.Identifier(model._meta.pk.column),
+            ).as_string(cursor.cursor),
+            params,
+        )
+        inserted = [pk for (pk,) in cursor.fetchall()]
+    if pks is not None:
+        pks.extend(inserted)
+    return len(inserted)
+
+
+def copy_upsert_csv_file(file_path, model, pks=None, **values):
+    """
+    Insert or update the rows of a CSV file in the table of model, matched on
+    model.import_key, with PostgreSQL COPY.
+
+    Like copy_csv_file, with the ON CONFLICT clause of
+    bulk_import.upsert_sql.  Of the rows of the file with the same key, the
+    last one wins and the others are counted as unchanged.
+
+    When the table is partitioned, on model.partition_field, the rows are
+    matched on the key and the partition field, and the rows whose partition
+    field changed are deleted first, with the ORM so their related rows are
+    deleted too, to be inserted in their new partition.  The keys of the
+    file are locked before, as by bulk_import.lock_keys, so no other load
+    inserts them in another partition meanwhile.
+
+    Everything runs in one transaction.  Returns a dictionary with the
+    number of rows inserted, updated and unchanged; pks, when given, is a
+    list extended with the primary keys of the rows inserted and updated.
+    """
+    from core.utils.bulk_import import count_upserted, lock_keys_sql, upsert_sql
+
+    opts = model._meta
+    key = [import_expression(model, name) for name in model.import_key]
+    conflict_key = tuple(model.import_key)
+    partition = getattr(model, "partition_field", None)
+    if partition:
+        conflict_key += (partition,)
+    targets, expressions, params = insert_sql(model, **values)
+    staging = sql.Identifier(STAGING_TABLE)
+    with open(file_path, "r") as csvfile, transaction.atomic(), \
+            connection.cursor() as cursor:
+        copy_to_staging(cursor, csvfile)
+        if partition:
+            cursor.execute(lock_keys_sql(model, sql.SQL(
+                "SELECT concat_ws(chr(31), {}) AS key FROM {}"
+            ).format(sql.SQL(", ").join(key), staging).as_string(cursor.cursor)))
+            model._base_manager.filter(
+                pk__in=moved_rows(cursor, model, key, partition)
+            ).delete()
+        cursor.execute(sql.SQL("SELECT count(*) FROM {}").format(staging).as_string(
+            cursor.cursor
+        ))
+        (rows,) = cursor.fetchone()
+        # The staging table is only written by COPY, so its ctid follows the
+        # order of the file.
+        inserted, updated, written = count_upserted(
+            cursor,
+            model,
+            conflict_key,
+            sql.SQL(
+                "INSERT INTO {} ({}) SELECT DISTINCT ON ({}) {} FROM {} "
+                "ORDER BY {}, ctid DESC {}"
+            ).format(
+                sql.Identifier(opts.db_table),
+                targets,
+                sql.SQL(", ").join(key),
+                expressions,
+                staging,
+                sql.SQL(", ").join(key),
+                sql.SQL(upsert_sql(model, conflict_key, returning=(opts.pk.name,))),
+            ).as_string(cursor.cursor),
+            params,
+        )
+    if pks is not None:
+        pks.extend(written)
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": rows - inserted - updated,
+    }
+
+
+def moved_rows(cursor, model, key, partition):
+    """
+    Return the primary keys of the rows of model whose partition field is
+    not the one of the last row of the staging table with the same key, key
+    being the expressions of model.import_key.
+    """
+    opts = model._meta
+    key_names = [sql.Identifier("key_%d" % i) for i in range(len(key))]
+    cursor.execute(
+        sql.SQL(
+            "WITH latest AS (SELECT DISTINCT ON ({}) {}, {} AS partition_value FROM {} "
+            "ORDER BY {}, ctid DESC) "
+            "SELECT {}.{} FROM {} JOIN latest ON ({}) = ({}) "
+            "WHERE {}.{} <> latest.partition_value"
+        ).format(
+            sql.SQL(", ").join(key),
+            sql.SQL(", ").join(
+                sql.SQL("{} AS {}").format(expression, name)
+                for expression, name in zip(key, key_names)
+            ),
+            import_expression(model, partition),
+            sql.Identifier(STAGING_TABLE),
+            sql.SQL(", ").join(key),
+            sql.Identifier(opts.db_table),
+            sql.Identifier(opts.pk.column),
+            sql.Identifier(opts.db_table),
+            sql.SQL(", ").join(
+                sql.SQL("{}.{}").format(
+                    sql.Identifier(opts.db_table),
+                    sql.Identifier(opts.get_field(name).column),
+                )
+                for name in model.import_key
+            ),
+            sql.SQL(", ").join(sql.SQL("latest.{}").format(name) for name in key_names),
+            sql.Identifier(opts.db_table),
+            sql.Identifier(opts.get_field(partition).column),
+        ).as_string(cursor.cursor)
+    )
+    return [pk for (pk,) in cursor.fetchall()]
@@ -0,0 +1,46 @@
+from wagtail.contrib.modeladmin.views import IndexView
+
+from .pagination import KeysetPaginator, estimated_count
+
+
+class KeysetIndexView(IndexView):
+    """
+    The index view of modeladmin, paginated by keyset on the ordering of the
+    listing instead of by page number, for the models with large tables.
+
+    The objects are not counted: the number of objects of the table, when
+    it is not filtered, is the estimate of PostgreSQL.  It is used with the
+    modeladmin/keyset_index.html template.
+    """
+    CURSOR_VAR = 'after'
+
+    def dispatch(self, request, *args, **kwargs):
+        self.cursor = request.GET.get(self.CURSOR_VAR)
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_queryset(self, request=None):
+        # The cursor is not a lookup, and the links to sort or filter the
+        # listing go back to its first page.
+        self.params.pop(self.CURSOR_VAR, None)
+        return super().get_queryset(request)
+
+    def get_context_data(self, **kwargs):
+        user = self.request.user
+        page_obj = KeysetPaginator(self.queryset, self.items_per_page).page(self.cursor)
+        filtered = bool(self.queryset.query.where)
+
+        context = {
+            'view': self,
+            'all_count': bool(page_obj) or self.get_base_queryset().exists(),
+            'estimated_count': None if filtered else estimated_count(self.model),
+            'page_obj': page_obj,
+            'object_list': page_obj.object_list,
+            'first_page_url': self.get_query_string(),
+            'next_page_url': (
+                self.get_query_string({self.CURSOR_VAR: page_obj.next_cursor})
+                if page_obj.has_next() else None),
+            'user_can_create': self.permission_helper.user_can_create(user),
+            'show_search': self.search_handler.show_search_form,
+        }
+        context.update(kwargs)
+        return super(IndexView, self).get_context_data(**context)
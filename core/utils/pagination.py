@@ -0,0 +1,246 @@
+"""
+Paginators that do not count the objects, for the listings of large tables.
+
+The Paginator of Django counts the objects to number the pages, and reads a
+page with an OFFSET, so a deep page reads all the rows before it.
+
+KeysetPaginator reads the page that follows the last object of the previous
+one, by the values of the ordering of the queryset, so any page costs as
+much as the first one.  NextPagePaginator reads one object more than a page
+to know whether there is a next page, for results that can only be sliced,
+as those of a search.
+"""
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db.models import F, Q
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """
+    Encode the times with their microseconds, which DjangoJSONEncoder drops
+    and a cursor needs to compare them.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values):
+    data = json.dumps(values, cls=CursorEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Return the values of a cursor of encode_cursor, or None when it is not
+    one.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (AttributeError, binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+class KeysetPage:
+
+    def __init__(self, object_list, cursor=None, next_cursor=None):
+        self.object_list = object_list
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        # Only the first page is linked, as the pages are not numbered.
+        return self.cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by keyset on its ordering, or on ordering, which is
+    a list of field names as in order_by.
+
+    The primary key is added to the ordering when it is not in it, so the
+    order is total.  A page is identified by the cursor of the page before
+    it, the values of the ordering of its last object; the first page has
+    no cursor.  NULLs come last in ascending order and first in descending
+    order, as in PostgreSQL.
+    """
+
+    def __init__(self, queryset, per_page, ordering=None):
+        ordering = list(ordering or queryset.query.order_by)
+        pk_name = queryset.model._meta.pk.name
+        if not {"pk", "-pk", pk_name, "-" + pk_name} & set(ordering):
+            ordering.append("pk")
+        # The ordering is applied on annotations, so the order is the one of
+        # the values compared, even for a foreign key.
+        self.keys = []
+        annotations = {}
+        for i, name in enumerate(ordering):
+            key = "keyset_%d" % i
+            descending = name.startswith("-")
+            annotations[key] = F(name.lstrip("-"))
+            self.keys.append((key, descending))
+        self.queryset = queryset.annotate(**annotations).order_by(
+            *[("-" if descending else "") + key for key, descending in self.keys]
+        )
+        self.per_page = per_page
+
+    def page(self, cursor=None):
+        """
+        Return the page after cursor, or the first page when there is no
+        cursor or it is not valid.
+        """
+        values = self.cursor_values(cursor) if cursor else None
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(self.after(values))
+        else:
+            cursor = None
+        object_list = list(queryset[:self.per_page + 1])
+        next_cursor = None
+        if len(object_list) > self.per_page:
+            object_list = object_list[:self.per_page]
+            next_cursor = encode_cursor(
+                [getattr(object_list[-1], key) for key, descending in self.keys]
+            )
+        return KeysetPage(object_list, cursor, next_cursor)
+
+    def cursor_values(self, cursor):
+        """
+        Return the values of cursor converted to the types of the ordering,
+        or None when it is not a cursor of this ordering.
+        """
+        values = decode_cursor(cursor)
+        if values is None or len(values) != len(self.keys):
+            return None
+        annotations = self.queryset.query.annotations
+        try:
+            return [
+                None if value is None else annotations[key].output_field.to_python(value)
+                for (key, descending), value in zip(self.keys, values)
+            ]
+        except (TypeError, ValidationError):
+            return None
+
+    def after(self, values):
+        """
+        Return the condition of the objects that come after the object with
+        the values of the ordering.
+        """
+        condition = None
+        same = Q()
+        for (key, descending), value in zip(self.keys, values):
+            if value is None:
+                after = Q(**{key + "__isnull": False}) if descending else None
+                equal = Q(**{key + "__isnull": True})
+            else:
+                after = Q(**{key + ("__lt" if descending else "__gt"): value})
+                if not descending:
+                    after |= Q(**{key + "__isnull": True})
+                equal = Q(**{key: value})
+            if after is not None:
+                condition = same & after if condition is None else condition | (same & after)
+            same &= equal
+        # The values of the last object of a page match none after it.
+        return condition if condition is not None else Q(pk__in=[])
+
+
+class NextPage:
+
+    def __init__(self, object_list, number, has_next):
+        self.object_list = object_list
+        self.number = number
+        self._has_next = has_next
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self.number > 1
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+class NextPagePaginator:
+    """
+    Paginate a list or the results of a search by page number, reading one
+    object more than a page to know whether there is a next one, instead of
+    counting them.  A page past the last one is empty, as is any page after
+    max_page, which is not read, so a page number cannot overflow the
+    OFFSET of a query.
+    """
+
+    max_page = 10000
+
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list
+        self.per_page = per_page
+
+    def page(self, number):
+        try:
+            number = max(int(number), 1)
+        except (TypeError, ValueError):
+            number = 1
+        if number > self.max_page:
+            return NextPage([], number, False)
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom:bottom + self.per_page + 1])
+        return NextPage(
+            object_list[:self.per_page], number, len(object_list) > self.per_page
+        )
+
+
+def estimated_count(model):
+    """
+    Return the number of rows of the table of model estimated by PostgreSQL
+    from its statistics, those of its partitions for a partitioned table,
+    instead of counting them.
+    """
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT COALESCE(SUM(GREATEST(reltuples, 0)), 0)::bigint FROM pg_class "
+            "WHERE oid = %s::regclass "
+            "OR oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = %s::regclass)",
+            [table, table],
+        )
+        return cursor.fetchone()[0]
@@ -0,0 +1,145 @@
+import csv
+
+import pytest
+
+from core.utils import copy_import
+from core.utils.bulk_import import (
+    BulkImportError, batches, bulk_import, import_csv_file, rows_imported, upsert_csv_file,
+)
+from education_directory.models import EducationDirectory
+
+pytestmark = pytest.mark.django_db
+
+COLUMNS = list(EducationDirectory.import_fields.values())
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(COLUMNS)
+        writer.writerows(rows)
+    return str(path)
+
+
+def directory_rows(count):
+    return [
+        ("Course %d" % i, "http://example.org/%d" % i, "", "Somewhere")
+        for i in range(count)
+    ]
+
+
+def test_batches():
+    assert list(batches(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_bulk_import_keeps_the_batches_before_a_failure(user):
+    objects = [
+        EducationDirectory(title=title, link=link, institution=institution, creator=user)
+        for title, link, description, institution in directory_rows(3)
+    ]
+    objects.append(EducationDirectory(title="No creator", link="http://example.org"))
+
+    with pytest.raises(BulkImportError) as error:
+        bulk_import(EducationDirectory, objects, batch_size=2)
+
+    assert error.value.imported == 2
+    assert EducationDirectory.objects.count() == 2
+
+
+def test_import_csv_file(tmp_path, user):
+    received = []
+
+    def receiver(sender, pks, **kwargs):
+        received.append((sender, sorted(pks)))
+
+    rows_imported.connect(receiver)
+    try:
+        imported = import_csv_file(
+            write_csv(tmp_path / "import.csv", directory_rows(3)), EducationDirectory,
+            batch_size=2, creator=user,
+        )
+    finally:
+        rows_imported.disconnect(receiver)
+
+    assert imported == 3
+    assert set(EducationDirectory.objects.values_list("title", flat=True)) == {
+        "Course 0", "Course 1", "Course 2",
+    }
+    assert EducationDirectory.objects.filter(description="").count() == 3
+    assert received == [(EducationDirectory, sorted(EducationDirectory.objects.values_list("pk", flat=True)))]
+
+
+def test_copy_csv_file(tmp_path, user):
+    imported = copy_import.copy_csv_file(
+        write_csv(tmp_path / "import.csv", directory_rows(3)), EducationDirectory, creator=user,
+    )
+
+    assert imported == 3
+    directory = EducationDirectory.objects.get(title="Course 1")
+    assert directory.link == "http://example.org/1"
+    assert directory.description == ""
+    assert directory.creator == user
+    assert directory.created is not None
+
+
+def test_import_csv_file_uses_copy_when_enabled(tmp_path, user, settings):
+    settings.DIRECTORY_IMPORT_USE_COPY = True
+
+    imported = import_csv_file(
+        write_csv(tmp_path / "import.csv", directory_rows(2)), EducationDirectory, creator=user,
+    )
+
+    assert imported == 2
+    assert EducationDirectory.objects.filter(description="").count() == 2
+
+
+@pytest.mark.parametrize("use_copy", [False, True])
+def test_upsert_csv_file_updates_the_rows_with_the_same_key(tmp_path, user, settings, use_copy):
+    settings.DIRECTORY_IMPORT_USE_COPY = use_copy
+    rows = directory_rows(3)
+    upsert_csv_file(write_csv(tmp_path / "first.csv", rows), EducationDirectory, creator=user)
+    rows[0] = rows[0][:2] + ("Changed",) + rows[0][3:]
+    rows.append(("Course 3", "http://example.org/3", "", "Somewhere"))
+    received = []
+
+    def receiver(sender, pks, **kwargs):
+        received.extend(pks)
+
+    rows_imported.connect(receiver)
+    try:
+        counts = upsert_csv_file(
+            write_csv(tmp_path / "second.csv", rows), EducationDirectory, creator=user,
+        )
+    finally:
+        rows_imported.disconnect(receiver)
+
+    assert counts == {"inserted": 1, "updated": 1, "unchanged": 2}
+    assert EducationDirectory.objects.count() == 4
+    assert EducationDirectory.objects.get(title="Course 0").description == "Changed"
+    assert sorted(received) == sorted(
+        EducationDirectory.objects.filter(title__in=["Course 0", "Course 3"]).values_list("pk", flat=True)
+    )
+
+
+@pytest.mark.parametrize("use_copy", [False, True])
+def test_upsert_csv_file_keeps_the_last_row_with_the_same_key(tmp_path, user, settings, use_copy):
+    settings.DIRECTORY_IMPORT_USE_COPY = use_copy
+    rows = [
+        ("Course", "http://example.org", "First", "Somewhere"),
+        ("Course", "http://example.org", "Last", "Somewhere"),
+    ]
+
+    counts = upsert_csv_file(write_csv(tmp_path / "import.csv", rows), EducationDirectory, creator=user)
+
+    assert counts == {"inserted": 1, "updated": 0, "unchanged": 1}
+    assert list(EducationDirectory.objects.values_list("description", flat=True)) == ["Last"]
+
+
+def test_both_loaders_store_the_same_values(tmp_path, user, settings):
+    file_path = write_csv(tmp_path / "import.csv", directory_rows(2))
+    upsert_csv_file(file_path, EducationDirectory, creator=user)
+    settings.DIRECTORY_IMPORT_USE_COPY = True
+
+    counts = upsert_csv_file(file_path, EducationDirectory, creator=user)
+
+    assert counts == {"inserted": 0, "updated": 0, "unchanged": 2}
@@ -0,0 +1,95 @@
+import pytest
+from django.urls import reverse
+
+from core.utils.pagination import (
+    KeysetPaginator, NextPagePaginator, decode_cursor, encode_cursor,
+)
+from education_directory.models import EducationDirectory
+
+
+def test_next_page_paginator_reads_one_object_more_than_a_page():
+    paginator = NextPagePaginator(list(range(25)), 10)
+
+    page = paginator.page(2)
+
+    assert list(page) == list(range(10, 20))
+    assert page.has_next()
+    assert page.has_previous()
+    assert not paginator.page(3).has_next()
+    assert list(paginator.page(4)) == []
+
+
+def test_next_page_paginator_starts_at_the_first_page():
+    paginator = NextPagePaginator(list(range(5)), 10)
+
+    for number in (None, "", "abc", "0", "-3"):
+        assert paginator.page(number).number == 1
+
+
+def test_next_page_paginator_does_not_read_past_max_page():
+    class Results(list):
+        def __getitem__(self, index):
+            raise AssertionError("read page %r" % index)
+
+    paginator = NextPagePaginator(Results(), 10)
+
+    page = paginator.page("99999999999999999999")
+
+    assert list(page) == []
+    assert not page.has_next()
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(["a", 1, None])) == ["a", 1, None]
+    assert decode_cursor("not a cursor") is None
+    assert decode_cursor(encode_cursor({"a": 1})) is None
+
+
+def read_pages(paginator):
+    pages = [paginator.page()]
+    while pages[-1].has_next():
+        pages.append(paginator.page(pages[-1].next_cursor))
+    return pages
+
+
+@pytest.mark.django_db
+def test_keyset_paginator_reads_every_object_once(user):
+    for i, description in enumerate(["b", None, "a", "b", None]):
+        EducationDirectory.objects.create(
+            title="Course %d" % i, link="http://example.org", institution="Somewhere",
+            description=description, creator=user,
+        )
+    expected = list(
+        EducationDirectory.objects.order_by("description", "pk").values_list("pk", flat=True)
+    )
+
+    for ordering, objects in (
+        (["description"], expected),
+        (["-description"], list(
+            EducationDirectory.objects.order_by("-description", "pk").values_list("pk", flat=True)
+        )),
+    ):
+        pages = read_pages(KeysetPaginator(EducationDirectory.objects.all(), 2, ordering))
+        assert [obj.pk for page in pages for obj in page] == objects
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert not pages[0].has_previous() and pages[1].has_previous()
+
+
+@pytest.mark.django_db
+def test_keyset_paginator_starts_over_on_an_invalid_cursor(user):
+    EducationDirectory.objects.create(
+        title="Course", link="http://example.org", institution="Somewhere", creator=user,
+    )
+    paginator = KeysetPaginator(EducationDirectory.objects.order_by("title"), 10)
+
+    for cursor in ("garbage", encode_cursor(["a"]), encode_cursor(["a", "not an id"])):
+        page = paginator.page(cursor)
+        assert page.cursor is None
+        assert len(page) == 1
+
+
+@pytest.mark.django_db
+def test_search_view_with_a_huge_page_number(client):
+    response = client.get(reverse("search"), {"query": "science", "page": "9" * 20})
+
+    assert response.status_code == 200
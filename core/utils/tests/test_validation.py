@@ -0,0 +1,114 @@
+import pytest
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from wagtail.documents import get_document_model
+
+from core import choices
+from core.libs import chkcsv
+from core.utils.validation import ErrorReport, start_validation, validate_file_upload
+from education_directory.models import EducationDirectoryFile
+from education_directory.tasks import FMT_FILE
+
+pytestmark = pytest.mark.django_db
+
+HEADER = "Title,Link,Description,Institution\n"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def upload(user, content):
+    document = get_document_model().objects.create(
+        title="upload", file=ContentFile(content.encode(), name="upload.csv"),
+    )
+    return EducationDirectoryFile.objects.create(attachment=document, creator=user)
+
+
+def test_validate_file_upload_stores_a_valid_result(user):
+    file_upload = upload(user, HEADER + "A,http://a.org,,Somewhere\nB,,,Elsewhere\n")
+
+    validate_file_upload(file_upload, FMT_FILE)
+
+    file_upload.refresh_from_db()
+    assert file_upload.is_valid
+    assert file_upload.validation_status == choices.VALIDATION_VALID
+    assert file_upload.validation_progress == 100
+    assert file_upload.error_count == 0
+    assert file_upload.line_count == 3
+
+
+def test_validate_file_upload_stores_the_errors(user):
+    file_upload = upload(user, HEADER + "A,,,\n")
+
+    validate_file_upload(file_upload, FMT_FILE)
+
+    file_upload.refresh_from_db()
+    assert not file_upload.is_valid
+    assert file_upload.validation_status == choices.VALIDATION_INVALID
+    assert file_upload.error_count == 1
+    assert "Institution" in file_upload.validation_errors
+
+
+def test_start_validation_runs_the_task_once_committed(user, django_capture_on_commit_callbacks):
+    class Task:
+        delayed = []
+
+        def delay(self, pk):
+            self.delayed.append(pk)
+
+    file_upload = upload(user, HEADER)
+    task = Task()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        start_validation(file_upload, task)
+
+    file_upload.refresh_from_db()
+    assert file_upload.validation_status == choices.VALIDATION_PENDING
+    assert task.delayed == [file_upload.pk]
+
+
+def test_validate_file_upload_reuses_the_result_of_the_same_file(user, monkeypatch):
+    content = HEADER + "A,,,\n"
+    validate_file_upload(upload(user, content), FMT_FILE)
+    cache.clear()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the file was checked again")
+
+    monkeypatch.setattr(chkcsv, "iter_csv_errors", fail)
+    file_upload = upload(user, content)
+    validate_file_upload(file_upload, FMT_FILE)
+
+    file_upload.refresh_from_db()
+    assert file_upload.validation_status == choices.VALIDATION_INVALID
+    assert file_upload.error_count == 1
+    assert file_upload.attachment_sha256
+
+
+def test_error_report_caps_the_errors_kept_per_column():
+    report = ErrorReport(max_per_column=2)
+    for line in range(2, 7):
+        report.add(("Missing data", "upload.csv", line, "Title"))
+    report.add(("Missing data", "upload.csv", 2, "Institution"))
+
+    assert [error[3] for error in report.errors] == ["Title", "Title", "Institution"]
+    assert report.spilled == 3
+    text = report.format()
+    assert "3 more errors are in the error report." in text
+    assert "Title: Missing data (5)" in text
+    report.close()
+
+
+def test_validate_file_upload_saves_the_report_of_all_the_errors(user, settings):
+    settings.DIRECTORY_VALIDATION_MAX_ERRORS_PER_COLUMN = 1
+    file_upload = upload(user, HEADER + "A,,,\nB,,,\nC,,,\n")
+
+    validate_file_upload(file_upload, FMT_FILE)
+
+    file_upload.refresh_from_db()
+    assert file_upload.error_count == 3
+    assert file_upload.validation_errors.count("Error:") == 1
+    with file_upload.error_report.open("r") as report:
+        assert len(report.read().splitlines()) == 4
@@ -0,0 +1,292 @@
+import csv
+import hashlib
+import io
+import logging
+import tempfile
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.db import transaction
+
+from core import choices
+from core.libs import chkcsv
+
+logger = logging.getLogger(__name__)
+
+# Minimum number of seconds between two progress updates of a file upload.
+PROGRESS_INTERVAL = 1.0
+
+# Fields of a file upload with the result of a validation.
+RESULT_FIELDS = (
+    "is_valid", "validation_status", "error_count", "validation_errors",
+    "line_count", "error_report",
+)
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def format_errors(errorlist):
+    """
+    Format the errors of chkcsv as one message per line.
+    """
+    return "\n".join(
+        " ".join(
+            "%s %s" % em
+            for em in zip(("Error:", "in file", "on line", "in column"), err)
+            if em[1]
+        )
+        for err in errorlist
+    )
+
+
+class ErrorReport:
+    """
+    Collect the errors of a validation in a bounded amount of memory.
+
+    At most max_per_column errors are kept for each column, the errors of a
+    whole row or of the header counting as one more column, and every error
+    is counted by column and message.  All the errors are also written as
+    CSV to a temporary file, which is saved as the error report of the file
+    upload when some of them were not kept.
+    """
+
+    def __init__(self, max_per_column=None):
+        self.max_per_column = (
+            max_per_column or settings.DIRECTORY_VALIDATION_MAX_ERRORS_PER_COLUMN
+        )
+        self.errors = []
+        self.kept = Counter()
+        self.counts = Counter()
+        self.spilled = 0
+        self.file = tempfile.TemporaryFile()
+        self.text = io.TextIOWrapper(self.file, encoding="utf-8", newline="")
+        self.writer = csv.writer(self.text)
+        self.writer.writerow(["line", "column", "error"])
+
+    def add(self, error):
+        line = error[2] if len(error) > 2 else ""
+        column = error[3] if len(error) > 3 else ""
+        self.counts[(column, error[0])] += 1
+        self.writer.writerow([line, column, error[0]])
+        if self.kept[column] < self.max_per_column:
+            self.kept[column] += 1
+            self.errors.append(error)
+        else:
+            self.spilled += 1
+
+    def format(self):
+        """
+        Format the errors kept and, when some were not, the number of errors
+        by column and message.
+        """
+        text = format_errors(self.errors)
+        if self.spilled:
+            text += "\n\n%d more errors are in the error report.\n" % self.spilled
+            text += "\n".join(
+                "%s: %s (%d)" % (column or "-", message, count)
+                for (column, message), count in self.counts.most_common()
+            )
+        return text
+
+    def save(self, file_upload):
+        """
+        Save the report of all the errors as the error_report of file_upload,
+        without saving file_upload, and return its name.
+        """
+        self.text.flush()
+        self.file.seek(0)
+        file_upload.error_report.save(
+            "%s-%s-errors.csv" % (file_upload._meta.model_name, file_upload.pk),
+            File(self.file),
+            save=False,
+        )
+        return file_upload.error_report.name
+
+    def close(self):
+        self.text.close()
+
+
+def file_sha256(fp):
+    """
+    Return the hexadecimal SHA-256 of the content of an open binary file.
+    """
+    digest = hashlib.sha256()
+    for block in iter(lambda: fp.read(HASH_BLOCK_SIZE), b""):
+        digest.update(block)
+    return digest.hexdigest()
+
+
+def document_sha256(document):
+    """
+    Return the SHA-256 of the file of a Wagtail document.
+
+    The hash is cached by primary key and by the hash Wagtail computes when
+    the file is uploaded or replaced, so the file of a document is only read
+    once.
+    """
+    key = "validation:sha256:%s:%s" % (document.pk, document.file_hash)
+    sha256 = cache.get(key) if document.file_hash else None
+    if sha256 is None:
+        with open(document.file.path, "rb") as fp:
+            sha256 = file_sha256(fp)
+        if document.file_hash:
+            cache.set(key, sha256, settings.DIRECTORY_VALIDATION_CACHE_TIMEOUT)
+    return sha256
+
+
+def format_sha256(fmt_file):
+    """
+    Return the SHA-256 of a format specification and of the version of
+    chkcsv, which may change what is an error.
+    """
+    with open(fmt_file, "rb") as fp:
+        digest = hashlib.sha256(fp.read())
+    digest.update(chkcsv._version.encode())
+    return digest.hexdigest()
+
+
+def result_cache_key(attachment_sha256, format_sha256):
+    return "validation:result:%s:%s" % (attachment_sha256, format_sha256)
+
+
+def cached_result(model, attachment_sha256, format_sha256):
+    """
+    Return the result of a previous validation of the same file with the same
+    format specification, or None.
+
+    The result is looked up in the cache, and then in the file uploads of
+    model already validated.
+    """
+    key = result_cache_key(attachment_sha256, format_sha256)
+    result = cache.get(key)
+    if result is None:
+        result = model.objects.filter(
+            attachment_sha256=attachment_sha256,
+            format_sha256=format_sha256,
+            validation_status__in=(
+                choices.VALIDATION_VALID, choices.VALIDATION_INVALID
+            ),
+        ).order_by("-updated").values(*RESULT_FIELDS).first()
+        if result is not None:
+            cache.set(key, result, settings.DIRECTORY_VALIDATION_CACHE_TIMEOUT)
+    return result
+
+
+def start_validation(file_upload, task):
+    """
+    Mark a file upload as pending and run the validation task once the
+    current transaction is committed.
+
+    The task is called with the primary key of the file upload.
+    """
+    file_upload.__class__.objects.filter(pk=file_upload.pk).update(
+        validation_status=choices.VALIDATION_PENDING,
+        validation_progress=0,
+    )
+    pk = file_upload.pk
+    transaction.on_commit(lambda: task.delay(pk))
+
+
+def validate_file_upload(file_upload, fmt_file):
+    """
+    Validate the attachment of a file upload with the format specification
+    in fmt_file.
+
+    The status, progress and throughput of the file upload are stored with
+    queryset updates as the file is read, so the admin can show them while
+    the validation runs and no save signal is sent.
+
+    The result is stored with the SHA-256 of the file and of the format
+    specification, and in the cache, and a file already validated with the
+    same specification is not read again (see cached_result).
+
+    All the errors of the file are reported, and the number of errors kept in
+    validation_errors is capped by ErrorReport.
+    """
+    model = file_upload.__class__
+    queryset = model.objects.filter(pk=file_upload.pk)
+    queryset.update(
+        validation_status=choices.VALIDATION_RUNNING,
+        validation_progress=0,
+        validation_throughput=None,
+        error_count=0,
+        validation_errors="",
+    )
+    try:
+        hashes = dict(
+            attachment_sha256=document_sha256(file_upload.attachment),
+            format_sha256=format_sha256(fmt_file),
+        )
+    except Exception as ex:
+        logger.exception("Validation of %s failed", file_upload)
+        queryset.update(
+            is_valid=False,
+            validation_status=choices.VALIDATION_FAILED,
+            validation_errors=str(ex),
+        )
+        return
+    result = cached_result(model, **hashes)
+    if result is not None:
+        queryset.update(validation_progress=100, **hashes, **result)
+        return
+
+    started = time.monotonic()
+    last_update = [started]
+
+    def progress(rows, bytes_read, size):
+        now = time.monotonic()
+        if now - last_update[0] < PROGRESS_INTERVAL:
+            return
+        last_update[0] = now
+        queryset.update(
+            validation_progress=min(99, int(100 * bytes_read / size)) if size else 0,
+            validation_throughput=rows / (now - started),
+        )
+
+    report = ErrorReport()
+    summary = {}
+    try:
+        cols = chkcsv.read_format_specs(fmt_file, True, False)
+        for error in chkcsv.iter_csv_errors(
+            file_upload.attachment.file.path, cols, False, True, True, False,
+            progress=progress, summary=summary,
+        ):
+            report.add(error)
+        error_report = report.save(file_upload) if report.spilled else ""
+    except Exception as ex:
+        logger.exception("Validation of %s failed", file_upload)
+        queryset.update(
+            is_valid=False,
+            validation_status=choices.VALIDATION_FAILED,
+            validation_errors=str(ex),
+        )
+        return
+    finally:
+        report.close()
+
+    elapsed = time.monotonic() - started
+    invalid = summary["error_count"] > 0
+    result = dict(
+        is_valid=not invalid,
+        validation_status=(
+            choices.VALIDATION_INVALID if invalid else choices.VALIDATION_VALID
+        ),
+        error_count=summary["error_count"],
+        validation_errors=report.format(),
+        line_count=0 if invalid else summary["line_count"],
+        error_report=error_report,
+    )
+    cache.set(
+        result_cache_key(**hashes), result,
+        settings.DIRECTORY_VALIDATION_CACHE_TIMEOUT,
+    )
+    queryset.update(
+        validation_progress=100,
+        validation_throughput=summary["rows"] / elapsed if elapsed else None,
+        **hashes,
+        **result,
+    )
+    return report.errors
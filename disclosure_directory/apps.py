@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DisclosureDirectoryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'disclosure_directory'
+
+    def ready(self):
+        import disclosure_directory.signals  # noqa F401
@@ -5,13 +5,18 @@ from django.utils.translation import gettext as _
 from wagtail.admin.edit_handlers import FieldPanel
 from wagtail.documents.edit_handlers import DocumentChooserPanel
 
-from core.models import CommonControlField
+from core.models import CommonControlField, CommonValidationField
 from .forms import DisclosureDirectoryForm, DisclosureDirectoryFileForm
 
 
 class DisclosureDirectory(CommonControlField):
     class Meta:
         verbose_name_plural = _('Disclosure Directory')
+        constraints = [
+            models.UniqueConstraint(
+                fields=('event', 'organization', 'link'), name='disclosuredirectory_import_key'
+            ),
+        ]
 
     event = models.CharField(_("Event"), max_length=255, null=False, blank=False)
     link = models.URLField(_("Link"), null=False, blank=False)
@@ -29,7 +34,25 @@ class DisclosureDirectory(CommonControlField):
     ]
     base_form_class = DisclosureDirectoryForm
 
-class DisclosureDirectoryFile(CommonControlField):
+    # Model fields filled from the columns of an uploaded CSV file.
+    import_fields = {
+        'event': 'Event',
+        'link': 'Link',
+        'description': 'Description',
+        'organization': 'Organization',
+    }
+
+    # Fields that identify a row, so importing a file again updates the rows
+    # instead of duplicating them. See the unique constraint in Meta.
+    import_key = ('event', 'organization', 'link')
+
+    # Fields in the site search, with their weight, and the fields shown in
+    # its results. See core/search/documents.py.
+    search_weights = {'event': 'A', 'organization': 'B', 'description': 'C'}
+    search_title = 'event'
+    search_link = 'link'
+
+class DisclosureDirectoryFile(CommonControlField, CommonValidationField):
     class Meta:
         verbose_name_plural = _('Disclosure Directory Upload')
 
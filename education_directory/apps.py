@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EducationDirectoryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'education_directory'
+
+    def ready(self):
+        import education_directory.signals  # noqa F401
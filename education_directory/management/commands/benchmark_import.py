@@ -0,0 +1,93 @@
+import csv
+import os
+import tempfile
+import time
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core.utils import bulk_import, copy_import
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the per row save() import of a directory upload with the "
+        "batched bulk import, and with COPY on PostgreSQL, on a synthetic CSV "
+        "file. The imported rows are deleted at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model", default="education_directory.EducationDirectory",
+            help="Directory model, as app_label.ModelName.",
+        )
+        parser.add_argument("--rows", type=int, default=100000)
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--skip-save", action="store_true",
+            help="Only run the bulk import.",
+        )
+        parser.add_argument("--username", default=None)
+
+    def handle(self, *args, **options):
+        model = apps.get_model(options["model"])
+        if options["username"]:
+            user = User.objects.filter(username=options["username"]).first()
+        else:
+            user = User.objects.filter(is_superuser=True).first()
+        if user is None:
+            raise CommandError("There is no user to set as creator of the rows.")
+
+        rows = options["rows"]
+        last_pk = model.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_path = os.path.join(tmpdir, "sample.csv")
+            self.write_sample(file_path, model, rows)
+            try:
+                if not options["skip_save"]:
+                    elapsed = self.run_save(file_path, model, user)
+                    self.report("save()", rows, elapsed)
+                    model.objects.filter(pk__gt=last_pk).delete()
+                start = time.perf_counter()
+                bulk_import.import_csv_file(
+                    file_path, model, options["batch_size"], creator=user
+                )
+                self.report("bulk import", rows, time.perf_counter() - start)
+                if connection.vendor == "postgresql":
+                    model.objects.filter(pk__gt=last_pk).delete()
+                    start = time.perf_counter()
+                    copy_import.copy_csv_file(file_path, model, creator=user)
+                    self.report("COPY", rows, time.perf_counter() - start)
+            finally:
+                model.objects.filter(pk__gt=last_pk).delete()
+
+    def write_sample(self, file_path, model, rows):
+        columns = list(model.import_fields.values())
+        with open(file_path, "w") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(columns)
+            for i in range(rows):
+                writer.writerow(
+                    "http://example.org/%d" % i if column == "Link" else "%s %d" % (column, i)
+                    for column in columns
+                )
+
+    def run_save(self, file_path, model, user):
+        """
+        Import the file like the import_file views did before the bulk
+        import: one save() per row, in the transaction of the request.
+        """
+        start = time.perf_counter()
+        with transaction.atomic():
+            for obj in bulk_import.read_csv_objects(file_path, model, creator=user):
+                obj.save()
+        return time.perf_counter() - start
+
+    def report(self, name, rows, elapsed):
+        self.stdout.write(
+            "%s: %d rows in %.2fs (%.0f rows/s)" % (name, rows, elapsed, rows / elapsed)
+        )
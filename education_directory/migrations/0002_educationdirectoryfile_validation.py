@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education_directory', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='educationdirectoryfile',
+            name='validation_status',
+            field=models.CharField(blank=True, choices=[('pending', 'Pending'), ('running', 'Running'), ('valid', 'Valid'), ('invalid', 'Invalid'), ('failed', 'Failed')], default='', max_length=16, verbose_name='Validation status'),
+        ),
+        migrations.AddField(
+            model_name='educationdirectoryfile',
+            name='validation_progress',
+            field=models.PositiveSmallIntegerField(blank=True, default=0, verbose_name='Validation progress (%)'),
+        ),
+        migrations.AddField(
+            model_name='educationdirectoryfile',
+            name='validation_throughput',
+            field=models.FloatField(blank=True, null=True, verbose_name='Rows per second'),
+        ),
+        migrations.AddField(
+            model_name='educationdirectoryfile',
+            name='error_count',
+            field=models.IntegerField(blank=True, default=0, verbose_name='Number of errors'),
+        ),
+        migrations.AddField(
+            model_name='educationdirectoryfile',
+            name='validation_errors',
+            field=models.TextField(blank=True, default='', verbose_name='Validation errors'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import migrations, models
+
+
+# Fields of the unique constraint, and number of duplicated keys listed in
+# the error.
+IMPORT_KEY = ('title', 'institution', 'link')
+LISTED_DUPLICATES = 20
+
+
+def check_duplicates(apps, schema_editor):
+    """
+    Stop the migration when rows have the same import key, so they are
+    merged by an operator instead of deleted here.
+    """
+    EducationDirectory = apps.get_model('education_directory', 'EducationDirectory')
+    duplicates = list(
+        EducationDirectory.objects.values(*IMPORT_KEY)
+        .annotate(count=models.Count('id'), ids=ArrayAgg('id', ordering='id'))
+        .filter(count__gt=1)
+        .order_by()[:LISTED_DUPLICATES]
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Rows of %s have the same %s, remove or merge them before "
+            "migrating again (at most %d keys listed):\n%s" % (
+                EducationDirectory._meta.db_table,
+                ", ".join(IMPORT_KEY),
+                LISTED_DUPLICATES,
+                "\n".join(
+                    "ids %s: %s" % (
+                        ", ".join(str(pk) for pk in row.pop('ids')),
+                        {name: row[name] for name in IMPORT_KEY},
+                    )
+                    for row in duplicates
+                ),
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education_directory', '0002_educationdirectoryfile_validation'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='educationdirectory',
+            constraint=models.UniqueConstraint(fields=('title', 'institution', 'link'), name='educationdirectory_import_key'),
+        ),
+    ]
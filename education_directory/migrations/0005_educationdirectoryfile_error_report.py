@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education_directory', '0004_educationdirectoryfile_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='educationdirectoryfile',
+            name='error_report',
+            field=models.FileField(blank=True, upload_to='validation_reports/', verbose_name='Error report'),
+        ),
+    ]
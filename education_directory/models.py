@@ -5,13 +5,18 @@ from django.utils.translation import gettext as _
 from wagtail.admin.edit_handlers import FieldPanel
 from wagtail.documents.edit_handlers import DocumentChooserPanel
 
-from core.models import CommonControlField
+from core.models import CommonControlField, CommonValidationField
 from .forms import EducationDirectoryForm, EducationDirectoryFileForm
 
 
 class EducationDirectory(CommonControlField):
     class Meta:
         verbose_name_plural = _('Education Directory')
+        constraints = [
+            models.UniqueConstraint(
+                fields=('title', 'institution', 'link'), name='educationdirectory_import_key'
+            ),
+        ]
 
     title = models.CharField(_("Title"), max_length=255, null=False, blank=False)
     link = models.URLField(_("Link"), null=False, blank=False)
@@ -40,7 +45,25 @@ class EducationDirectory(CommonControlField):
     ]
     base_form_class = EducationDirectoryForm
 
-class EducationDirectoryFile(CommonControlField):
+    # Model fields filled from the columns of an uploaded CSV file.
+    import_fields = {
+        'title': 'Title',
+        'link': 'Link',
+        'description': 'Description',
+        'institution': 'Institution',
+    }
+
+    # Fields that identify a row, so importing a file again updates the rows
+    # instead of duplicating them. See the unique constraint in Meta.
+    import_key = ('title', 'institution', 'link')
+
+    # Fields in the site search, with their weight, and the fields shown in
+    # its results. See core/search/documents.py.
+    search_weights = {'title': 'A', 'institution': 'B', 'description': 'C'}
+    search_title = 'title'
+    search_link = 'link'
+
+class EducationDirectoryFile(CommonControlField, CommonValidationField):
     class Meta:
         verbose_name_plural = _('Education Directory Upload')
 
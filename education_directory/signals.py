@@ -0,0 +1,17 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from core.utils.validation import start_validation
+
+from .models import EducationDirectoryFile
+from .tasks import validate_file
+
+
+@receiver(post_save, sender=EducationDirectoryFile)
+def validate_uploaded_file(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Start the background validation when a file upload is created or saved
+    from its form.
+    """
+    if instance.attachment_id and (created or update_fields is None):
+        start_validation(instance, validate_file)
@@ -6,6 +6,8 @@ from wagtail.core import hooks
 from wagtail.contrib.modeladmin.views import CreateView
 from wagtail.contrib.modeladmin.options import (ModelAdmin, modeladmin_register, ModelAdminGroup)
 
+from core.utils.modeladmin import KeysetIndexView
+
 from .models import EducationDirectory, EducationDirectoryFile
 from .button_helper import EducationDirectoryHelper
 from .views import validate, import_file
@@ -27,6 +29,8 @@ class EducationDirectoryFileCreateView(CreateView):
 
 class EducationDirectoryAdmin(ModelAdmin):
     model = EducationDirectory
+    index_view_class = KeysetIndexView
+    index_template_name = 'modeladmin/keyset_index.html'
     create_view_class = EducationDirectoryCreateView
     menu_label = _('Education Directory')
     menu_icon = 'folder'
@@ -49,11 +53,18 @@ class EducationDirectoryFileAdmin(ModelAdmin):
     menu_order = 200
     add_to_settings_menu = False
     exclude_from_explorer = False
-    list_display = ('attachment', 'line_count', 'is_valid', 'creator',
+    list_display = ('attachment', 'line_count', 'is_valid',
+                    'validation_status', 'validation_progress',
+                    'validation_throughput', 'error_count',
+                    'error_report_link', 'creator',
                     'updated', 'created', )
-    list_filter = ('is_valid', )
+    list_filter = ('is_valid', 'validation_status', )
     search_fields = ('attachment', )
 
+    def get_extra_attrs_for_row(self, obj, context):
+        # Used by the index template to refresh the list while validating.
+        return {'data-validation-status': obj.validation_status}
+
 
 class EducationDirectoryAdminGroup(ModelAdminGroup):
     menu_label = _('Education Directory')
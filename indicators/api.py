@@ -0,0 +1,146 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import require_GET
+
+from .cube import oa_share
+
+# Cache key of the version of the indicators, the time of their last change,
+# which is part of the keys of the cached responses.
+VERSION_KEY = "indicators:version"
+
+
+def parse_bool(value):
+    """
+    Return the boolean of true or false, in any case, and raise ValueError
+    for any other value.
+    """
+    try:
+        return {"true": True, "false": False}[value.lower()]
+    except KeyError:
+        raise ValueError(value)
+
+
+# Dimensions of the cube an indicator can be grouped by, with the parser of
+# their values in the query string.
+GROUPS = {
+    "year": int,
+    "genre": str,
+    "is_oa": parse_bool,
+    "journal_is_in_doaj": parse_bool,
+    "publisher": str,
+    "journal_issn_l": str,
+}
+
+# Parameters of a range of years, with their lookups.
+RANGES = {"year_from": "year__gte", "year_to": "year__lte"}
+
+
+class IndicatorQueryError(ValueError):
+    pass
+
+
+def indicators_version():
+    """
+    Return the version of the indicators, set to now when it is not cached,
+    as when it was evicted, so no stale response can be served.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = int(time.time())
+        if not cache.add(VERSION_KEY, version, timeout=None):
+            version = cache.get(VERSION_KEY, version)
+    return version
+
+
+def invalidate_indicators():
+    """
+    Start a new version of the indicators, so the cached responses are not
+    used anymore; they expire on their own.
+    """
+    cache.set(VERSION_KEY, max(int(time.time()), indicators_version() + 1), timeout=None)
+
+
+def parse_query(params):
+    """
+    Return the dimensions to group by and the filters of a query string.
+
+    by is a comma separated list of dimensions; the other parameters are
+    dimensions with the value to filter on, and year_from and year_to.
+    """
+    by = [name for name in params.get("by", "year").split(",") if name]
+    if not by:
+        raise IndicatorQueryError("No dimension to group by.")
+    unknown = set(by) - set(GROUPS)
+    if unknown:
+        raise IndicatorQueryError("Unknown dimensions: %s." % ", ".join(sorted(unknown)))
+    filters = {}
+    for name, value in params.items():
+        if name == "by":
+            continue
+        if name in GROUPS:
+            lookup, parse = name, GROUPS[name]
+        elif name in RANGES:
+            lookup, parse = RANGES[name], int
+        else:
+            raise IndicatorQueryError("Unknown parameter: %s." % name)
+        try:
+            filters[lookup] = parse(value)
+        except ValueError:
+            raise IndicatorQueryError("Invalid value of %s." % name)
+    return by, filters
+
+
+def indicator_entry(by, filters, version):
+    """
+    Return the cached entry of an indicator, the JSON body and its ETag, at
+    version, computing it from the cube on a miss.
+    """
+    query = json.dumps([by, sorted(filters.items())])
+    key = "indicators:%s:oa_share:%s" % (version, hashlib.sha1(query.encode()).hexdigest())
+    entry = cache.get(key)
+    if entry is None:
+        body = json.dumps({
+            "by": by,
+            "results": [
+                {name: row[name] for name in by + ["total", "oa", "share"]}
+                for row in oa_share(by, **filters)
+            ],
+        }, separators=(",", ":"))
+        entry = {"body": body, "etag": '"%s"' % hashlib.sha1(body.encode()).hexdigest()}
+        cache.set(key, entry, timeout=settings.INDICATORS_CACHE_TIMEOUT)
+    return entry
+
+
+@transaction.non_atomic_requests
+@require_GET
+def oa_share_view(request):
+    """
+    This view function returns the number of articles, of open access
+    articles and the open access share, grouped by the dimensions in the
+    by parameter, as JSON.
+
+    The responses are cached under the version of the indicators, which
+    also is their Last-Modified time, and carry a strong ETag, so a
+    revalidation of unchanged data gets a 304 without reaching the database.
+    """
+    try:
+        by, filters = parse_query(request.GET)
+    except IndicatorQueryError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    version = indicators_version()
+    entry = indicator_entry(by, filters, version)
+    response = HttpResponse(entry["body"], content_type="application/json")
+    response["ETag"] = entry["etag"]
+    response["Last-Modified"] = http_date(version)
+    patch_cache_control(response, public=True, max_age=settings.INDICATORS_API_MAX_AGE)
+    return get_conditional_response(
+        request, etag=entry["etag"], last_modified=version, response=response,
+    )
@@ -0,0 +1,124 @@
+import datetime
+import hashlib
+import json
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import BigIntegerField, Case, Count, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, ExtractYear
+
+from scholarly_articles.models import ScholarlyArticles
+
+from .models import ArticleCount
+
+# Dimensions of the cube, fields of ArticleCount.
+DIMENSIONS = ("year", "genre", "is_oa", "journal_is_in_doaj", "publisher", "journal_issn_l")
+
+
+def article_cell(values):
+    """
+    Return the cell of the cube of an article, a tuple of the values of the
+    DIMENSIONS, from a dictionary of the fields of the article.
+    """
+    published = values.get("published_date")
+    return (
+        published.astimezone(datetime.timezone.utc).year if published else None,
+        values.get("genre") or "",
+        values.get("is_oa"),
+        values.get("journal_is_in_doaj"),
+        values.get("publisher") or "",
+        values.get("journal_issn_l") or "",
+    )
+
+
+def cell_key(cell):
+    return hashlib.sha1(json.dumps(cell).encode()).hexdigest()
+
+
+def change_deltas(changes):
+    """
+    Return the Counter of cell to change of count for changes, a list of the
+    (before, after) values of articles written, before being None for an
+    article inserted and after None for one deleted.
+    """
+    deltas = Counter()
+    for before, after in changes:
+        if after is not None:
+            deltas[article_cell(after)] += 1
+        if before is not None:
+            deltas[article_cell(before)] -= 1
+    return deltas
+
+
+def apply_deltas(deltas):
+    """
+    Add deltas, a Counter of cell to change of count, to the cells of the
+    cube, in the current transaction.
+
+    The cells whose count falls to zero are removed.
+    """
+    cells = {cell_key(cell): (cell, delta) for cell, delta in deltas.items() if delta}
+    if not cells:
+        return
+    table = connection.ops.quote_name(ArticleCount._meta.db_table)
+    params = []
+    for key, (cell, delta) in cells.items():
+        params.extend((key,) + cell + (delta,))
+    columns = ("key",) + DIMENSIONS + ("count",)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO %s (%s) VALUES %s "
+            "ON CONFLICT (key) DO UPDATE SET count = %s.count + EXCLUDED.count"
+            % (
+                table,
+                ", ".join(connection.ops.quote_name(column) for column in columns),
+                ", ".join(["(%s)" % ", ".join(["%s"] * len(columns))] * len(cells)),
+                table,
+            ),
+            params,
+        )
+    ArticleCount.objects.filter(key__in=cells, count__lte=0).delete()
+
+
+def rebuild_cube():
+    """
+    Count the scholarly articles again, with one GROUP BY over the table,
+    and replace the cells of the cube.
+    """
+    counts = (
+        ScholarlyArticles.objects.annotate(
+            year=ExtractYear("published_date", tzinfo=datetime.timezone.utc)
+        )
+        .values_list(
+            "year", "genre", "is_oa", "journal_is_in_doaj",
+            Coalesce("publisher", Value("")), "journal_issn_l",
+        )
+        .annotate(count=Count("pk")).order_by()
+    )
+    with transaction.atomic():
+        ArticleCount.objects.all().delete()
+        ArticleCount.objects.bulk_create(
+            (
+                ArticleCount(key=cell_key(tuple(cell)), count=count, **dict(zip(DIMENSIONS, cell)))
+                for *cell, count in counts.iterator()
+            ),
+            batch_size=settings.SCHOLARLY_INGEST_BATCH_SIZE,
+        )
+
+
+def oa_share(by=("year",), **filters):
+    """
+    Return, for each combination of the values of the dimensions in by, the
+    number of articles, of open access articles, and the share of open
+    access articles, from the cells of the cube that match filters.
+
+    For example oa_share(("year", "publisher"), year__gte=2015).
+    """
+    oa = Case(When(is_oa=True, then=F("count")), default=Value(0), output_field=BigIntegerField())
+    return (
+        ArticleCount.objects.filter(**filters).values(*by)
+        .annotate(total=Sum("count"), oa=Sum(oa))
+        .annotate(share=Cast(F("oa"), FloatField()) / Cast(F("total"), FloatField()))
+        .order_by(*by)
+    )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from indicators.api import invalidate_indicators
+from indicators.cube import rebuild_cube
+from indicators.models import ArticleCount
+
+
+class Command(BaseCommand):
+    help = (
+        "Count the scholarly articles again and replace the cells of the "
+        "open access cube, which the ingest otherwise keeps up to date."
+    )
+
+    def handle(self, *args, **options):
+        rebuild_cube()
+        invalidate_indicators()
+        self.stdout.write("%d cells." % ArticleCount.objects.count())
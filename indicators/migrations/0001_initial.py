@@ -0,0 +1,42 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=40, unique=True, verbose_name='Key')),
+                ('year', models.SmallIntegerField(blank=True, null=True, verbose_name='Year')),
+                ('genre', models.CharField(blank=True, choices=[('', ''), ('Book Section', 'book-section'), ('Monograph', 'monograph'), ('Report', 'report'), ('Peer Review', 'peer-review'), ('Book Track', 'book-track'), ('Journal Article', 'journal-article'), ('Part', 'book-part'), ('Other', 'other'), ('Book', 'book'), ('Journal Volume', 'journal-volume'), ('Book Set', 'book-set'), ('Reference Entry', 'reference-entry'), ('Proceedings Article', 'proceedings-article'), ('Journal', 'journal'), ('Component', 'component'), ('Book Chapter', 'book-chapter'), ('Proceedings Series', 'proceedings-series'), ('Report Series', 'report-series'), ('Proceedings', 'proceedings'), ('Standard', 'standard'), ('Reference Book', 'reference-book'), ('Posted Content', 'posted-content'), ('Journal Issue', 'journal-issue'), ('Dissertation', 'dissertation'), ('Grant', 'grant'), ('Dataset', 'dataset'), ('Book Series', 'book-series'), ('Edited Book', 'edited-book'), ('Standard Series', 'standard-series')], default='', max_length=255, verbose_name='Resource Type')),
+                ('is_oa', models.BooleanField(blank=True, null=True, verbose_name='Open Access')),
+                ('journal_is_in_doaj', models.BooleanField(blank=True, null=True, verbose_name='DOAJ')),
+                ('publisher', models.CharField(blank=True, default='', max_length=255, verbose_name='Publisher')),
+                ('journal_issn_l', models.CharField(blank=True, default='', max_length=255, verbose_name='ISSN-L')),
+                ('count', models.BigIntegerField(default=0, verbose_name='Count')),
+            ],
+            options={
+                'verbose_name': 'Article count',
+                'verbose_name_plural': 'Article counts',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='articlecount',
+            index=models.Index(fields=['year', 'publisher'], name='articlecount_year_publisher'),
+        ),
+        migrations.AddIndex(
+            model_name='articlecount',
+            index=models.Index(fields=['publisher', 'year'], name='articlecount_publisher_year'),
+        ),
+        migrations.AddIndex(
+            model_name='articlecount',
+            index=models.Index(fields=['journal_issn_l', 'year'], name='articlecount_issn_year'),
+        ),
+    ]
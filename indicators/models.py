@@ -0,0 +1,38 @@
+from django.db import models
+from django.utils.translation import gettext as _
+
+from scholarly_articles import choices
+
+
+class ArticleCount(models.Model):
+    """
+    A cell of the open access cube: the number of scholarly articles with
+    one combination of the values of the dimensions.
+
+    The cells are kept up to date by the ingest of the articles, see
+    cube.py, so the indicators are sums over a few cells instead of GROUP BY
+    scans of the articles.
+    """
+    # SHA-1 of the values of the dimensions, as the nullable dimensions
+    # cannot be part of a unique constraint.
+    key = models.CharField(_("Key"), max_length=40, unique=True)
+    year = models.SmallIntegerField(_("Year"), null=True, blank=True)
+    genre = models.CharField(_("Resource Type"), max_length=255, choices=choices.TYPE_OF_RESOURCE,
+                             blank=True, default="")
+    is_oa = models.BooleanField(_("Open Access"), null=True, blank=True)
+    journal_is_in_doaj = models.BooleanField(_("DOAJ"), null=True, blank=True)
+    publisher = models.CharField(_("Publisher"), max_length=255, blank=True, default="")
+    journal_issn_l = models.CharField(_("ISSN-L"), max_length=255, blank=True, default="")
+    count = models.BigIntegerField(_("Count"), default=0)
+
+    class Meta:
+        verbose_name = _("Article count")
+        verbose_name_plural = _("Article counts")
+        indexes = [
+            models.Index(fields=['year', 'publisher'], name='articlecount_year_publisher'),
+            models.Index(fields=['publisher', 'year'], name='articlecount_publisher_year'),
+            models.Index(fields=['journal_issn_l', 'year'], name='articlecount_issn_year'),
+        ]
+
+    def __str__(self):
+        return "%s %s %s: %d" % (self.year, self.publisher, self.journal_issn_l, self.count)
@@ -0,0 +1,37 @@
+from django.db import transaction
+from django.dispatch import receiver
+
+from scholarly_articles.signals import articles_loaded, articles_written, ingest_finished
+
+from .api import invalidate_indicators
+from .cube import apply_deltas, change_deltas, rebuild_cube
+
+
+@receiver(articles_written)
+def update_cube(sender, changes, orm=False, **kwargs):
+    """
+    Add the articles written by an ingest batch, or saved with the ORM, to
+    the cube, in the transaction that wrote them.  The cached indicators
+    are invalidated after a save with the ORM once it is committed, and
+    after an ingest once it finished.
+    """
+    apply_deltas(change_deltas(changes))
+    if orm:
+        transaction.on_commit(invalidate_indicators)
+
+
+@receiver(articles_loaded)
+def recount_cube(sender, **kwargs):
+    """
+    Count the articles again after a bulk load, whose changes are not known.
+    """
+    rebuild_cube()
+    invalidate_indicators()
+
+
+@receiver(ingest_finished)
+def invalidate_cached_indicators(sender, **kwargs):
+    """
+    Serve the indicators from the cube again once an ingest finished.
+    """
+    invalidate_indicators()
@@ -0,0 +1,130 @@
+import datetime
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from scholarly_articles.models import ScholarlyArticles
+
+from .api import IndicatorQueryError, invalidate_indicators, parse_query
+from .cube import oa_share, rebuild_cube
+from .models import ArticleCount
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def create_article(doi, year, is_oa, **fields):
+    values = dict(
+        genre="journal-article", journal_issns="1234-5678", journal_issn_l="1234-5678",
+        published_date=datetime.datetime(year, 5, 1, tzinfo=datetime.timezone.utc),
+        is_oa=is_oa,
+    )
+    values.update(fields)
+    return ScholarlyArticles.objects.create(doi=doi, **values)
+
+
+def cells():
+    return sorted(
+        ArticleCount.objects.values_list("year", "is_oa", "publisher", "count")
+    )
+
+
+def test_the_cube_follows_the_saved_and_deleted_articles():
+    article = create_article("10.1/a", 2018, True, publisher="P")
+    create_article("10.1/b", 2018, False, publisher="P")
+    create_article("10.1/c", 2019, True)
+    assert cells() == [(2018, False, "P", 1), (2018, True, "P", 1), (2019, True, "", 1)]
+
+    article.is_oa = False
+    article.save()
+    assert cells() == [(2018, False, "P", 2), (2019, True, "", 1)]
+
+    article.delete()
+    assert cells() == [(2018, False, "P", 1), (2019, True, "", 1)]
+
+
+def test_rebuild_cube_matches_the_incremental_counts():
+    create_article("10.1/a", 2018, True, publisher="P")
+    create_article("10.1/b", 2018, True, publisher="P")
+    create_article("10.1/c", 2019, None)
+    incremental = cells()
+
+    rebuild_cube()
+
+    assert cells() == incremental
+
+
+def test_oa_share():
+    create_article("10.1/a", 2018, True)
+    create_article("10.1/b", 2018, False)
+    create_article("10.1/c", 2018, False)
+    create_article("10.1/d", 2019, True)
+
+    assert [
+        (row["year"], row["total"], row["oa"], round(row["share"], 2))
+        for row in oa_share(("year",))
+    ] == [(2018, 3, 1, 0.33), (2019, 1, 1, 1.0)]
+    assert [row["year"] for row in oa_share(("year",), year__gte=2019)] == [2019]
+
+
+def test_parse_query():
+    assert parse_query({"by": "year,publisher", "is_oa": "true", "year_from": "2015"}) == (
+        ["year", "publisher"], {"is_oa": True, "year__gte": 2015},
+    )
+    assert parse_query({"is_oa": "FALSE"}) == (["year"], {"is_oa": False})
+    for params in ({"by": "title"}, {"by": ""}, {"year_to": "soon"}, {"other": "1"}, {"is_oa": "ture"}):
+        with pytest.raises(IndicatorQueryError):
+            parse_query(params)
+
+
+def test_oa_share_view_revalidates_with_the_etag(client, django_assert_num_queries):
+    create_article("10.1/a", 2018, True)
+    url = reverse("indicators_api:oa_share")
+
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert response.json() == {"by": ["year"], "results": [
+        {"year": 2018, "total": 1, "oa": 1, "share": 1.0},
+    ]}
+    with django_assert_num_queries(0):
+        revalidated = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert revalidated.status_code == 304
+
+
+def test_oa_share_view_serves_the_new_counts_once_invalidated(client):
+    create_article("10.1/a", 2018, True)
+    url = reverse("indicators_api:oa_share")
+    etag = client.get(url)["ETag"]
+    create_article("10.1/b", 2018, False)
+
+    invalidate_indicators()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert response.json()["results"][0]["total"] == 2
+
+
+def test_oa_share_view_rejects_an_unknown_dimension(client):
+    response = client.get(reverse("indicators_api:oa_share"), {"by": "title"})
+
+    assert response.status_code == 400
+
+
+def test_oa_share_view_serves_the_new_counts_after_an_admin_save(client, django_capture_on_commit_callbacks):
+    article = create_article("10.1/a", 2018, True)
+    url = reverse("indicators_api:oa_share")
+    etag = client.get(url)["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        article.is_oa = False
+        article.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert response.json()["results"][0]["oa"] == 0
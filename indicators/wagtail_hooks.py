@@ -0,0 +1,29 @@
+from django.utils.translation import gettext as _
+
+from wagtail.contrib.modeladmin.options import (ModelAdmin, modeladmin_register)
+
+from .models import ArticleCount
+
+
+class ArticleCountAdmin(ModelAdmin):
+    model = ArticleCount
+    menu_label = _('Open Access Indicators')
+    menu_icon = 'table'
+    menu_order = 500
+    add_to_settings_menu = False
+    exclude_from_explorer = False
+    inspect_view_enabled = True
+    list_display = (
+        'year',
+        'genre',
+        'is_oa',
+        'journal_is_in_doaj',
+        'publisher',
+        'journal_issn_l',
+        'count',
+    )
+    list_filter = ('is_oa', 'journal_is_in_doaj')
+    search_fields = ('publisher', 'journal_issn_l')
+
+
+modeladmin_register(ArticleCountAdmin)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class InfrastructureDirectoryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'infrastructure_directory'
+
+    def ready(self):
+        import infrastructure_directory.signals  # noqa F401
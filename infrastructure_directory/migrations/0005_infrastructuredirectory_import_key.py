@@ -0,0 +1,53 @@
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import migrations, models
+
+
+# Fields of the unique constraint, and number of duplicated keys listed in
+# the error.
+IMPORT_KEY = ('link',)
+LISTED_DUPLICATES = 20
+
+
+def check_duplicates(apps, schema_editor):
+    """
+    Stop the migration when rows have the same import key, so they are
+    merged by an operator instead of deleted here.
+    """
+    InfrastructureDirectory = apps.get_model('infrastructure_directory', 'InfrastructureDirectory')
+    duplicates = list(
+        InfrastructureDirectory.objects.values(*IMPORT_KEY)
+        .annotate(count=models.Count('id'), ids=ArrayAgg('id', ordering='id'))
+        .filter(count__gt=1)
+        .order_by()[:LISTED_DUPLICATES]
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Rows of %s have the same %s, remove or merge them before "
+            "migrating again (at most %d keys listed):\n%s" % (
+                InfrastructureDirectory._meta.db_table,
+                ", ".join(IMPORT_KEY),
+                LISTED_DUPLICATES,
+                "\n".join(
+                    "ids %s: %s" % (
+                        ", ".join(str(pk) for pk in row.pop('ids')),
+                        {name: row[name] for name in IMPORT_KEY},
+                    )
+                    for row in duplicates
+                ),
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('infrastructure_directory', '0004_infrastructuredirectoryfile_validation'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='infrastructuredirectory',
+            constraint=models.UniqueConstraint(fields=('link',), name='infrastructuredirectory_import_key'),
+        ),
+    ]
@@ -5,13 +5,18 @@ from django.utils.translation import gettext as _
 from wagtail.admin.edit_handlers import FieldPanel
 from wagtail.documents.edit_handlers import DocumentChooserPanel
 
-from core.models import CommonControlField
+from core.models import CommonControlField, CommonValidationField
 from .forms import InfrastructureDirectoryForm, InfrastructureDirectoryFileForm
 
 
 class InfrastructureDirectory(CommonControlField):
     class Meta:
         verbose_name_plural = _('Infraestructure Directory')
+        constraints = [
+            models.UniqueConstraint(
+                fields=('link',), name='infrastructuredirectory_import_key'
+            ),
+        ]
 
     title = models.CharField(_("Title"), max_length=255, null=False, blank=False)
     link = models.URLField(_("Link"), null=False, blank=False)
@@ -25,7 +30,24 @@ class InfrastructureDirectory(CommonControlField):
     ]
     base_form_class = InfrastructureDirectoryForm
 
-class InfrastructureDirectoryFile(CommonControlField):
+    # Model fields filled from the columns of an uploaded CSV file.
+    import_fields = {
+        'title': 'Title',
+        'link': 'Link',
+        'description': 'Description',
+    }
+
+    # Fields that identify a row, so importing a file again updates the rows
+    # instead of duplicating them. See the unique constraint in Meta.
+    import_key = ('link',)
+
+    # Fields in the site search, with their weight, and the fields shown in
+    # its results. See core/search/documents.py.
+    search_weights = {'title': 'A', 'description': 'C'}
+    search_title = 'title'
+    search_link = 'link'
+
+class InfrastructureDirectoryFile(CommonControlField, CommonValidationField):
     class Meta:
         verbose_name_plural = _('Infraestructure Directory Upload')
 
@@ -0,0 +1,24 @@
+import os
+
+from django.conf import settings
+
+from config import celery_app
+from core.utils.validation import validate_file_upload
+
+from .models import InfrastructureDirectoryFile
+
+FMT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chkcsvfmt.fmt")
+
+
+@celery_app.task(
+    soft_time_limit=settings.DIRECTORY_VALIDATION_TIME_LIMIT,
+    time_limit=settings.DIRECTORY_VALIDATION_TIME_LIMIT + 60,
+)
+def validate_file(file_id):
+    """
+    Validate the attachment of a InfrastructureDirectoryFile with the chkcsvfmt.fmt
+    specification and store the result on it.
+    """
+    file_upload = InfrastructureDirectoryFile.objects.filter(pk=file_id).first()
+    if file_upload and file_upload.attachment:
+        validate_file_upload(file_upload, FMT_FILE)
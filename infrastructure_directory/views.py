@@ -1,5 +1,5 @@
 import os
-import csv
+from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect
 from django.http import HttpResponse, Http404
 from django.utils.translation import gettext as _
@@ -7,48 +7,36 @@ from django.utils.translation import gettext as _
 
 from wagtail.admin import messages
 
-from core.libs import chkcsv
+from core.utils import bulk_import
+from core.utils.validation import start_validation
 
 from .models import InfrastructureDirectoryFile, InfrastructureDirectory
+from .tasks import validate_file
 
 
 def validate(request):
     """
-    This view function validade a csv file based on a pre definition os the fmt
-    file.
+    This view function starts the validation of a csv file, based on a pre
+    definition os the fmt file, in background.
 
-    The check_csv_file function check that all of the required columns and data
+    The validate_file task check that all of the required columns and data
     are present in the CSV file, and that the data conform to the appropriate
-    type and other specifications, when it is not valid return a list with the
-    errors.
+    type and other specifications, and stores the status, progress and errors
+    in the InfrastructureDirectoryFile.
     """
-    errorlist = []
     file_id = request.GET.get("file_id", None)
 
     if file_id:
         file_upload = get_object_or_404(InfrastructureDirectoryFile, pk=file_id)
 
     if request.method == 'GET':
-        try:
-            upload_path = file_upload.attachment.file.path
-            cols = chkcsv.read_format_specs(
-                os.path.dirname(os.path.abspath(__file__)) + "/chkcsvfmt.fmt", True, False)
-            errorlist = chkcsv.check_csv_file(upload_path, cols, True, True, True, False)
-            if errorlist:
-                raise Exception(_("Valication error"))
-            else:
-                file_upload.is_valid = True
-                fp = open(upload_path)
-                file_upload.line_count = len(fp.readlines())
-                file_upload.save()
-        except Exception as ex:
-            messages.error(request, _("Valication error: %s") % errorlist)
-        else:
-            messages.success(request, _("File successfully validated!"))
+        start_validation(file_upload, validate_file)
+        messages.success(request, _("File validation started!"))
 
     return redirect(request.META.get('HTTP_REFERER'))
 
 
+@transaction.non_atomic_requests
 def import_file(request):
     """
     This view function import the data from a CSV file.
@@ -58,6 +46,11 @@ def import_file(request):
         Title,Link,Description
         FAPESP,http://www.fapesp.com.br,primary
 
+    The rows are inserted or updated, matched on InfrastructureDirectory.import_key,
+    in batches of settings.DIRECTORY_IMPORT_BATCH_SIZE, each one committed in
+    its own transaction, so importing a file again does not duplicate its rows
+    and an error only discards the rows of the batch that failed.
+
     TODO: This function must be a task.
     """
     file_id = request.GET.get("file_id", None)
@@ -68,20 +61,14 @@ def import_file(request):
     file_path = file_upload.attachment.file.path
 
     try:
-        with open(file_path, 'r') as csvfile:
-            data = csv.DictReader(csvfile)
-
-            for row in data:
-                isd = InfrastructureDirectory()
-                isd.title = row['Title']
-                isd.link = row['Link']
-                isd.description = row['Description']
-                isd.creator = request.user
-                isd.save()
+        counts = bulk_import.upsert_csv_file(file_path, InfrastructureDirectory, creator=request.user)
     except Exception as ex:
         messages.error(request, _("Import error: %s") % ex)
     else:
-       messages.success(request, _("File imported successfully!"))
+       messages.success(request, _(
+           "File imported successfully! %(inserted)d rows inserted, "
+           "%(updated)d updated and %(unchanged)d unchanged."
+       ) % counts)
 
     return redirect(request.META.get('HTTP_REFERER'))
 
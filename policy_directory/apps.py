@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PolicyDirectoryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'policy_directory'
+
+    def ready(self):
+        import policy_directory.signals  # noqa F401
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('policy_directory', '0003_policydirectory_import_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='policydirectoryfile',
+            name='attachment_sha256',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64, verbose_name='File SHA-256'),
+        ),
+        migrations.AddField(
+            model_name='policydirectoryfile',
+            name='format_sha256',
+            field=models.CharField(blank=True, default='', max_length=64, verbose_name='Format SHA-256'),
+        ),
+    ]
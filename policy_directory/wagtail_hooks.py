@@ -6,6 +6,8 @@ from wagtail.core import hooks
 from wagtail.contrib.modeladmin.views import CreateView
 from wagtail.contrib.modeladmin.options import (ModelAdmin, modeladmin_register, ModelAdminGroup)
 
+from core.utils.modeladmin import KeysetIndexView
+
 from .models import PolicyDirectory, PolicyDirectoryFile
 from .button_helper import PolicyDirectoryHelper
 from .views import validate, import_file
@@ -27,6 +29,8 @@ class PolicyDirectoryFileCreateView(CreateView):
 
 class PolicyDirectoryAdmin(ModelAdmin):
     model = PolicyDirectory
+    index_view_class = KeysetIndexView
+    index_template_name = 'modeladmin/keyset_index.html'
     create_view_class = PolicyDirectoryCreateView
     menu_label = _('Policy Directory')
     menu_icon = 'folder'
@@ -49,11 +53,18 @@ class PolicyDirectoryFileAdmin(ModelAdmin):
     menu_order = 200
     add_to_settings_menu = False
     exclude_from_explorer = False
-    list_display = ('attachment', 'line_count', 'is_valid', 'creator',
+    list_display = ('attachment', 'line_count', 'is_valid',
+                    'validation_status', 'validation_progress',
+                    'validation_throughput', 'error_count',
+                    'error_report_link', 'creator',
                     'updated', 'created', )
-    list_filter = ('is_valid', )
+    list_filter = ('is_valid', 'validation_status', )
     search_fields = ('attachment', )
 
+    def get_extra_attrs_for_row(self, obj, context):
+        # Used by the index template to refresh the list while validating.
+        return {'data-validation-status': obj.validation_status}
+
 
 class PolicyDirectoryAdminGroup(ModelAdminGroup):
     menu_label = _('Policy Directory')
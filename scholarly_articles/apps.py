@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ScholarlyArticlesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'scholarly_articles'
+
+    def ready(self):
+        import scholarly_articles.signals  # noqa F401
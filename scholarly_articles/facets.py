@@ -0,0 +1,181 @@
+from collections import Counter
+
+from django.conf import settings
+from django.contrib import admin
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.urls import reverse
+
+from .models import Authorship, Contributors, FacetCount, ScholarlyArticles
+
+# Fields with a facet, used by the list filters of the admin.  The ORCIDs of
+# the authorships count the articles of each person; a change of the ORCID
+# of a Person is only counted by rebuild_facets.
+FACETS = (
+    (ScholarlyArticles, "journal_issn_l"),
+    (Contributors, "orcid"),
+    (Authorship, "person__orcid"),
+)
+
+# Prefixes of the values of a facet that are tried before a search term, so
+# an ORCID can be searched by its digits.
+VALUE_PREFIXES = {
+    "contributors.orcid": ("http://orcid.org/", "https://orcid.org/"),
+}
+
+
+def facet_name(model, field):
+    return "%s.%s" % (model._meta.model_name, field)
+
+
+def apply_facet_deltas(facet, deltas):
+    """
+    Add deltas, a Counter of value to change of count, to the counts of a
+    facet, in the current transaction.
+
+    The values whose count falls to zero are removed.
+    """
+    deltas = {value: delta for value, delta in deltas.items() if value and delta}
+    if not deltas:
+        return
+    table = connection.ops.quote_name(FacetCount._meta.db_table)
+    params = []
+    for value, delta in deltas.items():
+        params.extend([facet, value, delta])
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO %s (facet, value, count) VALUES %s "
+            "ON CONFLICT (facet, value) DO UPDATE SET count = %s.count + EXCLUDED.count"
+            % (table, ", ".join(["(%s, %s, %s)"] * len(deltas)), table),
+            params,
+        )
+    FacetCount.objects.filter(facet=facet, value__in=deltas, count__lte=0).delete()
+
+
+def change_deltas(changes, field):
+    """
+    Return the Counter of value to change of count of a field for changes,
+    a list of the (before, after) values of the objects written, before
+    being None for an object inserted and after None for one deleted.
+    """
+    deltas = Counter()
+    for before, after in changes:
+        if after is not None:
+            deltas[after[field]] += 1
+        if before is not None:
+            deltas[before[field]] -= 1
+    return deltas
+
+
+def orcid_counts(authorships):
+    """
+    Return the Counter of the ORCIDs of a queryset of authorships.
+    """
+    return Counter(dict(
+        authorships.filter(person__isnull=False).values_list("person__orcid")
+        .annotate(count=Count("pk")).order_by()
+    ))
+
+
+def rebuild_facets(model=None):
+    """
+    Rebuild the facets of model, or all of them.
+    """
+    for facet_model, field in FACETS:
+        if model is None or facet_model is model:
+            rebuild_facet(facet_model, field)
+
+
+def rebuild_facet(model, field):
+    """
+    Count the values of a field of model again, with one GROUP BY over the
+    table, and replace the counts of its facet.
+    """
+    facet = facet_name(model, field)
+    counts = (
+        model._default_manager.exclude(**{field: ""}).exclude(**{"%s__isnull" % field: True})
+        .values_list(field).annotate(count=Count("pk")).order_by()
+    )
+    with transaction.atomic():
+        FacetCount.objects.filter(facet=facet).delete()
+        FacetCount.objects.bulk_create(
+            (FacetCount(facet=facet, value=value, count=count) for value, count in counts.iterator()),
+            batch_size=settings.SCHOLARLY_INGEST_BATCH_SIZE,
+        )
+
+
+def top_values(facet, limit=None):
+    """
+    Return the (value, count) of the values of a facet with the largest counts.
+    """
+    limit = limit or settings.FACET_TOP_VALUES
+    return list(
+        FacetCount.objects.filter(facet=facet).order_by("-count", "value")
+        .values_list("value", "count")[:limit]
+    )
+
+
+def search_values(facet, prefix, limit=None):
+    """
+    Return the (value, count) of the values of a facet that start with
+    prefix, or with prefix after one of the VALUE_PREFIXES of the facet, the
+    largest counts first.
+    """
+    limit = limit or settings.FACET_TOP_VALUES
+    starts = Q(value__startswith=prefix)
+    for value_prefix in VALUE_PREFIXES.get(facet, ()):
+        starts |= Q(value__startswith=value_prefix + prefix)
+    return list(
+        FacetCount.objects.filter(starts, facet=facet)
+        .order_by("-count", "value").values_list("value", "count")[:limit]
+    )
+
+
+class FacetListFilter(admin.SimpleListFilter):
+    """
+    List filter on a field with the values of its facet with the largest
+    counts, and a search box for the other values.
+
+    Subclasses set model, field, title and parameter_name, and lookup when
+    the listed objects are filtered on another field than the counted ones.
+    """
+    template = "modeladmin/includes/facet_filter.html"
+    model = None
+    field = None
+    lookup = None
+
+    @property
+    def facet(self):
+        return facet_name(self.model, self.field)
+
+    def search_url(self):
+        return "%s?facet=%s" % (reverse("scholarly_articles:facet_values"), self.facet)
+
+    def lookups(self, request, model_admin):
+        values = top_values(self.facet)
+        selected = self.value()
+        if selected and selected not in dict(values):
+            values.append((selected, FacetCount.objects.filter(
+                facet=self.facet, value=selected
+            ).values_list("count", flat=True).first() or 0))
+        return [(value, "%s (%d)" % (value, count)) for value, count in values]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.lookup or self.field: self.value()})
+        return queryset
+
+
+def facet_filter(model, field, title, lookup=None):
+    """
+    Return a FacetListFilter class for a field of model, which filters on
+    lookup, by default the field.
+    """
+    return type(
+        "%sFacetFilter" % field.title().replace("_", ""),
+        (FacetListFilter,),
+        dict(
+            model=model, field=field, title=title, lookup=lookup,
+            parameter_name=lookup or field,
+        ),
+    )
@@ -0,0 +1,390 @@
+import datetime
+import gzip
+import hashlib
+import json
+import logging
+import os
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from core.utils.bulk_import import batches, lock_keys, upsert_objects
+
+from . import choices
+from .facets import apply_facet_deltas, orcid_counts
+from .models import (
+    Affiliation, Authorship, IngestionCursor, Person, ScholarlyArticles,
+    normalize_doi, normalize_orcid, publication_year,
+)
+from .partitions import ensure_partitions
+from .signals import CHANGE_FIELDS, ORCID_FACET, articles_written, ingest_finished
+
+logger = logging.getLogger(__name__)
+
+
+class IngestError(Exception):
+    pass
+
+
+# Value of the genre field for each resource type of the snapshots.
+GENRES = {label: value for value, label in choices.TYPE_OF_RESOURCE}
+
+# Fields of ScholarlyArticles updated when the record of a DOI changed.
+ARTICLE_FIELDS = [
+    field.name for field in ScholarlyArticles._meta.concrete_fields
+    if not field.primary_key and field.name not in ("doi", "published_year")
+]
+
+# Fields the articles are upserted on, the DOI and the partition key.
+ARTICLE_KEY = ("doi", "published_year")
+
+
+def open_snapshot(file_path):
+    """
+    Open a .jsonl or a .jsonl.gz snapshot for reading in binary mode.
+    """
+    if file_path.endswith(".gz"):
+        return gzip.open(file_path, "rb")
+    return open(file_path, "rb")
+
+
+def iter_records(fp):
+    """
+    Yield a tuple of each record of an open snapshot, one JSON document per
+    line, and of the offset of the line after it.
+
+    The offset is in the uncompressed content, the one seek() and tell()
+    use on a gzip file.  Blank lines are skipped.
+    """
+    offset = fp.tell()
+    for line in fp:
+        offset += len(line)
+        if line.strip():
+            yield json.loads(line), offset
+
+
+def clip(model, name, value):
+    """
+    Return value cut to the max_length of a field of model, as the snapshots
+    may have longer titles or names than the columns.
+    """
+    if value is None:
+        return None
+    max_length = model._meta.get_field(name).max_length
+    return str(value)[:max_length] if max_length else value
+
+
+def parse_published_date(value):
+    """
+    Return an aware datetime for the published_date of a record, which is a
+    date or a datetime, or None.
+    """
+    if not value:
+        return None
+    try:
+        published = parse_datetime(value)
+        if published is None:
+            date = parse_date(value)
+            if date is None:
+                return None
+            published = datetime.datetime.combine(date, datetime.time())
+    except ValueError:
+        return None
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=datetime.timezone.utc)
+    return published
+
+
+def record_hash(record):
+    """
+    Return the SHA-256 of a record, independent of the order of its keys.
+    """
+    return hashlib.sha256(
+        json.dumps(record, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
+def article_from_record(record):
+    """
+    Return an unsaved ScholarlyArticles for a record of the snapshot, with
+    the record in article_json and its hash in content_hash.
+    """
+    issns = record.get("journal_issns") or ""
+    if isinstance(issns, list):
+        issns = ",".join(issns)
+    genre = record.get("genre") or ""
+    fields = dict(
+        doi=normalize_doi(record["doi"]),
+        doi_url=record.get("doi_url"),
+        genre=GENRES.get(genre, genre),
+        is_oa=record.get("is_oa"),
+        journal_is_in_doaj=record.get("journal_is_in_doaj"),
+        journal_issns=issns,
+        journal_issn_l=record.get("journal_issn_l") or "",
+        journal_name=record.get("journal_name"),
+        publisher=record.get("publisher"),
+        title=record.get("title"),
+    )
+    fields = {
+        name: clip(ScholarlyArticles, name, value) for name, value in fields.items()
+    }
+    published_date = parse_published_date(record.get("published_date"))
+    return ScholarlyArticles(
+        published_date=published_date,
+        published_year=publication_year(published_date),
+        article_json=record,
+        content_hash=record_hash(record),
+        **fields,
+    )
+
+
+def store_authorships(records):
+    """
+    Replace the authorships of articles with the authors of their records.
+
+    records is a dictionary of article id to snapshot record.  The people,
+    by ORCID, and the affiliations, by name, are inserted when they are new,
+    and the existing ones are kept as they are.  The counts of the ORCID
+    facet are updated.
+
+    Returns the number of authorships stored.
+    """
+    persons = {}
+    names = set()
+    for record in records.values():
+        for author in record.get("z_authors") or ():
+            orcid = normalize_orcid(author.get("ORCID"))
+            if orcid and orcid not in persons:
+                persons[orcid] = Person(
+                    orcid=orcid,
+                    family=clip(Person, "family", author.get("family") or ""),
+                    given=clip(Person, "given", author.get("given") or ""),
+                    authenticated_orcid=bool(author.get("authenticated-orcid")),
+                )
+            names.update(affiliation_names(author))
+    Person.objects.bulk_create(persons.values(), ignore_conflicts=True)
+    person_ids = dict(Person.objects.filter(orcid__in=persons).values_list("orcid", "id"))
+    Affiliation.objects.bulk_create(
+        [Affiliation(name=name) for name in names], ignore_conflicts=True
+    )
+    affiliation_ids = dict(
+        Affiliation.objects.filter(name__in=names).values_list("name", "id")
+    )
+
+    replaced = Authorship.objects.filter(article_id__in=records)
+    orcid_deltas = Counter()
+    orcid_deltas.subtract(orcid_counts(replaced))
+    replaced.delete()
+    authorships = []
+    authorship_names = []
+    for article_id, record in records.items():
+        for position, author in enumerate(record.get("z_authors") or (), 1):
+            authorships.append(Authorship(
+                article_id=article_id,
+                person_id=person_ids.get(normalize_orcid(author.get("ORCID"))),
+                position=position,
+                family=clip(Authorship, "family", author.get("family") or ""),
+                given=clip(Authorship, "given", author.get("given") or ""),
+            ))
+            authorship_names.append(affiliation_names(author))
+    Authorship.objects.bulk_create(authorships)
+    orcids = {person_id: orcid for orcid, person_id in person_ids.items()}
+    for authorship in authorships:
+        if authorship.person_id is not None:
+            orcid_deltas[orcids[authorship.person_id]] += 1
+    apply_facet_deltas(ORCID_FACET, orcid_deltas)
+    through = Authorship.affiliations.through
+    through.objects.bulk_create([
+        through(authorship_id=authorship.pk, affiliation_id=affiliation_ids[name])
+        for authorship, author_names in zip(authorships, authorship_names)
+        for name in author_names
+    ])
+    return len(authorships)
+
+
+def affiliation_names(author):
+    """
+    Return the set of the affiliation names of an author of a record.
+    """
+    return {
+        clip(Affiliation, "name", affiliation["name"].strip())
+        for affiliation in author.get("affiliation") or ()
+        if affiliation and (affiliation.get("name") or "").strip()
+    }
+
+
+def ingest_snapshot(file_path, batch_size=None, progress=None, cursor=None):
+    """
+    Load the records of a .jsonl or .jsonl.gz snapshot as ScholarlyArticles,
+    with their authors as Authorship, Person and Affiliation.
+
+    The file is read one line at a time and the rows are written
+    batch_size records at a time, each batch in its own transaction, so the
+    memory used does not depend on the size of the file.  Records without a
+    DOI are skipped.
+
+    The articles are upserted on their normalized DOI and their year, the
+    partition key, after the partitions of the years of the batch are
+    created and the articles whose year changed are deleted: a new DOI is
+    inserted, and an existing one is only updated, with its authorships
+    replaced, when the content hash of its record changed.  Loading a
+    snapshot again thus leaves the unchanged records alone.  The counts of
+    the ORCID facet are updated, and articles_written is sent, in the
+    transaction of each batch, so its receivers update the ISSN-L facet and
+    the indicators; ingest_finished is sent at the end.
+
+    When cursor, an IngestionCursor, is given, the load starts at its offset
+    and counts, and the cursor is moved in the transaction of each batch.  A
+    batch is rolled back with an IngestError if the cursor was moved by
+    another load in the meantime.
+
+    progress, when given, is called after each committed batch with the
+    offset in the file after the batch and the counts so far.
+
+    Returns a dictionary with the number of records read, of articles
+    written, of articles unchanged, of authorships written (as
+    contributors) and of records skipped.
+    """
+    batch_size = batch_size or settings.SCHOLARLY_INGEST_BATCH_SIZE
+    if cursor is not None:
+        counts = cursor.counts
+    else:
+        counts = {
+            "records": 0, "articles": 0, "unchanged": 0, "contributors": 0,
+            "skipped": 0,
+        }
+    with open_snapshot(file_path) as fp:
+        if cursor is not None:
+            fp.seek(cursor.offset)
+        for batch in batches(iter_records(fp), batch_size):
+            articles = {}
+            records = {}
+            skipped = 0
+            for record, offset in batch:
+                if not record.get("doi"):
+                    skipped += 1
+                    continue
+                article = article_from_record(record)
+                articles[article.doi] = article
+                records[article.doi] = record
+            with transaction.atomic():
+                # The other loads and saves of the DOIs wait for the batch,
+                # so none inserts them in another year meanwhile.
+                lock_keys(ScholarlyArticles, articles)
+                previous = {
+                    values.pop("doi"): values
+                    for values in ScholarlyArticles.objects.filter(doi__in=articles)
+                    .values("doi", "published_year", *CHANGE_FIELDS)
+                }
+                ensure_partitions(article.published_year for article in articles.values())
+                moved = move_articles(articles, previous)
+                written = upsert_objects(
+                    ScholarlyArticles, articles.values(), ARTICLE_KEY,
+                    fields=ARTICLE_FIELDS, compare=("content_hash",),
+                    returning=("doi", "id"),
+                )
+                contributors = store_authorships(
+                    {article_id: records[doi] for inserted, doi, article_id in written}
+                )
+                # The moved articles were removed from the counts when they
+                # were deleted.
+                changes = [
+                    (None if doi in moved else previous.get(doi), {
+                        name: getattr(articles[doi], name) for name in CHANGE_FIELDS
+                    })
+                    for inserted, doi, article_id in written
+                ]
+                articles_written.send(
+                    sender=ScholarlyArticles, changes=changes,
+                    article_ids=[article_id for inserted, doi, article_id in written],
+                    orm=False,
+                )
+                batch_counts = {
+                    "records": counts["records"] + len(batch),
+                    "articles": counts["articles"] + len(written),
+                    "unchanged": counts["unchanged"] + len(batch) - skipped - len(written),
+                    "contributors": counts["contributors"] + contributors,
+                    "skipped": counts["skipped"] + skipped,
+                }
+                if cursor is not None:
+                    move_cursor(cursor, offset, batch_counts)
+            counts = batch_counts
+            logger.info("Ingested %(records)d records of %(file)s", dict(counts, file=file_path))
+            if progress is not None:
+                progress(offset, counts)
+    ingest_finished.send(sender=ScholarlyArticles, file_path=file_path, counts=counts)
+    return counts
+
+
+def move_articles(articles, previous):
+    """
+    Delete the articles whose year changed, from previous, the values of the
+    articles of a batch before it, so they are inserted in the partition of
+    their new year with their authorships.
+
+    Returns the set of the DOIs of the articles deleted.
+    """
+    moved = {
+        doi for doi, values in previous.items()
+        if values["published_year"] != articles[doi].published_year
+    }
+    if moved:
+        ScholarlyArticles.objects.filter(doi__in=moved).delete()
+    return moved
+
+
+def move_cursor(cursor, offset, counts):
+    """
+    Store the offset and counts after a batch in cursor, if no other load
+    moved it since it was read.
+    """
+    moved = IngestionCursor.objects.filter(
+        pk=cursor.pk, offset=cursor.offset, last_batch=cursor.last_batch
+    ).update(
+        offset=offset, last_batch=cursor.last_batch + 1, updated=timezone.now(),
+        **counts,
+    )
+    if not moved:
+        raise IngestError(
+            "The load of %s was moved by another load." % cursor.source_file
+        )
+    cursor.offset = offset
+    cursor.last_batch += 1
+    for name, value in counts.items():
+        setattr(cursor, name, value)
+
+
+def resume_snapshot(file_path, batch_size=None, progress=None, restart=False):
+    """
+    Load a snapshot like ingest_snapshot, from where the last load of the
+    same file stopped.
+
+    The position of the load is kept in an IngestionCursor for the file.  A
+    file that changed size since the last load is an IngestError, unless
+    restart is set, which loads the file from the start.  A file already
+    loaded is not read again.
+    """
+    size = os.path.getsize(file_path)
+    cursor, created = IngestionCursor.objects.get_or_create(
+        source_file=file_path, defaults={"source_size": size}
+    )
+    if restart:
+        IngestionCursor.objects.filter(pk=cursor.pk).delete()
+        cursor = IngestionCursor.objects.create(source_file=file_path, source_size=size)
+    elif cursor.source_size != size:
+        raise IngestError(
+            "%s changed since its last load, at offset %d." % (file_path, cursor.offset)
+        )
+    elif cursor.finished:
+        return cursor.counts
+    if cursor.offset:
+        logger.info(
+            "Resuming the load of %s after batch %d, at offset %d",
+            file_path, cursor.last_batch, cursor.offset,
+        )
+    counts = ingest_snapshot(file_path, batch_size, progress, cursor)
+    IngestionCursor.objects.filter(pk=cursor.pk).update(finished=timezone.now())
+    return counts
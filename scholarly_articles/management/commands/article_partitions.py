@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from scholarly_articles.partitions import ensure_partitions, partition_name, partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "List the partitions of the scholarly articles by year, create the "
+        "partitions of years, or vacuum or reindex the partition of a year, "
+        "without touching the others."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--create", type=int, nargs="+", metavar="YEAR",
+            help="Create the partitions of these years.",
+        )
+        parser.add_argument(
+            "--vacuum", type=int, metavar="YEAR",
+            help="VACUUM (ANALYZE) the partition of this year, 0 for the undated one.",
+        )
+        parser.add_argument(
+            "--reindex", type=int, metavar="YEAR",
+            help="REINDEX the partition of this year, 0 for the undated one.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("The partitions need a PostgreSQL database.")
+        if options["create"]:
+            with transaction.atomic():
+                ensure_partitions(options["create"])
+        qn = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            existing = partitions(cursor)
+            for option, statement in (("vacuum", "VACUUM (ANALYZE) %s"), ("reindex", "REINDEX TABLE %s")):
+                if options[option] is None:
+                    continue
+                name = partition_name(options[option])
+                if name not in existing:
+                    raise CommandError("There is no partition %s." % name)
+                cursor.execute(statement % qn(name))
+                self.stdout.write("%s: %s done." % (name, option))
+            cursor.execute(
+                "SELECT relname, reltuples::bigint, pg_total_relation_size(oid) "
+                "FROM pg_class WHERE relname = ANY(%s) ORDER BY relname",
+                [sorted(existing)],
+            )
+            for name, rows, size in cursor.fetchall():
+                self.stdout.write("%s\t~%d rows\t%d bytes" % (name, rows, size))
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from scholarly_articles.ingest import store_authorships
+from scholarly_articles.models import ScholarlyArticles
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the Authorship, Person and Affiliation rows of the scholarly "
+        "articles from their article_json, in batches of articles."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--after", type=int, default=0,
+            help="Start after the article with this id.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"] or settings.SCHOLARLY_INGEST_BATCH_SIZE
+        last_id = options["after"]
+        articles = authorships = 0
+        while True:
+            batch = list(
+                ScholarlyArticles.objects.with_json().filter(
+                    pk__gt=last_id, article_data__isnull=False
+                ).order_by("pk")[:batch_size]
+            )
+            if not batch:
+                break
+            with transaction.atomic():
+                authorships += store_authorships(
+                    {article.pk: article.article_json for article in batch}
+                )
+            articles += len(batch)
+            last_id = batch[-1].pk
+            self.stdout.write(
+                "%d articles, %d authorships (last id %d)" % (articles, authorships, last_id)
+            )
+        self.stdout.write("Done: %d articles, %d authorships." % (articles, authorships))
@@ -0,0 +1,61 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.utils import copy_import
+from scholarly_articles.facets import rebuild_facets
+from scholarly_articles.models import ScholarlyArticles
+from scholarly_articles.partitions import FIRST_YEAR, ensure_partitions
+from scholarly_articles.signals import articles_loaded
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a CSV snapshot into ScholarlyArticles or Contributors with "
+        "PostgreSQL COPY. The columns of the file are named as the fields "
+        "of the model; the whole file is loaded in one transaction. Rows are "
+        "upserted on the import_key of the model, when it has one. The facet "
+        "counts and indicators of the model are rebuilt after the load."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", help="CSV file with a header row.")
+        parser.add_argument(
+            "--model", default="scholarly_articles.ScholarlyArticles",
+            help="Model, as app_label.ModelName.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("COPY needs a PostgreSQL database.")
+        model = apps.get_model(options["model"])
+        if not hasattr(model, "import_fields"):
+            raise CommandError("%s has no import_fields." % options["model"])
+
+        start = time.perf_counter()
+        if model is ScholarlyArticles:
+            with transaction.atomic():
+                ensure_partitions(range(FIRST_YEAR, timezone.now().year + 2))
+        pks = []
+        if hasattr(model, "import_key"):
+            counts = copy_import.copy_upsert_csv_file(options["file"], model, pks)
+            rows = sum(counts.values())
+        else:
+            counts = None
+            rows = copy_import.copy_csv_file(options["file"], model, pks)
+        rebuild_facets(model)
+        if model is ScholarlyArticles:
+            articles_loaded.send(sender=ScholarlyArticles, article_ids=pks)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            "%d rows loaded in %.2fs (%.0f rows/s)"
+            % (rows, elapsed, rows / elapsed if elapsed else 0)
+        )
+        if counts:
+            self.stdout.write(
+                "%(inserted)d inserted, %(updated)d updated, "
+                "%(unchanged)d unchanged." % counts
+            )
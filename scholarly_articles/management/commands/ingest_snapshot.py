@@ -0,0 +1,64 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from scholarly_articles.ingest import IngestError, resume_snapshot
+from scholarly_articles.tasks import ingest_snapshot_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a .jsonl or .jsonl.gz snapshot of scholarly articles, one "
+        "Unpaywall-style record per line, as ScholarlyArticles and "
+        "Contributors, in batches. An interrupted load of the same file "
+        "resumes after its last committed batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", help="Snapshot file.")
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--background", action="store_true",
+            help="Run the load in a Celery task.",
+        )
+        parser.add_argument(
+            "--restart", action="store_true",
+            help="Load the file from the start, even if it was loaded before.",
+        )
+
+    def handle(self, *args, **options):
+        file_path = os.path.abspath(options["file"])
+        if not os.path.exists(file_path):
+            raise CommandError("%s does not exist." % file_path)
+        if options["background"]:
+            ingest_snapshot_file.delay(
+                file_path, options["batch_size"], options["restart"]
+            )
+            self.stdout.write("Load of %s started in background." % file_path)
+            return
+
+        start = time.perf_counter()
+
+        def progress(offset, counts):
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                "%d records, %d articles written, %d unchanged, %d contributors "
+                "(%.0f records/s)" % (
+                    counts["records"], counts["articles"], counts["unchanged"],
+                    counts["contributors"],
+                    counts["records"] / elapsed if elapsed else 0,
+                )
+            )
+
+        try:
+            counts = resume_snapshot(
+                file_path, options["batch_size"], progress, options["restart"]
+            )
+        except IngestError as ex:
+            raise CommandError(ex)
+        self.stdout.write(
+            "Done: %(records)d records, %(articles)d articles written, "
+            "%(unchanged)d unchanged, %(contributors)d contributors, "
+            "%(skipped)d skipped." % counts
+        )
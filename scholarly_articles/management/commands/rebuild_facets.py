@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from scholarly_articles.facets import FACETS, facet_name, rebuild_facet
+
+
+class Command(BaseCommand):
+    help = (
+        "Count the values of the faceted fields of the scholarly articles "
+        "again, and replace the facet counts used by the admin list filters."
+    )
+
+    def handle(self, *args, **options):
+        for model, field in FACETS:
+            rebuild_facet(model, field)
+            self.stdout.write("Rebuilt %s." % facet_name(model, field))
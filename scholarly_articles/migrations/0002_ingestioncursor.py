@@ -0,0 +1,87 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarly_articles', '0001_initial'),
+    ]
+
+    operations = [
+        # Bring the state of 0001_initial up to date with the models.
+        migrations.RenameModel(
+            old_name='Contributor',
+            new_name='Contributors',
+        ),
+        migrations.AlterField(
+            model_name='contributors',
+            name='doi_url',
+            field=models.URLField(blank=True, max_length=255, null=True, verbose_name='DOI URL'),
+        ),
+        migrations.AddField(
+            model_name='scholarlyarticles',
+            name='article_json',
+            field=models.JSONField(blank=True, null=True, verbose_name='JSON File'),
+        ),
+        migrations.AlterField(
+            model_name='scholarlyarticles',
+            name='doi_url',
+            field=models.URLField(blank=True, max_length=255, null=True, verbose_name='DOI URL'),
+        ),
+        migrations.AlterField(
+            model_name='scholarlyarticles',
+            name='genre',
+            field=models.CharField(choices=[('', ''), ('Book Section', 'book-section'), ('Monograph', 'monograph'), ('Report', 'report'), ('Peer Review', 'peer-review'), ('Book Track', 'book-track'), ('Journal Article', 'journal-article'), ('Part', 'book-part'), ('Other', 'other'), ('Book', 'book'), ('Journal Volume', 'journal-volume'), ('Book Set', 'book-set'), ('Reference Entry', 'reference-entry'), ('Proceedings Article', 'proceedings-article'), ('Journal', 'journal'), ('Component', 'component'), ('Book Chapter', 'book-chapter'), ('Proceedings Series', 'proceedings-series'), ('Report Series', 'report-series'), ('Proceedings', 'proceedings'), ('Standard', 'standard'), ('Reference Book', 'reference-book'), ('Posted Content', 'posted-content'), ('Journal Issue', 'journal-issue'), ('Dissertation', 'dissertation'), ('Grant', 'grant'), ('Dataset', 'dataset'), ('Book Series', 'book-series'), ('Edited Book', 'edited-book'), ('Standard Series', 'standard-series')], max_length=255, verbose_name='Resource Type'),
+        ),
+        migrations.AlterField(
+            model_name='scholarlyarticles',
+            name='is_oa',
+            field=models.BooleanField(blank=True, max_length=255, null=True, verbose_name='Opens Access'),
+        ),
+        migrations.AlterField(
+            model_name='scholarlyarticles',
+            name='journal_is_in_doaj',
+            field=models.BooleanField(blank=True, max_length=255, null=True, verbose_name='DOAJ'),
+        ),
+        migrations.AlterField(
+            model_name='scholarlyarticles',
+            name='journal_name',
+            field=models.CharField(blank=True, max_length=255, null=True, verbose_name='Journal Name'),
+        ),
+        migrations.AlterField(
+            model_name='scholarlyarticles',
+            name='published_date',
+            field=models.DateTimeField(blank=True, max_length=255, null=True, verbose_name='Published Date'),
+        ),
+        migrations.AlterField(
+            model_name='scholarlyarticles',
+            name='publisher',
+            field=models.CharField(blank=True, max_length=255, null=True, verbose_name='Publisher'),
+        ),
+        migrations.AlterField(
+            model_name='scholarlyarticles',
+            name='title',
+            field=models.CharField(blank=True, max_length=255, null=True, verbose_name='Title'),
+        ),
+        migrations.CreateModel(
+            name='IngestionCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_file', models.CharField(max_length=500, unique=True, verbose_name='Source file')),
+                ('source_size', models.BigIntegerField(default=0, verbose_name='Source size')),
+                ('offset', models.BigIntegerField(default=0, verbose_name='Offset')),
+                ('last_batch', models.IntegerField(default=0, verbose_name='Last batch')),
+                ('records', models.BigIntegerField(default=0, verbose_name='Records')),
+                ('articles', models.BigIntegerField(default=0, verbose_name='Articles')),
+                ('contributors', models.BigIntegerField(default=0, verbose_name='Contributors')),
+                ('skipped', models.BigIntegerField(default=0, verbose_name='Skipped')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Creation date')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Last update date')),
+                ('finished', models.DateTimeField(blank=True, null=True, verbose_name='Finished')),
+            ],
+            options={
+                'verbose_name': 'Ingestion cursor',
+                'verbose_name_plural': 'Ingestion cursors',
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import migrations, models
+
+NORMALIZE_DOI = r"lower(regexp_replace(btrim(doi), '^(https?://(dx\.)?doi\.org/|doi:\s*)', '', 'i'))"
+
+# Number of duplicated DOIs listed in the error.
+LISTED_DUPLICATES = 20
+
+
+def check_duplicates(apps, schema_editor):
+    """
+    Stop the migration when articles have the same normalized DOI, so they
+    are merged by an operator instead of deleted here.  The normalization
+    is rolled back with the migration.
+    """
+    ScholarlyArticles = apps.get_model('scholarly_articles', 'ScholarlyArticles')
+    duplicates = list(
+        ScholarlyArticles.objects.values('doi')
+        .annotate(count=models.Count('id'), ids=ArrayAgg('id', ordering='id'))
+        .filter(count__gt=1)
+        .order_by()[:LISTED_DUPLICATES]
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Articles of %s have the same normalized DOI, remove or merge them "
+            "before migrating again (at most %d DOIs listed):\n%s" % (
+                ScholarlyArticles._meta.db_table,
+                LISTED_DUPLICATES,
+                "\n".join(
+                    "ids %s: %s" % (", ".join(str(pk) for pk in row['ids']), row['doi'])
+                    for row in duplicates
+                ),
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarly_articles', '0002_ingestioncursor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scholarlyarticles',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64, verbose_name='Content hash'),
+        ),
+        migrations.AddField(
+            model_name='ingestioncursor',
+            name='unchanged',
+            field=models.BigIntegerField(default=0, verbose_name='Unchanged'),
+        ),
+        # Normalize the DOIs, as normalize_doi, and check that no two
+        # articles have the same one, so the unique index can be created.
+        migrations.RunSQL(
+            [
+                "UPDATE scholarly_articles_scholarlyarticles SET doi = %s" % NORMALIZE_DOI,
+                "UPDATE scholarly_articles_contributors SET doi = %s" % NORMALIZE_DOI,
+            ],
+            migrations.RunSQL.noop,
+        ),
+        migrations.RunPython(check_duplicates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='scholarlyarticles',
+            name='doi',
+            field=models.CharField(max_length=255, unique=True, verbose_name='DOI'),
+        ),
+        migrations.AlterField(
+            model_name='contributors',
+            name='doi',
+            field=models.CharField(db_index=True, max_length=255, verbose_name='DOI'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarly_articles', '0003_scholarlyarticles_doi_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Affiliation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Name')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Person',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('orcid', models.CharField(max_length=19, unique=True, verbose_name='ORCID')),
+                ('family', models.CharField(blank=True, default='', max_length=255, verbose_name='Family')),
+                ('given', models.CharField(blank=True, default='', max_length=255, verbose_name='Given')),
+                ('authenticated_orcid', models.BooleanField(default=False, verbose_name='Authenticated')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Authorship',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(verbose_name='Position')),
+                ('family', models.CharField(blank=True, default='', max_length=255, verbose_name='Family')),
+                ('given', models.CharField(blank=True, default='', max_length=255, verbose_name='Given')),
+                ('affiliations', models.ManyToManyField(blank=True, related_name='authorships', to='scholarly_articles.Affiliation')),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='authorships', to='scholarly_articles.scholarlyarticles')),
+                ('person', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='authorships', to='scholarly_articles.person')),
+            ],
+            options={
+                'ordering': ['article', 'position'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='authorship',
+            constraint=models.UniqueConstraint(fields=('article', 'position'), name='authorship_article_position'),
+        ),
+        migrations.AddIndex(
+            model_name='authorship',
+            index=models.Index(fields=['person', 'article'], name='authorship_person_article'),
+        ),
+    ]
@@ -0,0 +1,106 @@
+import json
+import zlib
+
+from django.db import migrations, models, transaction
+
+BATCH_SIZE = 2000
+
+# The helpers of models.py as they were when article_data was added, so the
+# data is converted the same way whatever they become.
+RECORD_COLUMNS = (
+    'doi', 'doi_url', 'is_oa', 'journal_is_in_doaj', 'journal_issns',
+    'journal_issn_l', 'journal_name', 'publisher', 'title',
+)
+RECORD_COMPRESSION_LEVEL = 6
+
+
+def pack_record(record, values):
+    dropped = [
+        key for key in RECORD_COLUMNS if key in record and record[key] == values.get(key)
+    ]
+    rest = {key: value for key, value in record.items() if key not in dropped}
+    return zlib.compress(
+        json.dumps([dropped, rest], separators=(",", ":")).encode(),
+        RECORD_COMPRESSION_LEVEL,
+    )
+
+
+def unpack_record(data, values):
+    dropped, record = json.loads(zlib.decompress(data))
+    for key in dropped:
+        record[key] = values.get(key)
+    return record
+
+
+def update_in_batches(ScholarlyArticles, articles, convert, field, using):
+    """
+    Convert the articles, a queryset, BATCH_SIZE at a time, committing each
+    batch, so a large table is not converted in one transaction.  Only
+    field, the one convert sets, is written.
+    """
+    last_id = 0
+    while True:
+        with transaction.atomic(using=using):
+            batch = list(articles.filter(pk__gt=last_id).order_by('pk')[:BATCH_SIZE])
+            if not batch:
+                return
+            for article in batch:
+                convert(article, {key: getattr(article, key) for key in RECORD_COLUMNS})
+            ScholarlyArticles.objects.using(using).bulk_update(batch, [field])
+        last_id = batch[-1].pk
+
+
+def pack_article_json(apps, schema_editor):
+    def convert(article, values):
+        article.article_data = pack_record(article.article_json, values)
+
+    ScholarlyArticles = apps.get_model('scholarly_articles', 'ScholarlyArticles')
+    using = schema_editor.connection.alias
+    # The articles already converted by an interrupted run are skipped.
+    articles = ScholarlyArticles.objects.using(using).filter(
+        article_data__isnull=True, article_json__isnull=False,
+    )
+    update_in_batches(ScholarlyArticles, articles, convert, 'article_data', using)
+
+
+def unpack_article_data(apps, schema_editor):
+    def convert(article, values):
+        article.article_json = unpack_record(article.article_data, values)
+
+    ScholarlyArticles = apps.get_model('scholarly_articles', 'ScholarlyArticles')
+    using = schema_editor.connection.alias
+    articles = ScholarlyArticles.objects.using(using).filter(article_data__isnull=False)
+    update_in_batches(ScholarlyArticles, articles, convert, 'article_json', using)
+
+
+class Migration(migrations.Migration):
+
+    # Each batch is committed by update_in_batches.
+    atomic = False
+
+    dependencies = [
+        ('scholarly_articles', '0004_person_affiliation_authorship'),
+    ]
+
+    operations = [
+        # The column may already be there when an interrupted run of the
+        # migration is resumed.
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    "ALTER TABLE scholarly_articles_scholarlyarticles "
+                    "ADD COLUMN IF NOT EXISTS article_data bytea NULL",
+                    "ALTER TABLE scholarly_articles_scholarlyarticles "
+                    "DROP COLUMN IF EXISTS article_data",
+                ),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name='scholarlyarticles',
+                    name='article_data',
+                    field=models.BinaryField(blank=True, null=True, verbose_name='Compressed JSON'),
+                ),
+            ],
+        ),
+        migrations.RunPython(pack_article_json, unpack_article_data),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarly_articles', '0005_scholarlyarticles_article_data'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='scholarlyarticles',
+            name='article_json',
+        ),
+        # article_data is already compressed, and is moved out of the rows
+        # of the table as soon as they are larger than 128 bytes, so scans of
+        # the other columns read small rows.
+        migrations.RunSQL(
+            [
+                "ALTER TABLE scholarly_articles_scholarlyarticles "
+                "ALTER COLUMN article_data SET STORAGE EXTERNAL",
+                "ALTER TABLE scholarly_articles_scholarlyarticles "
+                "SET (toast_tuple_target = 128)",
+            ],
+            [
+                "ALTER TABLE scholarly_articles_scholarlyarticles "
+                "RESET (toast_tuple_target)",
+                "ALTER TABLE scholarly_articles_scholarlyarticles "
+                "ALTER COLUMN article_data SET STORAGE EXTENDED",
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarly_articles', '0006_remove_scholarlyarticles_article_json'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(max_length=64, verbose_name='Facet')),
+                ('value', models.CharField(max_length=255, verbose_name='Value')),
+                ('count', models.BigIntegerField(default=0, verbose_name='Count')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='facetcount',
+            constraint=models.UniqueConstraint(fields=('facet', 'value'), name='facetcount_facet_value'),
+        ),
+        migrations.AddIndex(
+            model_name='facetcount',
+            index=models.Index(fields=['facet', '-count'], name='facetcount_top'),
+        ),
+        migrations.AddIndex(
+            model_name='facetcount',
+            index=models.Index(fields=['facet', 'value'], name='facetcount_prefix', opclasses=['varchar_pattern_ops', 'varchar_pattern_ops']),
+        ),
+    ]
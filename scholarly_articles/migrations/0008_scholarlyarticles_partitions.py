@@ -0,0 +1,78 @@
+from django.db import migrations, models
+
+TABLE = 'scholarly_articles_scholarlyarticles'
+
+# Partitions of the years from 2000 to the next one, with the articles
+# without a date, the older ones and the other years in their own
+# partitions, named as partitions.partition_name.
+CREATE_PARTITIONS = """
+DO $$
+DECLARE
+    year int;
+BEGIN
+    CREATE TABLE {table}_undated PARTITION OF {table}
+        FOR VALUES FROM (MINVALUE) TO (1) WITH (toast_tuple_target = 128);
+    CREATE TABLE {table}_before_2000 PARTITION OF {table}
+        FOR VALUES FROM (1) TO (2000) WITH (toast_tuple_target = 128);
+    FOR year IN 2000..extract(year FROM now())::int + 1 LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF {table} FOR VALUES FROM (%s) TO (%s) '
+            'WITH (toast_tuple_target = 128)',
+            '{table}_' || year, year, year + 1
+        );
+    END LOOP;
+    CREATE TABLE {table}_default PARTITION OF {table}
+        DEFAULT WITH (toast_tuple_target = 128);
+END
+$$
+""".format(table=TABLE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarly_articles', '0007_facetcount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scholarlyarticles',
+            name='published_year',
+            field=models.SmallIntegerField(default=0, editable=False, verbose_name='Published Year'),
+        ),
+        migrations.AlterField(
+            model_name='authorship',
+            name='article',
+            field=models.ForeignKey(db_constraint=False, on_delete=models.deletion.CASCADE, related_name='authorships', to='scholarly_articles.scholarlyarticles'),
+        ),
+        # The table is replaced by a table partitioned by published_year,
+        # whose primary key and unique constraint include published_year.
+        # The sequence of the ids is kept.  The articles are copied by the
+        # next migration, in batches.
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL([
+                    "ALTER TABLE {table} RENAME TO {table}_unpartitioned".format(table=TABLE),
+                    "CREATE TABLE {table} (LIKE {table}_unpartitioned INCLUDING DEFAULTS "
+                    "INCLUDING STORAGE) PARTITION BY RANGE (published_year)".format(table=TABLE),
+                    "ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id".format(table=TABLE),
+                    "ALTER TABLE {table} ADD CONSTRAINT {table}_id_year_pkey "
+                    "PRIMARY KEY (id, published_year)".format(table=TABLE),
+                    "ALTER TABLE {table} ADD CONSTRAINT scholarlyarticles_doi_year "
+                    "UNIQUE (doi, published_year)".format(table=TABLE),
+                    CREATE_PARTITIONS,
+                ]),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='scholarlyarticles',
+                    name='doi',
+                    field=models.CharField(max_length=255, verbose_name='DOI'),
+                ),
+                migrations.AddConstraint(
+                    model_name='scholarlyarticles',
+                    constraint=models.UniqueConstraint(fields=('doi', 'published_year'), name='scholarlyarticles_doi_year'),
+                ),
+            ],
+        ),
+    ]
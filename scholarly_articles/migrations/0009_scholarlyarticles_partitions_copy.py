@@ -0,0 +1,58 @@
+from django.db import migrations, transaction
+
+TABLE = 'scholarly_articles_scholarlyarticles'
+
+# Columns copied to the partitioned table, all but published_year.
+COLUMNS = (
+    'id, doi, doi_url, genre, is_oa, journal_is_in_doaj, journal_issns, '
+    'journal_issn_l, journal_name, published_date, publisher, title, '
+    'article_data, content_hash'
+)
+
+# Number of articles moved and committed together.
+BATCH_SIZE = 10000
+
+MOVE_BATCH = """
+WITH moved AS (
+    DELETE FROM {table}_unpartitioned WHERE id IN (
+        SELECT id FROM {table}_unpartitioned ORDER BY id LIMIT %s
+    )
+    RETURNING {columns}
+)
+INSERT INTO {table} ({columns}, published_year)
+SELECT {columns}, COALESCE(EXTRACT(YEAR FROM published_date AT TIME ZONE 'UTC'), 0)
+FROM moved
+""".format(table=TABLE, columns=COLUMNS)
+
+
+def move_articles(apps, schema_editor):
+    """
+    Move the articles of the table replaced by 0008 to the partitioned
+    table, committing BATCH_SIZE articles at a time, and drop it.
+
+    Only the articles moved are in the partitioned table until it finishes,
+    so the site should not serve the articles meanwhile.  An interrupted
+    move goes on from where it stopped when the migration runs again.
+    """
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        while True:
+            with transaction.atomic(using=connection.alias):
+                cursor.execute(MOVE_BATCH, [BATCH_SIZE])
+                if not cursor.rowcount:
+                    break
+        cursor.execute("DROP TABLE {table}_unpartitioned".format(table=TABLE))
+
+
+class Migration(migrations.Migration):
+
+    # Each batch is committed by move_articles.
+    atomic = False
+
+    dependencies = [
+        ('scholarly_articles', '0008_scholarlyarticles_partitions'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_articles, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,98 @@
-from django.db import models
+import datetime
+import json
+import re
+import zlib
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, router, transaction
 from django.utils.translation import gettext as _
 
 from wagtail.admin.edit_handlers import FieldPanel
 
+from core.utils.bulk_import import lock_keys
+
 from . import choices
 
+DOI_PREFIX = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+ORCID = re.compile(r"(\d{4}-\d{4}-\d{4}-\d{3}[\dX])", re.IGNORECASE)
+
+# Keys of the snapshot records with a column of the same name, which are not
+# stored again in article_data when the column has the same value.
+RECORD_COLUMNS = (
+    'doi', 'doi_url', 'is_oa', 'journal_is_in_doaj', 'journal_issns',
+    'journal_issn_l', 'journal_name', 'publisher', 'title',
+)
+RECORD_COMPRESSION_LEVEL = 6
+
+
+def normalize_doi(doi):
+    """
+    Return a DOI without the resolver or doi: prefix, lower-cased, as DOIs
+    are case-insensitive.
+    """
+    return DOI_PREFIX.sub("", (doi or "").strip()).lower()
+
+
+def normalize_orcid(orcid):
+    """
+    Return the 16 digit identifier of an ORCID, with or without the
+    orcid.org prefix, or "" if it is not one.
+    """
+    match = ORCID.search(orcid or "")
+    return match.group(1).upper() if match else ""
+
+
+def pack_record(record, values):
+    """
+    Return the part of a record not stored in columns, compressed.
+
+    values is a dictionary of the values of the columns in RECORD_COLUMNS.
+    A key is left out when its value is the same as the one of its column,
+    and the keys left out are listed, so unpack_record can put them back.
+    """
+    dropped = [
+        key for key in RECORD_COLUMNS if key in record and record[key] == values.get(key)
+    ]
+    rest = {key: value for key, value in record.items() if key not in dropped}
+    return zlib.compress(
+        json.dumps([dropped, rest], separators=(",", ":")).encode(),
+        RECORD_COMPRESSION_LEVEL,
+    )
+
+
+def unpack_record(data, values):
+    """
+    Return the record packed in data by pack_record, with the keys left out
+    taken from the values of the columns.
+    """
+    dropped, record = json.loads(zlib.decompress(data))
+    for key in dropped:
+        record[key] = values.get(key)
+    return record
+
+
+def publication_year(published_date):
+    """
+    Return the year of a published_date in UTC, or 0 when there is none.
+    """
+    if published_date is None:
+        return 0
+    return published_date.astimezone(datetime.timezone.utc).year
+
+
+class ScholarlyArticlesQuerySet(models.QuerySet):
+    def with_json(self):
+        """
+        Load article_data, which is deferred by default, with the rows, for
+        code that reads article_json.
+        """
+        return self.defer(None)
+
+
+class ScholarlyArticlesManager(models.Manager.from_queryset(ScholarlyArticlesQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().defer('article_data')
+
 
 class ScholarlyArticles(models.Model):
     doi = models.CharField("DOI", max_length=255, null=False, blank=False)
@@ -18,7 +106,26 @@ class ScholarlyArticles(models.Model):
     published_date = models.DateTimeField("Published Date", max_length=255, null=True, blank=True)
     publisher = models.CharField("Publisher", max_length=255, null=True, blank=True)
     title = models.CharField("Title", max_length=255, null=True, blank=True)
-    article_json = models.JSONField("JSON File", null=True, blank=True)
+    # The snapshot record, without the values already in the columns, see
+    # pack_record.  It is read and written as article_json.
+    article_data = models.BinaryField("Compressed JSON", null=True, blank=True)
+    # SHA-256 of the snapshot record, to update only the records that changed.
+    content_hash = models.CharField("Content hash", max_length=64, blank=True, default="")
+    # Year of published_date, 0 when unknown, by which the table is
+    # partitioned, see partitions.py.
+    published_year = models.SmallIntegerField("Published Year", default=0, editable=False)
+
+    objects = ScholarlyArticlesManager()
+
+    class Meta:
+        # A DOI is unique, but a unique constraint of a partitioned table
+        # must include the partition key.  The loaders move an article whose
+        # year changed instead of inserting it again, and save and
+        # validate_unique check the DOI in the other years; the loads and
+        # the saves lock their DOIs, see bulk_import.lock_keys.
+        constraints = [
+            models.UniqueConstraint(fields=['doi', 'published_year'], name='scholarlyarticles_doi_year'),
+        ]
 
     panels = [
         FieldPanel('doi'),
@@ -32,12 +139,110 @@ class ScholarlyArticles(models.Model):
         FieldPanel('published_date'),
         FieldPanel('publisher'),
         FieldPanel('title'),
-        FieldPanel('article_json'),
     ]
 
+    # Columns of the CSV snapshots, by field name.
+    import_fields = {
+        'doi': 'doi',
+        'doi_url': 'doi_url',
+        'genre': 'genre',
+        'is_oa': 'is_oa',
+        'journal_is_in_doaj': 'journal_is_in_doaj',
+        'journal_issns': 'journal_issns',
+        'journal_issn_l': 'journal_issn_l',
+        'journal_name': 'journal_name',
+        'published_date': 'published_date',
+        'publisher': 'publisher',
+        'title': 'title',
+    }
+    import_key = ('doi',)
+    # Fields in the site search, with their weight, and the fields shown in
+    # its results. See core/search/documents.py.
+    search_weights = {'title': 'A', 'doi': 'A', 'journal_name': 'B', 'publisher': 'C'}
+    search_title = 'title'
+    search_link = 'doi_url'
+    # Field by which the table is partitioned, which the upserts match on
+    # with import_key.
+    partition_field = 'published_year'
+    # SQL of the fields computed by the COPY loads, from the expressions of
+    # import_fields, see copy_import.insert_sql.
+    import_computed = {
+        # As normalize_doi.
+        'doi': r"lower(regexp_replace(btrim({doi}), '^(https?://(dx\.)?doi\.org/|doi:\s*)', '', 'i'))",
+        'published_year': "COALESCE(EXTRACT(YEAR FROM {published_date} AT TIME ZONE 'UTC'), 0)::smallint",
+        # The rows of a CSV file have no snapshot record, their hash is the
+        # one of their columns.
+        'content_hash': "encode(sha256(convert_to(concat_ws(chr(31), %s), 'UTF8')), 'hex')" % ", ".join(
+            "{%s}" % name for name in import_fields
+        ),
+        # Nor a record to keep, so the record of an updated article is
+        # removed rather than left out of date.
+        'article_data': "NULL::bytea",
+    }
+
+    def save(self, *args, **kwargs):
+        self.doi = normalize_doi(self.doi)
+        self.published_year = publication_year(self.published_date)
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            # Saves and loads of the same DOI wait for each other, so they
+            # cannot both pass the check.
+            lock_keys(type(self), [self.doi], using)
+            if self.doi_in_use():
+                raise IntegrityError("An article with the DOI %s already exists." % self.doi)
+            super().save(*args, **kwargs)
+
+    def doi_in_use(self):
+        """
+        Return whether another article has the DOI of this one, in any year.
+        """
+        articles = type(self)._base_manager.using(self._state.db).filter(doi=normalize_doi(self.doi))
+        if self.pk is not None:
+            articles = articles.exclude(pk=self.pk)
+        return articles.exists()
+
+    def validate_unique(self, exclude=None):
+        errors = {}
+        try:
+            super().validate_unique(exclude)
+        except ValidationError as ex:
+            errors = ex.update_error_dict(errors)
+        if (not exclude or 'doi' not in exclude) and 'doi' not in errors and self.doi \
+                and self.doi_in_use():
+            errors['doi'] = [ValidationError(_("An article with this DOI already exists."))]
+        if errors:
+            raise ValidationError(errors)
+
+    def record_columns(self):
+        return {key: getattr(self, key) for key in RECORD_COLUMNS}
+
+    @property
+    def article_json(self):
+        """
+        The snapshot record of the article, decompressed from article_data on
+        first access.  The keys stored in columns have the current values of
+        the columns.
+        """
+        data = self.article_data
+        if data is None:
+            return None
+        cached = self.__dict__.get('_article_json')
+        if cached is None or cached[0] is not data:
+            cached = self.__dict__['_article_json'] = (
+                data, unpack_record(data, self.record_columns())
+            )
+        return cached[1]
+
+    @article_json.setter
+    def article_json(self, record):
+        if record is None:
+            self.article_data = None
+        else:
+            self.article_data = pack_record(record, self.record_columns())
+
 
 class Contributors(models.Model):
-    doi = models.CharField("DOI", max_length=255, null=False, blank=False)
+    doi = models.CharField("DOI", max_length=255, null=False, blank=False, db_index=True)
     doi_url = models.URLField("DOI URL", max_length=255, null=True, blank=True)
     family = models.CharField("Family", max_length=255, null=False, blank=False)
     given = models.CharField("Given", max_length=255, null=False, blank=False)
@@ -54,3 +259,158 @@ class Contributors(models.Model):
         FieldPanel('authenticated_orcid'),
         FieldPanel('affiliation'),
     ]
+
+    # Columns of the CSV snapshots, by field name.
+    import_fields = {
+        'doi': 'doi',
+        'doi_url': 'doi_url',
+        'family': 'family',
+        'given': 'given',
+        'orcid': 'orcid',
+        'authenticated_orcid': 'authenticated_orcid',
+        'affiliation': 'affiliation',
+    }
+
+    def save(self, *args, **kwargs):
+        self.doi = normalize_doi(self.doi)
+        super().save(*args, **kwargs)
+
+
+class Person(models.Model):
+    """
+    Author with an ORCID.  The authors without one are only in Authorship.
+    """
+    orcid = models.CharField("ORCID", max_length=19, unique=True)
+    family = models.CharField("Family", max_length=255, blank=True, default="")
+    given = models.CharField("Given", max_length=255, blank=True, default="")
+    authenticated_orcid = models.BooleanField("Authenticated", default=False)
+
+    panels = [
+        FieldPanel('orcid'),
+        FieldPanel('family'),
+        FieldPanel('given'),
+        FieldPanel('authenticated_orcid'),
+    ]
+
+    def __str__(self):
+        return self.orcid
+
+    def articles(self):
+        return ScholarlyArticles.objects.filter(authorships__person=self)
+
+    def coauthors(self):
+        return Person.objects.filter(
+            authorships__article__authorships__person=self
+        ).exclude(pk=self.pk).distinct()
+
+
+class Affiliation(models.Model):
+    name = models.CharField(_("Name"), max_length=255, unique=True)
+
+    panels = [
+        FieldPanel('name'),
+    ]
+
+    def __str__(self):
+        return self.name
+
+
+class Authorship(models.Model):
+    """
+    Author of an article, in the order of the article, with the name and
+    affiliations as written in it.
+    """
+    # Without a constraint in the database, as a foreign key to a
+    # partitioned table must include the partition key; the ORM deletes the
+    # authorships of deleted articles.
+    article = models.ForeignKey(
+        ScholarlyArticles, on_delete=models.CASCADE, related_name='authorships',
+        db_constraint=False,
+    )
+    person = models.ForeignKey(
+        Person, null=True, blank=True, on_delete=models.SET_NULL,
+        related_name='authorships'
+    )
+    position = models.PositiveSmallIntegerField(_("Position"))
+    family = models.CharField("Family", max_length=255, blank=True, default="")
+    given = models.CharField("Given", max_length=255, blank=True, default="")
+    affiliations = models.ManyToManyField(
+        Affiliation, blank=True, related_name='authorships'
+    )
+
+    class Meta:
+        ordering = ['article', 'position']
+        constraints = [
+            models.UniqueConstraint(
+                fields=('article', 'position'), name='authorship_article_position'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['person', 'article'], name='authorship_person_article'),
+        ]
+
+    def __str__(self):
+        return "%s %s" % (self.given, self.family)
+
+
+class FacetCount(models.Model):
+    """
+    Number of rows with each value of a field, kept up to date by the
+    imports, for the list filters of the admin.  See facets.py.
+    """
+    facet = models.CharField(_("Facet"), max_length=64)
+    value = models.CharField(_("Value"), max_length=255)
+    count = models.BigIntegerField(_("Count"), default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=('facet', 'value'), name='facetcount_facet_value'),
+        ]
+        indexes = [
+            models.Index(fields=['facet', '-count'], name='facetcount_top'),
+            models.Index(
+                fields=['facet', 'value'], name='facetcount_prefix',
+                opclasses=['varchar_pattern_ops', 'varchar_pattern_ops'],
+            ),
+        ]
+
+    def __str__(self):
+        return "%s=%s" % (self.facet, self.value)
+
+
+class IngestionCursor(models.Model):
+    """
+    Position of the load of a snapshot of scholarly articles, so an
+    interrupted load resumes after the last committed batch.
+
+    The cursor is updated in the transaction of each batch.
+    """
+    source_file = models.CharField(_("Source file"), max_length=500, unique=True)
+    source_size = models.BigIntegerField(_("Source size"), default=0)
+    offset = models.BigIntegerField(_("Offset"), default=0)
+    last_batch = models.IntegerField(_("Last batch"), default=0)
+    records = models.BigIntegerField(_("Records"), default=0)
+    articles = models.BigIntegerField(_("Articles"), default=0)
+    unchanged = models.BigIntegerField(_("Unchanged"), default=0)
+    contributors = models.BigIntegerField(_("Contributors"), default=0)
+    skipped = models.BigIntegerField(_("Skipped"), default=0)
+    created = models.DateTimeField(_("Creation date"), auto_now_add=True)
+    updated = models.DateTimeField(_("Last update date"), auto_now=True)
+    finished = models.DateTimeField(_("Finished"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _('Ingestion cursor')
+        verbose_name_plural = _('Ingestion cursors')
+
+    def __str__(self):
+        return self.source_file
+
+    @property
+    def counts(self):
+        return {
+            "records": self.records,
+            "articles": self.articles,
+            "unchanged": self.unchanged,
+            "contributors": self.contributors,
+            "skipped": self.skipped,
+        }
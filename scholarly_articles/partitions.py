@@ -0,0 +1,108 @@
+"""
+Partitions of the ScholarlyArticles table by range of published_year.
+
+The table is partitioned in PostgreSQL, see migration 0008, into:
+
+- <table>_undated, for published_year 0, the articles without a date;
+- <table>_before_2000, for the years before FIRST_YEAR;
+- <table>_<year>, one partition per year from that year on;
+- <table>_default, for the other years, as dates far in the future.
+
+The partitions of the years are created by the ingest before it writes the
+articles of a year, so a query on one year reads one partition, and the
+older partitions, which do not change, can be vacuumed and reindexed on
+their own.
+"""
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ScholarlyArticles
+
+# First year with its own partition, as created by migration 0008.
+FIRST_YEAR = 2000
+
+# Partitions known to exist, so the catalog is only read for new years.
+_known_partitions = set()
+
+
+def parent_table():
+    return ScholarlyArticles._meta.db_table
+
+
+def partition_name(year):
+    """
+    Return the name of the partition that holds the articles of year.
+    """
+    if year <= 0:
+        return "%s_undated" % parent_table()
+    if year < FIRST_YEAR:
+        return "%s_before_%d" % (parent_table(), FIRST_YEAR)
+    if has_own_partition(year):
+        return "%s_%d" % (parent_table(), year)
+    return "%s_default" % parent_table()
+
+
+def has_own_partition(year):
+    """
+    Return whether the articles of year get their own partition, which is
+    the case from FIRST_YEAR to the next year.
+    """
+    return FIRST_YEAR <= year <= timezone.now().year + 1
+
+
+def partitions(cursor):
+    """
+    Return the names of the partitions of the table.
+    """
+    cursor.execute(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = %s::regclass",
+        [parent_table()],
+    )
+    return {name for (name,) in cursor.fetchall()}
+
+
+def ensure_partitions(years):
+    """
+    Create the partitions of the years that get their own partition and do
+    not have one yet, in the current transaction.
+    """
+    names = {
+        year: partition_name(year) for year in set(years) if has_own_partition(year)
+    }
+    if set(names.values()) <= _known_partitions:
+        return
+    with connection.cursor() as cursor:
+        existing = partitions(cursor)
+        for year, name in sorted(names.items()):
+            if name not in existing:
+                create_partition(cursor, year)
+                existing.add(name)
+    # Not before the commit, as a rollback drops the partitions created.
+    transaction.on_commit(lambda: _known_partitions.update(existing))
+
+
+def create_partition(cursor, year):
+    """
+    Create the partition of year, with the articles of year that were
+    written to the default partition moved to it, and attach it.
+    """
+    qn = connection.ops.quote_name
+    parent = qn(parent_table())
+    partition = qn(partition_name(year))
+    default = qn("%s_default" % parent_table())
+    cursor.execute(
+        "CREATE TABLE %s (LIKE %s INCLUDING DEFAULTS INCLUDING STORAGE) "
+        "WITH (toast_tuple_target = 128)" % (partition, parent)
+    )
+    cursor.execute(
+        "WITH moved AS (DELETE FROM %s WHERE published_year = %%s RETURNING *) "
+        "INSERT INTO %s SELECT * FROM moved" % (default, partition),
+        [year],
+    )
+    cursor.execute(
+        "ALTER TABLE %s ATTACH PARTITION %s FOR VALUES FROM (%%s) TO (%%s)"
+        % (parent, partition),
+        [year, year + 1],
+    )
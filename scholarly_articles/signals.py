@@ -0,0 +1,113 @@
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import Signal, receiver
+
+from .facets import apply_facet_deltas, change_deltas, facet_name, orcid_counts
+from .models import Authorship, Contributors, ScholarlyArticles
+
+# Sent by the ingest in the transaction of each batch, and when an article
+# is saved or deleted with the ORM, as in the admin, with changes, a list of
+# (before, after) dictionaries of the CHANGE_FIELDS of the articles written,
+# before being None for the new articles and after None for the deleted
+# ones, article_ids, their ids, and orm, True for a save or a delete with
+# the ORM, after which no ingest_finished is sent.
+articles_written = Signal()
+
+# Sent after articles were loaded in bulk without tracking their changes, as
+# by the copy_csv command, with the article_ids of the rows inserted or
+# updated, so the receivers count them again.
+articles_loaded = Signal()
+
+# Sent when the ingest of a snapshot file finished, with its file_path and
+# counts, see ingest.ingest_snapshot.
+ingest_finished = Signal()
+
+# Fields of the articles passed to the receivers of articles_written.
+CHANGE_FIELDS = [
+    field.name for field in ScholarlyArticles._meta.concrete_fields
+    if not field.primary_key
+    and field.name not in ("doi", "published_year", "article_data", "content_hash")
+]
+
+ISSN_FACET = facet_name(ScholarlyArticles, "journal_issn_l")
+CONTRIBUTOR_ORCID_FACET = facet_name(Contributors, "orcid")
+ORCID_FACET = facet_name(Authorship, "person__orcid")
+
+
+def article_values(article):
+    return {name: getattr(article, name) for name in CHANGE_FIELDS}
+
+
+@receiver(articles_written)
+def update_issn_facet(sender, changes, **kwargs):
+    apply_facet_deltas(ISSN_FACET, change_deltas(changes, "journal_issn_l"))
+
+
+@receiver(pre_save, sender=ScholarlyArticles)
+def read_saved_article(sender, instance, raw=False, **kwargs):
+    """
+    Keep the values of an article saved with the ORM before the save, for
+    send_saved_article.
+    """
+    if raw or instance.pk is None:
+        instance._values_before_save = None
+    else:
+        instance._values_before_save = (
+            sender._base_manager.filter(pk=instance.pk).values(*CHANGE_FIELDS).first()
+        )
+
+
+@receiver(post_save, sender=ScholarlyArticles)
+def send_saved_article(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    articles_written.send(
+        sender=sender,
+        changes=[(instance.__dict__.pop("_values_before_save", None), article_values(instance))],
+        article_ids=[instance.pk], orm=True,
+    )
+
+
+@receiver(pre_delete, sender=ScholarlyArticles)
+def remove_deleted_authors(sender, instance, **kwargs):
+    """
+    Remove the authors of an article from the ORCID facet before it is
+    deleted with its authorships.
+    """
+    deltas = Counter()
+    deltas.subtract(orcid_counts(Authorship.objects.filter(article=instance)))
+    apply_facet_deltas(ORCID_FACET, deltas)
+
+
+@receiver(post_delete, sender=ScholarlyArticles)
+def send_deleted_article(sender, instance, **kwargs):
+    articles_written.send(
+        sender=sender, changes=[(article_values(instance), None)],
+        article_ids=[instance.pk], orm=True,
+    )
+
+
+@receiver(pre_save, sender=Contributors)
+def read_saved_contributor(sender, instance, raw=False, **kwargs):
+    instance._orcid_before_save = None
+    if not raw and instance.pk is not None:
+        instance._orcid_before_save = (
+            sender._base_manager.filter(pk=instance.pk).values_list("orcid", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Contributors)
+def count_saved_contributor(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    before = instance.__dict__.pop("_orcid_before_save", None)
+    deltas = {instance.orcid: 1}
+    if before is not None:
+        deltas[before] = deltas.get(before, 0) - 1
+    apply_facet_deltas(CONTRIBUTOR_ORCID_FACET, deltas)
+
+
+@receiver(post_delete, sender=Contributors)
+def count_deleted_contributor(sender, instance, **kwargs):
+    apply_facet_deltas(CONTRIBUTOR_ORCID_FACET, {instance.orcid: -1})
@@ -0,0 +1,27 @@
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+
+from config import celery_app
+
+from .ingest import resume_snapshot
+
+
+@celery_app.task(
+    soft_time_limit=settings.SCHOLARLY_INGEST_TIME_LIMIT,
+    time_limit=settings.SCHOLARLY_INGEST_TIME_LIMIT + 60,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def ingest_snapshot_file(file_path, batch_size=None, restart=False):
+    """
+    Load a .jsonl or .jsonl.gz snapshot of scholarly articles, from where the
+    last load of the file stopped, see ingest.resume_snapshot.
+
+    When the time limit is reached, the batch being written is rolled back
+    and the load goes on in a new task.  A task lost with its worker, in a
+    restart or a deploy, is delivered again and resumes in the same way.
+    """
+    try:
+        return resume_snapshot(file_path, batch_size, restart=restart)
+    except SoftTimeLimitExceeded:
+        ingest_snapshot_file.delay(file_path, batch_size)
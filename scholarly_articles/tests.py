@@ -1,3 +1,421 @@
-from django.test import TestCase
+import csv
+import datetime
+import gzip
+import json
+import zlib
 
-# Create your tests here.
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection
+from django.http import Http404
+
+from core.utils import copy_import
+from core.utils.bulk_import import upsert_objects
+
+from .facets import rebuild_facets
+from .ingest import ARTICLE_KEY, IngestError, ingest_snapshot, resume_snapshot, store_authorships
+from .models import (
+    Affiliation, Authorship, Contributors, FacetCount, IngestionCursor, Person, ScholarlyArticles,
+    normalize_doi, normalize_orcid, pack_record, unpack_record,
+)
+from .partitions import ensure_partitions, partition_name
+from .signals import CONTRIBUTOR_ORCID_FACET, ISSN_FACET, ORCID_FACET
+from .views import article_json_preview, facet_values
+
+pytestmark = pytest.mark.django_db
+
+ARTICLE_COLUMNS = list(ScholarlyArticles.import_fields.values())
+
+
+def write_articles_csv(path, rows):
+    """
+    Write a CSV file of scholarly articles, with the given columns of each
+    row and the others empty.
+    """
+    with open(path, "w", newline="") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=ARTICLE_COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(dict({"genre": "journal-article", "journal_issns": "1234-5678",
+                                  "journal_issn_l": "1234-5678"}, **row))
+    return str(path)
+
+
+def test_copy_upsert_normalizes_doi_and_fills_content_hash(tmp_path):
+    ensure_partitions([2018])
+    file_path = write_articles_csv(tmp_path / "articles.csv", [
+        {"doi": "https://doi.org/10.9/X", "published_date": "2018-05-01T00:00:00Z", "title": "A"},
+    ])
+
+    counts = copy_import.copy_upsert_csv_file(file_path, ScholarlyArticles)
+
+    assert counts == {"inserted": 1, "updated": 0, "unchanged": 0}
+    article = ScholarlyArticles.objects.get()
+    assert article.doi == "10.9/x"
+    assert article.published_year == 2018
+    assert len(article.content_hash) == 64
+
+
+def test_copy_upsert_matches_the_normalized_doi(tmp_path):
+    ensure_partitions([2018])
+    ScholarlyArticles.objects.create(
+        doi="10.9/x", genre="journal-article", journal_issns="1234-5678",
+        journal_issn_l="1234-5678", title="A",
+    )
+    file_path = write_articles_csv(tmp_path / "articles.csv", [
+        {"doi": "doi:10.9/X", "title": "B"},
+    ])
+
+    counts = copy_import.copy_upsert_csv_file(file_path, ScholarlyArticles)
+
+    assert counts == {"inserted": 0, "updated": 1, "unchanged": 0}
+    assert list(ScholarlyArticles.objects.values_list("doi", "title")) == [("10.9/x", "B")]
+
+
+def create_article(doi, **fields):
+    values = dict(genre="journal-article", journal_issns="1234-5678", journal_issn_l="1234-5678")
+    values.update(fields)
+    return ScholarlyArticles.objects.create(doi=doi, **values)
+
+
+def facet_counts(facet):
+    return dict(FacetCount.objects.filter(facet=facet).values_list("value", "count"))
+
+
+def test_saved_and_deleted_articles_update_the_issn_facet():
+    article = create_article("10.1/a")
+    create_article("10.1/b")
+    assert facet_counts(ISSN_FACET) == {"1234-5678": 2}
+
+    article.journal_issn_l = "2345-6789"
+    article.save()
+    assert facet_counts(ISSN_FACET) == {"1234-5678": 1, "2345-6789": 1}
+
+    article.delete()
+    assert facet_counts(ISSN_FACET) == {"1234-5678": 1}
+
+
+def test_store_authorships_updates_the_orcid_facet():
+    article = create_article("10.1/a")
+    author = {"family": "Doe", "given": "Jane", "ORCID": "http://orcid.org/0000-0002-1825-009X"}
+    other = {"family": "Roe", "given": "Rick", "ORCID": "0000-0001-5109-3700"}
+
+    store_authorships({article.pk: {"z_authors": [author, other]}})
+    assert facet_counts(ORCID_FACET) == {"0000-0002-1825-009X": 1, "0000-0001-5109-3700": 1}
+
+    store_authorships({article.pk: {"z_authors": [author]}})
+    assert facet_counts(ORCID_FACET) == {"0000-0002-1825-009X": 1}
+
+    article.delete()
+    assert facet_counts(ORCID_FACET) == {}
+
+
+def test_saved_contributors_update_the_orcid_facet():
+    contributor = Contributors.objects.create(
+        doi="10.1/a", family="Doe", given="Jane", orcid="https://orcid.org/0000-0002-1825-009X",
+        authenticated_orcid=False, affiliation="Somewhere",
+    )
+    assert facet_counts(CONTRIBUTOR_ORCID_FACET) == {"https://orcid.org/0000-0002-1825-009X": 1}
+
+    contributor.orcid = "https://orcid.org/0000-0001-5109-3700"
+    contributor.save()
+    assert facet_counts(CONTRIBUTOR_ORCID_FACET) == {"https://orcid.org/0000-0001-5109-3700": 1}
+
+    contributor.delete()
+    assert facet_counts(CONTRIBUTOR_ORCID_FACET) == {}
+
+
+def test_rebuild_facets_matches_the_incremental_counts():
+    article = create_article("10.1/a")
+    create_article("10.1/b", journal_issn_l="2345-6789")
+    store_authorships({article.pk: {"z_authors": [{"ORCID": "0000-0001-5109-3700"}]}})
+    incremental = {facet: facet_counts(facet) for facet in (ISSN_FACET, ORCID_FACET)}
+
+    rebuild_facets()
+
+    assert {facet: facet_counts(facet) for facet in (ISSN_FACET, ORCID_FACET)} == incremental
+
+
+def write_snapshot(path, records):
+    with open(path, "w") as fp:
+        for record in records:
+            fp.write(json.dumps(record) + "\n")
+    return str(path)
+
+
+def snapshot_record(doi, published_date, **fields):
+    return dict({
+        "doi": doi, "genre": "journal-article", "journal_issns": "1234-5678",
+        "journal_issn_l": "1234-5678", "published_date": published_date,
+        "z_authors": [{"family": "Doe", "ORCID": "0000-0001-5109-3700"}],
+    }, **fields)
+
+
+def test_ingest_snapshot_writes_the_partitioned_table(tmp_path):
+    records = [
+        snapshot_record("10.1/A", "2018-05-01", title="A"),
+        snapshot_record("10.1/b", "2019-05-01", title="B"),
+    ]
+    file_path = write_snapshot(tmp_path / "snapshot.jsonl", records)
+
+    counts = ingest_snapshot(file_path, batch_size=1)
+
+    assert counts["articles"] == 2
+    assert set(ScholarlyArticles.objects.values_list("doi", "published_year")) == {
+        ("10.1/a", 2018), ("10.1/b", 2019),
+    }
+    assert facet_counts(ORCID_FACET) == {"0000-0001-5109-3700": 2}
+
+    counts = ingest_snapshot(file_path)
+
+    assert counts["articles"] == 0
+    assert counts["unchanged"] == 2
+
+
+def test_ingest_snapshot_moves_an_article_whose_year_changed(tmp_path):
+    ingest_snapshot(write_snapshot(tmp_path / "first.jsonl", [
+        snapshot_record("10.1/a", "2018-05-01", title="A"),
+    ]))
+
+    counts = ingest_snapshot(write_snapshot(tmp_path / "second.jsonl", [
+        snapshot_record("10.1/a", "2020-05-01", title="A"),
+    ]))
+
+    assert counts["articles"] == 1
+    assert list(ScholarlyArticles.objects.values_list("doi", "published_year")) == [
+        ("10.1/a", 2020),
+    ]
+    assert facet_counts(ISSN_FACET) == {"1234-5678": 1}
+    assert facet_counts(ORCID_FACET) == {"0000-0001-5109-3700": 1}
+
+
+def test_upsert_objects_tells_inserted_from_updated_articles():
+    create_article("10.1/a", title="A")
+    articles = [
+        ScholarlyArticles(doi="10.1/a", genre="journal-article", journal_issns="1234-5678",
+                          journal_issn_l="1234-5678", title="A2", content_hash="new"),
+        ScholarlyArticles(doi="10.1/b", genre="journal-article", journal_issns="1234-5678",
+                          journal_issn_l="1234-5678", title="B", content_hash="new"),
+    ]
+
+    written = upsert_objects(
+        ScholarlyArticles, articles, ARTICLE_KEY, compare=("content_hash",), returning=("doi",),
+    )
+
+    assert sorted(written) == [(False, "10.1/a"), (True, "10.1/b")]
+
+
+def test_a_doi_is_unique_across_years():
+    create_article("10.1/a", published_date=datetime.datetime(2018, 5, 1, tzinfo=datetime.timezone.utc))
+    other = ScholarlyArticles(
+        doi="https://doi.org/10.1/A", genre="journal-article", journal_issns="1234-5678",
+        journal_issn_l="1234-5678",
+        published_date=datetime.datetime(2019, 5, 1, tzinfo=datetime.timezone.utc),
+    )
+
+    with pytest.raises(ValidationError) as error:
+        other.validate_unique()
+    assert "doi" in error.value.message_dict
+    with pytest.raises(IntegrityError):
+        other.save()
+
+
+def test_ingest_snapshot_reads_a_gzip_file(tmp_path):
+    file_path = str(tmp_path / "snapshot.jsonl.gz")
+    with gzip.open(file_path, "wt") as fp:
+        for record in [
+            snapshot_record("https://doi.org/10.1/A", "2018-05-01", journal_issns=["1234-5678", "2345-6789"]),
+            {"title": "No DOI"},
+            snapshot_record("10.1/b", None, genre="unknown-genre"),
+        ]:
+            fp.write(json.dumps(record) + "\n")
+
+    counts = ingest_snapshot(file_path, batch_size=2)
+
+    assert counts == {"records": 3, "articles": 2, "unchanged": 0, "contributors": 2, "skipped": 1}
+    article = ScholarlyArticles.objects.get(doi="10.1/a")
+    assert article.genre == "Journal Article"
+    assert article.journal_issns == "1234-5678,2345-6789"
+    assert article.published_year == 2018
+    undated = ScholarlyArticles.objects.get(doi="10.1/b")
+    assert undated.genre == "unknown-genre"
+    assert undated.published_year == 0
+
+
+def test_resume_snapshot_goes_on_after_the_last_committed_batch(tmp_path):
+    file_path = write_snapshot(tmp_path / "snapshot.jsonl", [
+        snapshot_record("10.1/%d" % i, "2018-05-01") for i in range(5)
+    ])
+
+    def interrupt(offset, counts):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        resume_snapshot(file_path, batch_size=2, progress=interrupt)
+    cursor = IngestionCursor.objects.get(source_file=file_path)
+    assert (cursor.last_batch, cursor.records, cursor.finished) == (1, 2, None)
+
+    batches_read = []
+    counts = resume_snapshot(file_path, batch_size=2, progress=lambda offset, counts: batches_read.append(counts))
+
+    assert len(batches_read) == 2
+    assert counts["records"] == 5
+    assert counts["articles"] == 5
+    assert ScholarlyArticles.objects.count() == 5
+    assert IngestionCursor.objects.get(source_file=file_path).finished is not None
+    assert resume_snapshot(file_path, progress=interrupt)["records"] == 5
+
+
+def test_resume_snapshot_refuses_a_file_that_changed(tmp_path):
+    file_path = write_snapshot(tmp_path / "snapshot.jsonl", [snapshot_record("10.1/a", "2018-05-01")])
+    resume_snapshot(file_path)
+    write_snapshot(tmp_path / "snapshot.jsonl", [
+        snapshot_record("10.1/a", "2018-05-01"), snapshot_record("10.1/b", "2018-05-01"),
+    ])
+
+    with pytest.raises(IngestError):
+        resume_snapshot(file_path)
+
+    assert resume_snapshot(file_path, restart=True)["records"] == 2
+
+
+@pytest.mark.parametrize("doi", [
+    "10.1/AbC", " https://doi.org/10.1/abc ", "http://dx.doi.org/10.1/ABC", "doi: 10.1/abc",
+])
+def test_normalize_doi(doi):
+    assert normalize_doi(doi) == "10.1/abc"
+
+
+def test_an_updated_record_replaces_the_article_with_the_same_doi(tmp_path):
+    ingest_snapshot(write_snapshot(tmp_path / "first.jsonl", [
+        snapshot_record("10.1/a", "2018-05-01", title="A"),
+    ]))
+
+    counts = ingest_snapshot(write_snapshot(tmp_path / "second.jsonl", [
+        snapshot_record("https://doi.org/10.1/A", "2018-05-01", title="B"),
+    ]))
+
+    assert counts["articles"] == 1
+    assert list(ScholarlyArticles.objects.values_list("doi", "title")) == [("10.1/a", "B")]
+
+
+def test_normalize_orcid():
+    assert normalize_orcid("https://orcid.org/0000-0002-1825-009x") == "0000-0002-1825-009X"
+    assert normalize_orcid("not an orcid") == ""
+    assert normalize_orcid(None) == ""
+
+
+def test_store_authorships_shares_the_people_and_the_affiliations():
+    first = create_article("10.1/a")
+    second = create_article("10.1/b")
+    author = {
+        "family": "Doe", "given": "Jane", "ORCID": "http://orcid.org/0000-0002-1825-009X",
+        "affiliation": [{"name": " University "}],
+    }
+    anonymous = {"family": "Roe", "affiliation": [{"name": "University"}, {"name": ""}]}
+
+    stored = store_authorships({
+        first.pk: {"z_authors": [author, anonymous]},
+        second.pk: {"z_authors": [author]},
+    })
+
+    assert stored == 3
+    assert list(Person.objects.values_list("orcid", "family")) == [("0000-0002-1825-009X", "Doe")]
+    assert list(Affiliation.objects.values_list("name", flat=True)) == ["University"]
+    assert list(
+        Authorship.objects.filter(article=first).order_by("position")
+        .values_list("position", "family", "person__orcid")
+    ) == [(1, "Doe", "0000-0002-1825-009X"), (2, "Roe", None)]
+    assert Authorship.objects.filter(affiliations__name="University").count() == 3
+
+
+def test_pack_record_leaves_out_the_values_of_the_columns():
+    record = {"doi": "10.1/a", "title": "Title", "z_authors": [], "publisher": "Other"}
+    values = {"doi": "10.1/a", "title": "Title", "publisher": "Publisher"}
+
+    data = pack_record(record, values)
+
+    assert b"Title" not in zlib.decompress(data)
+    assert unpack_record(data, values) == record
+
+
+def test_article_json_follows_the_columns(tmp_path):
+    ingest_snapshot(write_snapshot(tmp_path / "snapshot.jsonl", [
+        snapshot_record("10.1/a", "2018-05-01", title="A", extra={"key": "value"}),
+    ]))
+    article = ScholarlyArticles.objects.with_json().get()
+    assert article.article_json["extra"] == {"key": "value"}
+    assert article.article_json["title"] == "A"
+
+    ScholarlyArticles.objects.update(title="B")
+
+    assert ScholarlyArticles.objects.with_json().get().article_json["title"] == "B"
+
+
+def test_article_data_is_deferred_by_default():
+    create_article("10.1/a", article_json={"title": "A"})
+
+    assert ScholarlyArticles.objects.get().get_deferred_fields() == {"article_data"}
+    assert ScholarlyArticles.objects.with_json().get().get_deferred_fields() == set()
+
+
+def test_article_json_preview(rf):
+    article = create_article("10.1/a", article_json={"doi": "10.1/a", "abstract": "x" * 3000})
+
+    response = article_json_preview(rf.get("/"), article.pk)
+
+    text = response.content.decode()
+    assert text.startswith("{")
+    assert text.endswith("\n...")
+    assert '"doi": "10.1/a"' in text
+
+
+def test_facet_values_searches_the_values_by_prefix(rf):
+    create_article("10.1/a", journal_issn_l="1234-567X")
+    create_article("10.1/b", journal_issn_l="1234-567X")
+    create_article("10.1/c", journal_issn_l="1234-5670")
+    create_article("10.1/d", journal_issn_l="2345-6789")
+
+    response = facet_values(rf.get("/", {"facet": ISSN_FACET, "q": "1234-567x"}))
+
+    assert json.loads(response.content) == {"values": [{"value": "1234-567X", "count": 2}]}
+    with pytest.raises(Http404):
+        facet_values(rf.get("/", {"facet": "unknown"}))
+
+
+def test_articles_are_stored_in_the_partition_of_their_year():
+    for doi, year in (("10.1/a", 1990), ("10.1/b", 2018), ("10.1/c", 3000)):
+        create_article(doi, published_date=datetime.datetime(year, 1, 1, tzinfo=datetime.timezone.utc))
+    create_article("10.1/d")
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT doi, tableoid::regclass::text FROM %s ORDER BY doi"
+            % connection.ops.quote_name(ScholarlyArticles._meta.db_table)
+        )
+        stored = cursor.fetchall()
+
+    assert stored == [
+        ("10.1/a", partition_name(1990)),
+        ("10.1/b", partition_name(2018)),
+        ("10.1/c", partition_name(3000)),
+        ("10.1/d", partition_name(0)),
+    ]
+    assert partition_name(3000).endswith("_default")
+
+
+def test_copy_upsert_replaces_the_hash_and_the_record_of_an_ingested_article(tmp_path):
+    record = snapshot_record("10.1/a", None, title="A")
+    ingest_snapshot(write_snapshot(tmp_path / "snapshot.jsonl", [record]))
+    ingested_hash = ScholarlyArticles.objects.get().content_hash
+
+    counts = copy_import.copy_upsert_csv_file(
+        write_articles_csv(tmp_path / "articles.csv", [{"doi": "10.1/a", "title": "B"}]),
+        ScholarlyArticles,
+    )
+
+    assert counts == {"inserted": 0, "updated": 1, "unchanged": 0}
+    article = ScholarlyArticles.objects.with_json().get()
+    assert article.content_hash != ingested_hash
+    assert article.article_json is None
+    assert ingest_snapshot(write_snapshot(tmp_path / "again.jsonl", [record]))["articles"] == 1
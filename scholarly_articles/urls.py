@@ -0,0 +1,9 @@
+from django.urls import path
+
+from .views import article_json_preview, facet_values
+
+app_name = "scholarly_articles"
+urlpatterns = [
+    path("<int:pk>/json", view=article_json_preview, name="article_json_preview"),
+    path("facets", view=facet_values, name="facet_values"),
+]
@@ -1,3 +1,46 @@
-from django.shortcuts import render
+import json
 
-# Create your views here.
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+
+from .facets import FACETS, facet_name, search_values
+from .models import ScholarlyArticles
+
+# Number of characters of article_json shown by the admin preview.
+PREVIEW_LENGTH = 2000
+
+
+def article_json_preview(request, pk):
+    """
+    This view function returns the start of the article_json of a scholarly
+    article, as text, for the preview link of the admin list.
+    """
+    article = get_object_or_404(ScholarlyArticles.objects.with_json(), pk=pk)
+    if article.article_json is None:
+        text = ""
+    else:
+        text = json.dumps(article.article_json, indent=2, ensure_ascii=False)
+    if len(text) > PREVIEW_LENGTH:
+        text = text[:PREVIEW_LENGTH] + "\n..."
+    return HttpResponse(text, content_type="text/plain; charset=utf-8")
+
+
+def facet_values(request):
+    """
+    This view function returns the values of a facet that start with the
+    term q, with their counts, for the search of the facet list filters.
+    """
+    facet = request.GET.get("facet", "")
+    if facet not in {facet_name(model, field) for model, field in FACETS}:
+        raise Http404
+    term = request.GET.get("q", "").strip()
+    if facet.endswith((".journal_issn_l", ".person__orcid")):
+        # The check digit of an ISSN, or of a normalized ORCID, is an upper
+        # case X.
+        term = term.upper()
+    return JsonResponse({
+        "values": [
+            {"value": value, "count": count}
+            for value, count in search_values(facet, term)
+        ],
+    })
@@ -1,12 +1,35 @@
+from django.urls import include, path, reverse
+from django.utils.html import format_html
 from django.utils.translation import gettext as _
 
+from wagtail.core import hooks
+from wagtail.contrib.modeladmin.helpers import DjangoORMSearchHandler
 from wagtail.contrib.modeladmin.options import (ModelAdmin, modeladmin_register)
 
-from .models import (ScholarlyArticles, Contributors)
+from core.utils.modeladmin import KeysetIndexView
+
+from .facets import facet_filter
+from .models import (ScholarlyArticles, Contributors, IngestionCursor, Person,
+                     Affiliation, Authorship, normalize_doi, normalize_orcid)
+
+
+class DOISearchHandler(DjangoORMSearchHandler):
+    """
+    Look up a search term that is a DOI in the index of the doi field, instead
+    of scanning the search fields for it.
+    """
+
+    def search_queryset(self, queryset, search_term, **kwargs):
+        doi = normalize_doi(search_term)
+        if doi.startswith("10."):
+            return queryset.filter(doi=doi)
+        return super().search_queryset(queryset, search_term, **kwargs)
 
 
 class ScholarlyArticlesAdmin(ModelAdmin):
     model = ScholarlyArticles
+    index_view_class = KeysetIndexView
+    index_template_name = 'modeladmin/keyset_index.html'
     menu_label = 'Scholarly Articles'  # ditch this to use verbose_name_plural from model
     menu_icon = 'folder'  # change as required
     menu_order = 200  # will put in 3rd place (000 being 1st, 100 2nd)
@@ -24,14 +47,30 @@ class ScholarlyArticlesAdmin(ModelAdmin):
         'published_date',
         'publisher',
         'title',
-        'article_json',
+        'article_json_preview',
+    )
+    list_filter = (
+        facet_filter(ScholarlyArticles, 'journal_issn_l', 'ISSN-L'),
+        facet_filter(Authorship, 'person__orcid', 'ORCID', lookup='authorships__person__orcid'),
     )
-    list_filter = ('journal_issn_l',)
     search_fields = ('doi', 'journal_issn_l')
+    search_handler_class = DOISearchHandler
+
+    def article_json_preview(self, obj):
+        # article_data is deferred, the preview is only fetched when opened.
+        return format_html(
+            '<a href="{}" target="_blank">{}</a>',
+            reverse('scholarly_articles:article_json_preview', args=[obj.pk]),
+            _('Preview'),
+        )
+
+    article_json_preview.short_description = 'JSON File'
 
 
 class ContributorsAdmin(ModelAdmin):
     model = Contributors
+    index_view_class = KeysetIndexView
+    index_template_name = 'modeladmin/keyset_index.html'
     menu_label = 'Contributors'
     menu_icon = 'folder'
     menu_order = 300
@@ -46,9 +85,83 @@ class ContributorsAdmin(ModelAdmin):
         'authenticated_orcid',
         'affiliation',
     )
-    list_filter = ('orcid',)
+    list_filter = (facet_filter(Contributors, 'orcid', 'ORCID'),)
     search_fields = ('doi', 'orcid')
+    search_handler_class = DOISearchHandler
+
+
+class ORCIDSearchHandler(DjangoORMSearchHandler):
+    """
+    Look up a search term that is an ORCID in the index of the orcid field.
+    """
+
+    def search_queryset(self, queryset, search_term, **kwargs):
+        orcid = normalize_orcid(search_term)
+        if orcid:
+            return queryset.filter(orcid=orcid)
+        return super().search_queryset(queryset, search_term, **kwargs)
+
+
+class PersonAdmin(ModelAdmin):
+    model = Person
+    menu_label = 'People'
+    menu_icon = 'user'
+    menu_order = 310
+    add_to_settings_menu = False  # or True to add your model to the Settings sub-menu
+    exclude_from_explorer = False  # or True to exclude pages of this type from Wagtail's explorer view
+    list_display = (
+        'orcid',
+        'family',
+        'given',
+        'authenticated_orcid',
+    )
+    search_fields = ('orcid', 'family')
+    search_handler_class = ORCIDSearchHandler
+
+
+class AffiliationAdmin(ModelAdmin):
+    model = Affiliation
+    menu_label = 'Affiliations'
+    menu_icon = 'folder'
+    menu_order = 320
+    add_to_settings_menu = False  # or True to add your model to the Settings sub-menu
+    exclude_from_explorer = False  # or True to exclude pages of this type from Wagtail's explorer view
+    list_display = ('name',)
+    search_fields = ('name',)
+
+
+class IngestionCursorAdmin(ModelAdmin):
+    model = IngestionCursor
+    menu_label = 'Ingestion Cursors'
+    menu_icon = 'folder'
+    menu_order = 400
+    add_to_settings_menu = False  # or True to add your model to the Settings sub-menu
+    exclude_from_explorer = False  # or True to exclude pages of this type from Wagtail's explorer view
+    list_display = (
+        'source_file',
+        'offset',
+        'last_batch',
+        'records',
+        'articles',
+        'unchanged',
+        'contributors',
+        'skipped',
+        'updated',
+        'finished',
+    )
+    search_fields = ('source_file',)
 
 
 modeladmin_register(ScholarlyArticlesAdmin)
 modeladmin_register(ContributorsAdmin)
+modeladmin_register(PersonAdmin)
+modeladmin_register(AffiliationAdmin)
+modeladmin_register(IngestionCursorAdmin)
+
+
+@hooks.register('register_admin_urls')
+def register_scholarly_articles_url():
+    return [
+        path('scholarly_articles/scholarlyarticles/',
+        include('scholarly_articles.urls', namespace='scholarly_articles')),
+    ]